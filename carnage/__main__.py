@@ -24,7 +24,7 @@
 import logging
 import sys
 
-from carnage.cli import migration, seed, serve
+from carnage.cli import migration, partition, seed, serve
 from carnage.logger import setup_logger_handler
 
 
@@ -48,6 +48,7 @@ def create_argument_parser() -> argparse.ArgumentParser:
     seed.add_subparser(subparsers, parents=parent_parsers)
     serve.add_subparser(subparsers, parents=parent_parsers)
     migration.add_subparser(subparsers, parents=parent_parsers)
+    partition.add_subparser(subparsers, parents=parent_parsers)
 
     return parser
 
@@ -29,6 +29,7 @@
 from jose.exceptions import ExpiredSignatureError
 
 from carnage.constants import JWT_ALGORITHM, JWT_SECRET_KEY
+from carnage.database.session import bind_account
 
 
 def generate_jwt(claims: dict[str, Any]) -> str:
@@ -109,6 +110,10 @@ async def __call__(self, request: Request) -> bool:
                     status_code=403,
                     detail="Invalid token or expired token.",
                 )
+
+            # Reads made after a write by this account must see that write.
+            claims = jwt.get_unverified_claims(credentials.credentials)
+            bind_account(claims.get("email"))
             return True
 
         raise HTTPException(
@@ -0,0 +1,70 @@
+# MIT License
+#
+# Copyright (c) 2022, Rodolfo Olivieri
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Module that implements the conditional requests of the API."""
+
+import hashlib
+from typing import Any
+
+from fastapi import Request, Response
+
+
+def make_etag(*parts: Any) -> str:
+    """Build a strong entity tag out of what a representation depends on.
+
+    :param parts: Values that change whenever the representation does, like
+        the version of the rows or the encoded body. Bytes are hashed as
+        they are, anything else as its string.
+    :return: The quoted entity tag, ready for the `ETag` header.
+    """
+    digest = hashlib.blake2b(
+        b"\x1f".join(
+            part if isinstance(part, bytes) else str(part).encode("utf-8")
+            for part in parts
+        ),
+        digest_size=16,
+    )
+    return f'"{digest.hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Tell if the client already holds the representation of a tag.
+
+    The `If-None-Match` header is compared with the weak comparison, as
+    required for `GET` requests, so `W/` prefixes are ignored.
+
+    :param request: The request, holding the `If-None-Match` header.
+    :param etag: The entity tag of the current representation.
+    """
+    header = request.headers.get("if-none-match")
+    if header is None:
+        return False
+
+    tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return "*" in tags or etag in tags
+
+
+def not_modified(etag: str) -> Response:
+    """Build the `304 Not Modified` response for an entity tag.
+
+    :param etag: The entity tag of the current representation.
+    """
+    return Response(status_code=304, headers={"ETag": etag})
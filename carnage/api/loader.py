@@ -0,0 +1,141 @@
+# MIT License
+#
+# Copyright (c) 2022, Rodolfo Olivieri
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Module that implements the request scoped batched loaders.
+
+Resolving foreign keys one :meth:`async_select_by_id` at a time costs a
+session and a round trip per lookup. A :class:`DataLoader` instead collects
+every identifier requested while the current event loop iteration runs and
+fetches them all with a single :meth:`async_select_by_ids` query. Results
+are memoized for the lifetime of the loader, which is a single request when
+obtained through :func:`get_loaders`.
+"""
+
+import asyncio
+from collections.abc import Iterable
+from typing import Any
+from uuid import UUID
+
+from starlette.requests import HTTPConnection
+
+from carnage.database.models.base import BaseModel
+from carnage.database.repository.base import BaseRepository
+
+
+class DataLoader:
+    """Class that batches and memoizes identifier lookups."""
+
+    def __init__(self, repository: BaseRepository) -> None:
+        """Default constructor for the loader.
+
+        :param repository: The repository used to fetch the entities.
+        """
+        self.repository = repository
+        self._futures: dict[str, asyncio.Future] = {}
+        self._pending: list[str] = []
+
+    async def load(self, identifier: str | UUID) -> BaseModel | None:
+        """Load a single entity, batching it with concurrent lookups.
+
+        :param identifier: The unique identifier of the entity.
+        :return: The entity found, or `None` if it does not exist.
+        """
+        key = str(identifier)
+        if key not in self._futures:
+            loop = asyncio.get_running_loop()
+            self._futures[key] = loop.create_future()
+            self._pending.append(key)
+            if len(self._pending) == 1:
+                # Wait for the other lookups scheduled in this iteration.
+                loop.call_soon(asyncio.ensure_future, self._dispatch())
+
+        return await asyncio.shield(self._futures[key])
+
+    async def load_many(
+        self,
+        identifiers: Iterable[str | UUID],
+    ) -> list[BaseModel | None]:
+        """Load many entities with a single query.
+
+        :param identifiers: The unique identifiers of the entities.
+        :return: The entities found, in the same order as the identifiers.
+        """
+        return await asyncio.gather(
+            *(self.load(identifier) for identifier in identifiers),
+        )
+
+    def clear(self) -> None:
+        """Forget every entity loaded so far."""
+        self._futures = {
+            key: future
+            for key, future in self._futures.items()
+            if not future.done()
+        }
+
+    async def _dispatch(self) -> None:
+        """Fetch every pending identifier and resolve their futures."""
+        keys, self._pending = self._pending, []
+        try:
+            entities = await self.repository.async_select_by_ids(keys)
+        except Exception as e:
+            for key in keys:
+                self._futures.pop(key).set_exception(e)
+            return
+
+        found = {str(entity.id): entity for entity in entities}
+        for key in keys:
+            self._futures[key].set_result(found.get(key))
+
+
+class Loaders:
+    """Class that holds one :class:`DataLoader` per repository."""
+
+    def __init__(self) -> None:
+        """Default constructor for the loaders registry."""
+        self._loaders: dict[type[BaseRepository], DataLoader] = {}
+
+    def __getitem__(self, repository: Any) -> DataLoader:
+        """Return the loader of a repository, creating it when needed.
+
+        :param repository: The repository instance or class to load from.
+        """
+        if isinstance(repository, BaseRepository):
+            key = type(repository)
+        else:
+            key, repository = repository, repository()
+
+        if key not in self._loaders:
+            self._loaders[key] = DataLoader(repository)
+
+        return self._loaders[key]
+
+
+def get_loaders(connection: HTTPConnection) -> Loaders:
+    """Dependency that returns the loaders bound to the current request.
+
+    For a websocket, the loaders last as long as the connection.
+
+    :param connection: The request or websocket being handled.
+    """
+    if not hasattr(connection.state, "loaders"):
+        connection.state.loaders = Loaders()
+
+    return connection.state.loaders
@@ -0,0 +1,216 @@
+# MIT License
+#
+# Copyright (c) 2022, Rodolfo Olivieri
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Module that implements the middlewares of the API."""
+
+from fastapi import Request
+from jose import JWTError
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from carnage.api.auth.authentication import BaseJWTBearer
+from carnage.api.conditional import etag_matches, not_modified
+from carnage.api.response_cache import (
+    SCOPE_KEY,
+    CachedResponse,
+    ResponseCache,
+    response_cache,
+)
+from carnage.database.unit_of_work import UnitOfWork
+
+
+class UnitOfWorkMiddleware:
+    """Middleware that runs every HTTP request in a unit of work.
+
+    The repositories used during the request share a single session. The
+    unit of work is committed right before the response starts, so a commit
+    that fails still turns into an error response, or rolled back when the
+    endpoint fails or answers with an error status. Anything the response
+    body still reads, like a stream, runs in a new transaction that ends with
+    the request.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        """Default constructor for the middleware.
+
+        :param app: The application wrapped.
+        """
+        self.app = app
+
+    async def __call__(
+        self,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+    ) -> None:
+        """Handle a request.
+
+        :param scope: The connection scope.
+        :param receive: The callable receiving messages from the client.
+        :param send: The callable sending messages to the client.
+        """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async with UnitOfWork() as work:
+
+            async def send_wrapper(message: Message) -> None:
+                """End the transaction before the response starts."""
+                if message["type"] == "http.response.start":
+                    if message["status"] < 400:
+                        await work.commit()
+                    else:
+                        await work.rollback()
+
+                await send(message)
+
+            await self.app(scope, receive, send_wrapper)
+
+
+class ResponseCacheMiddleware:
+    """Middleware that answers the `GET` requests from the response cache.
+
+    The responses of the endpoints that allow it, see
+    :func:`carnage.api.response_cache.cache_response`, are stored as they
+    are sent and replayed as they are for the same path and query. A hit
+    still requires a valid token, but skips the endpoint altogether.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        cache: ResponseCache = response_cache,
+    ) -> None:
+        """Default constructor for the middleware.
+
+        :param app: The application wrapped.
+        :param cache: The cache holding the responses.
+        """
+        self.app = app
+        self.cache = cache
+        self.bearer = BaseJWTBearer()
+
+    def authorized(self, request: Request) -> bool:
+        """Tell if a request carries a valid token, like the endpoints do.
+
+        :param request: The request to check.
+        """
+        scheme, _, token = request.headers.get("authorization", "").partition(
+            " ",
+        )
+        if scheme.lower() != "bearer" or not token:
+            return False
+
+        try:
+            return self.bearer.verify_jwt(token)
+        except JWTError:
+            return False
+
+    async def replay(
+        self,
+        request: Request,
+        entry: CachedResponse,
+        send: Send,
+    ) -> None:
+        """Send a cached response back, or `304` if the client holds it.
+
+        :param request: The request being answered.
+        :param entry: The cached response.
+        :param send: The callable sending messages to the client.
+        """
+        if entry.etag is not None and etag_matches(request, entry.etag):
+            await not_modified(entry.etag)(
+                request.scope, request.receive, send
+            )
+            return
+
+        await send(
+            {
+                "type": "http.response.start",
+                "status": entry.status,
+                "headers": entry.headers,
+            },
+        )
+        await send({"type": "http.response.body", "body": entry.body})
+
+    async def __call__(
+        self,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+    ) -> None:
+        """Handle a request.
+
+        :param scope: The connection scope.
+        :param receive: The callable receiving messages from the client.
+        :param send: The callable sending messages to the client.
+        """
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "GET"
+            or not self.cache.enabled
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope, receive)
+        key = self.cache.key(scope)
+        entry = self.cache.get(key)
+        if entry is not None and self.authorized(request):
+            await self.replay(request, entry, send)
+            return
+
+        start: Message = {}
+        body: list[bytes] | None = []
+        size = 0
+        complete = False
+
+        async def send_wrapper(message: Message) -> None:
+            """Keep a copy of the response while it is sent."""
+            nonlocal body, complete, size, start
+            if message["type"] == "http.response.start":
+                start = message
+            elif message["type"] == "http.response.body" and body is not None:
+                body.append(message.get("body", b""))
+                size += len(body[-1])
+                complete = not message.get("more_body", False)
+                if size > self.cache.max_entry_bytes:
+                    body = None
+
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+        # A stream stopped when the client went away is not complete.
+        source = scope.get(SCOPE_KEY)
+        if (
+            source is None
+            or body is None
+            or not complete
+            or start.get("status") != 200
+        ):
+            return
+
+        headers = list(start.get("headers", []))
+        if any(name.lower() == b"set-cookie" for name, _ in headers):
+            return
+
+        self.cache.set(key, 200, headers, b"".join(body), source)
@@ -0,0 +1,142 @@
+# MIT License
+#
+# Copyright (c) 2022, Rodolfo Olivieri
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Module that implements the cursors used to paginate list endpoints."""
+
+import base64
+import binascii
+import enum
+import json
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+from fastapi import HTTPException, Query
+
+from carnage.constants import CARNAGE_MAX_PAGE_SIZE, CARNAGE_PAGE_SIZE
+
+
+def _dump_value(value: Any) -> Any:
+    """Turn a value of a position into something JSON can hold.
+
+    :param value: The value of a column of the row.
+    """
+    if isinstance(value, datetime):
+        return {"datetime": value.isoformat()}
+    if isinstance(value, UUID):
+        return {"uuid": str(value)}
+    if isinstance(value, enum.Enum):
+        return value.name
+
+    return value
+
+
+def _load_value(value: Any) -> Any:
+    """Turn a value dumped by :func:`_dump_value` back into its type.
+
+    :param value: The value read from the cursor.
+    :raises ValueError: If the value is not a known one.
+    """
+    if isinstance(value, dict):
+        ((kind, text),) = value.items()
+        if kind == "datetime":
+            return datetime.fromisoformat(text)
+        if kind == "uuid":
+            return UUID(text)
+        raise ValueError(f"Unknown value '{kind}'.")
+
+    return value
+
+
+def encode_cursor(row: Any, keys: tuple[str, ...] | None = None) -> str:
+    """Encode the position of a row into an opaque cursor.
+
+    The cursor points right after the given row in the `(created_at, id)`
+    order used by the list endpoints, or in the order of the given keys
+    when the listing is sorted by other columns.
+
+    :param row: The last row of a page.
+    :param keys: The columns the listing is ordered by, ending with `id`.
+    :return: The opaque cursor, safe to be used in an URL.
+    """
+    if keys is None:
+        values = [row.created_at.isoformat(), str(row.id)]
+    else:
+        values = [_dump_value(getattr(row, key)) for key in keys]
+
+    payload = json.dumps(values)
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> tuple[Any, ...]:
+    """Decode an opaque cursor back into the position it points to.
+
+    :param cursor: The cursor received from the client.
+    :raises ValueError: If the cursor was not generated by
+        :func:`encode_cursor`.
+    :return: A tuple with the `created_at` and `id` of the position, or the
+        values of the keys the cursor was encoded with.
+    """
+    try:
+        payload = base64.urlsafe_b64decode(cursor.encode("ascii"))
+        values = json.loads(payload)
+        if not isinstance(values, list):
+            raise TypeError("The cursor is not a list.")
+
+        if len(values) == 2 and all(isinstance(v, str) for v in values):
+            created_at, identifier = values
+            return datetime.fromisoformat(created_at), UUID(identifier)
+
+        if not values or not isinstance(_load_value(values[-1]), UUID):
+            raise TypeError("The cursor does not end with an identifier.")
+
+        return tuple(_load_value(value) for value in values)
+    except (binascii.Error, TypeError, UnicodeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor '{cursor}'.") from e
+
+
+class PageParameters:
+    """Query parameters accepted by the paginated list endpoints."""
+
+    def __init__(
+        self,
+        limit: int = Query(
+            default=CARNAGE_PAGE_SIZE,
+            ge=1,
+            le=CARNAGE_MAX_PAGE_SIZE,
+        ),
+        after: str | None = Query(default=None),
+    ) -> None:
+        """Constructor for the pagination parameters.
+
+        :param limit: Maximum number of rows returned in the page.
+        :param after: Cursor returned in the `X-Next-Cursor` header of the
+            previous page.
+        :raises HTTPException: If the cursor is not valid.
+        """
+        self.limit = limit
+        self.after = None
+
+        if after is not None:
+            try:
+                self.after = decode_cursor(after)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e)) from e
@@ -0,0 +1,107 @@
+# MIT License
+#
+# Copyright (c) 2022, Rodolfo Olivieri
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Module that implements the query parameters of the list endpoints."""
+
+import enum
+import re
+from datetime import datetime
+
+from fastapi import Depends, Query, Request
+
+from carnage.api.pagination import PageParameters
+
+_FILTER = re.compile(r"filter\[(\w+)\]")
+
+
+def split_names(value: str | None) -> tuple[str, ...] | None:
+    """Split a comma separated list of names, like `?fields=id,name`.
+
+    :param value: The value of the query parameter, if given.
+    :return: The names, or `None` if the parameter was not given.
+    """
+    if value is None:
+        return None
+
+    return tuple(name.strip() for name in value.split(",") if name.strip())
+
+
+class StreamFormat(str, enum.Enum):
+    """An enum with the formats a listing can be streamed in."""
+
+    json = "json"
+    ndjson = "ndjson"
+
+    @property
+    def media_type(self) -> str:
+        """Return the media type of a listing streamed in this format."""
+        if self is StreamFormat.ndjson:
+            return "application/x-ndjson"
+
+        return "application/json"
+
+
+class ListParameters:
+    """Query parameters accepted by every list endpoint."""
+
+    def __init__(
+        self,
+        request: Request,
+        page: PageParameters = Depends(),
+        include: list[str] = Query(default=[]),
+        stream: StreamFormat | None = Query(default=None),
+        updated_since: datetime | None = Query(default=None),
+        sort: str | None = Query(default=None),
+        fields: str | None = Query(default=None),
+    ) -> None:
+        """Constructor for the list parameters.
+
+        Filters are given as `?filter[column]=value`, repeated to match any
+        of several values. Which columns can be filtered, sorted and sent
+        back is checked by the route, see
+        :class:`carnage.api.routes.base.BaseRoute`.
+
+        :param request: The request, holding the filters and the conditional
+            headers.
+        :param page: The pagination parameters of the request.
+        :param include: Large columns, left out of listings by default, that
+            should be sent back as well.
+        :param stream: When given, the whole listing is streamed in this
+            format and the pagination parameters are ignored.
+        :param updated_since: When given, only the rows updated after this
+            moment are listed, including the deleted ones, so clients can
+            pull the changes since their last sync instead of everything.
+        :param sort: Comma separated columns to order the listing by, each
+            prefixed with `-` for a descending order, like `-level,name`.
+        :param fields: Comma separated columns to send back, like `id,name`.
+        """
+        self.request = request
+        self.page = page
+        self.include = include
+        self.stream = stream
+        self.updated_since = updated_since
+        self.sort = split_names(sort) or ()
+        self.fields = split_names(fields)
+        self.filters: dict[str, list[str]] = {}
+        for key, value in request.query_params.multi_items():
+            match = _FILTER.fullmatch(key)
+            if match is not None:
+                self.filters.setdefault(match.group(1), []).append(value)
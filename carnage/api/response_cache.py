@@ -0,0 +1,235 @@
+# MIT License
+#
+# Copyright (c) 2022, Rodolfo Olivieri
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Module that implements the cache of the responses of the API.
+
+Responses are cached by :class:`carnage.api.middleware.ResponseCacheMiddleware`
+as the bytes sent to the client, so a hit costs no query, no validation and
+no encoding at all. Only the endpoints that ask for it are cached, see
+:func:`cache_response`. Each response is tied to the entity cache of the
+table it was read from, and is dropped as soon as that cache is invalidated,
+which every write to the table does, including the writes of the other
+workers.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any, NamedTuple
+
+from fastapi import Request
+from starlette.datastructures import Headers
+from starlette.types import Scope
+
+from carnage.constants import (
+    CARNAGE_RESPONSE_CACHE_ENABLED,
+    CARNAGE_RESPONSE_CACHE_MAX_BYTES,
+    CARNAGE_RESPONSE_CACHE_TTL,
+)
+from carnage.database.cache import EntityCache
+from carnage.database.session import bind_writer
+
+#: Key of the request scope holding the entity cache a response depends on.
+SCOPE_KEY = "carnage.response_cache"
+
+
+class CachedResponse(NamedTuple):
+    """A response held by the cache."""
+
+    status: int
+    headers: list[tuple[bytes, bytes]]
+    body: bytes
+    etag: str | None
+    source: EntityCache
+    generation: int
+    expires_at: float
+
+    @property
+    def size(self) -> int:
+        """Return the number of bytes held by the response."""
+        return len(self.body) + sum(
+            len(name) + len(value) for name, value in self.headers
+        )
+
+
+def cache_response(request: Request, source: EntityCache) -> None:
+    """Allow the response of a request to be cached.
+
+    It must be called before the data of the response is read, so a write
+    that happens in between drops the response right away. The data is then
+    read from the primary, see :func:`carnage.database.session.bind_writer`,
+    so a response cached right after a write never holds what a lagging
+    replica returned.
+
+    :param request: The request being answered.
+    :param source: The entity cache of the table the response is read from.
+    """
+    request.scope[SCOPE_KEY] = (source, source.invalidations)
+    if response_cache.enabled:
+        bind_writer()
+
+
+class ResponseCache:
+    """Class that holds the responses of the API, bounded by their size.
+
+    The cache is a least recently used mapping, where every response expires
+    after a time to live, or as soon as the entity cache it depends on is
+    invalidated.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = CARNAGE_RESPONSE_CACHE_MAX_BYTES,
+        ttl: float = CARNAGE_RESPONSE_CACHE_TTL,
+        enabled: bool = CARNAGE_RESPONSE_CACHE_ENABLED,
+    ) -> None:
+        """Default constructor for the response cache.
+
+        :param max_bytes: Maximum number of bytes held at the same time. A
+            single response may take up to an eighth of it.
+        :param ttl: Number of seconds a response is considered fresh.
+        :param enabled: If the cache should store anything at all.
+        """
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_bytes // 8
+        self.ttl = ttl
+        self.enabled = enabled
+        self.size = 0
+        self._entries: OrderedDict[Hashable, CachedResponse] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.stale = 0
+
+    @staticmethod
+    def key(scope: Scope) -> Hashable:
+        """Build the key of the response to a request.
+
+        The response does not depend on who asks for it, so the credentials
+        are left out. The encoding does, as compressed responses are held as
+        they were sent.
+
+        :param scope: The scope of the request.
+        """
+        headers = Headers(scope=scope)
+        encodings = headers.get("accept-encoding", "")
+        return (
+            scope["path"],
+            scope["query_string"],
+            "gzip" in encodings.lower(),
+        )
+
+    def _drop(self, key: Hashable) -> None:
+        """Drop a response, the lock must be held.
+
+        :param key: The key of the response.
+        """
+        entry = self._entries.pop(key)
+        self.size -= entry.size
+
+    def get(self, key: Hashable) -> CachedResponse | None:
+        """Get a fresh response from the cache.
+
+        :param key: The key of the response, see :meth:`key`.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            if (
+                entry.expires_at < time.monotonic()
+                or entry.source.invalidations != entry.generation
+            ):
+                self._drop(key)
+                self.stale += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def set(
+        self,
+        key: Hashable,
+        status: int,
+        headers: list[tuple[bytes, bytes]],
+        body: bytes,
+        source: tuple[EntityCache, int],
+    ) -> None:
+        """Store a response, evicting the oldest ones if needed.
+
+        :param key: The key of the response, see :meth:`key`.
+        :param status: The status code of the response.
+        :param headers: The raw headers of the response.
+        :param body: The whole body of the response.
+        :param source: The entity cache the response was read from, and how
+            many times it was invalidated back then.
+        """
+        cache, generation = source
+        etag = Headers(raw=headers).get("etag")
+        entry = CachedResponse(
+            status=status,
+            headers=headers,
+            body=body,
+            etag=etag,
+            source=cache,
+            generation=generation,
+            expires_at=time.monotonic() + self.ttl,
+        )
+        if not self.enabled or entry.size > self.max_entry_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+
+            self._entries[key] = entry
+            self.size += entry.size
+            while self.size > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every response held by the cache."""
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def statistics(self) -> dict[str, Any]:
+        """Report the counters of the cache."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "stale": self.stale,
+            }
+
+
+#: Global cache shared by every request.
+response_cache = ResponseCache()
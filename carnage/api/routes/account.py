@@ -20,8 +20,11 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 """Module that implements the Account Route."""
-from fastapi import HTTPException, Request
+from uuid import UUID
 
+from fastapi import Depends, HTTPException, Request, Response
+
+from carnage.api.parameters import ListParameters
 from carnage.api.routes.base import BaseRoute
 from carnage.api.schemas.account import ListAccountSchema, UpdateAccountSchema
 from carnage.database.repository.account import AccountRepository
@@ -33,6 +36,9 @@ class AccountRoute(BaseRoute):
     list_schema = ListAccountSchema
     update_schema = UpdateAccountSchema
 
+    filterable = ("username", "nickname", "provider")
+    sortable = ("created_at", "updated_at", "username")
+
     def __init__(
         self,
         name: str = "account",
@@ -62,19 +68,34 @@ async def post(self, _: Request) -> None:
             detail="I can't do anything. I'm a teapot.",
         )
 
-    async def get(self) -> list[ListAccountSchema]:
-        """Async method that represents a normal get request to this API."""
-        return await super().get()
+    async def get(
+        self,
+        response: Response,
+        parameters: ListParameters = Depends(),
+    ) -> list[ListAccountSchema]:
+        """Async method that represents a normal get request to this API.
+
+        :param response: The response that will be sent to the client.
+        :param parameters: The query parameters of the request.
+        """
+        return await super().get(response, parameters)
 
-    async def get_by_id(self, identifier: str) -> ListAccountSchema:
+    async def get_by_id(
+        self,
+        identifier: str,
+        request: Request,
+        response: Response,
+    ) -> ListAccountSchema:
         """Async method that represents a normal get to this API.
 
         This instance of get request is meant to be used with an identifier to
         filter for a specific result.
 
         :param identifier: The unique identifier used in the query.
+        :param request: The request, holding the `If-None-Match` header.
+        :param response: The response that will be sent to the client.
         """
-        return await super().get_by_id(identifier)
+        return await super().get_by_id(identifier, request, response)
 
     async def put(self, request: UpdateAccountSchema, identifier: str) -> None:
         """Async method that update data for this API.
@@ -84,5 +105,15 @@ async def put(self, request: UpdateAccountSchema, identifier: str) -> None:
         """
         return await super().put(request, identifier)
 
+    async def put_many(
+        self,
+        request: dict[UUID, UpdateAccountSchema],
+    ) -> list[UUID]:
+        """Async method that updates many entries of this API at once.
+
+        :param request: The data to update, keyed by unique identifier.
+        """
+        return await super().put_many(request)
+
 
 route = AccountRoute()
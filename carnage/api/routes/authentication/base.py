@@ -64,24 +64,22 @@ async def handle_user_account(
         """Handle the user information in the database.
 
         This method will try to create a new account if needed, otherwise, will
-        not do anything as the account is already present.
+        not do anything as the account is already present. Both cases are
+        handled by a single upsert, so concurrent logins of a new user can't
+        create duplicated accounts.
 
         :param username: The username for the account.
         :param nickname: The nickname for the account.
         :param provider: The provider tied to the account.
         """
-        account = self.account_repository.select_by_username(
-            username=username,
+        created = await self.account_repository.async_upsert(
+            {
+                "username": username,
+                "nickname": nickname,
+                "provider": provider,
+                "secret_key": Fernet.generate_key().decode(),
+            },
         )
 
-        if not account:
-            logger.info("Account does not exist. Creating a new one.")
-
-            self.account_repository.insert(
-                {
-                    "username": username,
-                    "nickname": nickname,
-                    "provider": provider,
-                    "secret_key": Fernet.generate_key().decode(),
-                },
-            )
+        if created:
+            logger.info("Account does not exist. Created a new one.")
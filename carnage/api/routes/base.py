@@ -20,10 +20,22 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 """Module that implements the Base Route defaults methods."""
-from fastapi import APIRouter, Depends
+from collections.abc import AsyncIterator, Sized
+from contextlib import aclosing
+from typing import Any
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 from carnage.api.auth.authentication import APIJWTBearer
+from carnage.api.conditional import etag_matches, make_etag, not_modified
+from carnage.api.pagination import encode_cursor
+from carnage.api.parameters import ListParameters, StreamFormat
+from carnage.api.response_cache import cache_response
+from carnage.api.serialization import RowEncoder
+from carnage.constants import CARNAGE_MAX_BULK_SIZE
 from carnage.database.repository.base import BaseRepository
 
 
@@ -34,6 +46,17 @@ class BaseRoute:
     create_schema = BaseModel
     update_schema = BaseModel
 
+    #: Number of rows encoded in each chunk of a streamed listing.
+    stream_chunk_size = 100
+
+    #: Columns of the listing schema that can be filtered with
+    #: `?filter[column]=`. They should be backed by an index.
+    filterable: tuple[str, ...] = ()
+
+    #: Columns of the listing schema the listing can be sorted by with
+    #: `?sort=`. They should be backed by an index.
+    sortable: tuple[str, ...] = ("created_at", "updated_at")
+
     def __init__(
         self,
         name: str = "base",
@@ -54,6 +77,7 @@ def __init__(
         """
         self.name = name
         self.repository = repository()
+        self.encoder = RowEncoder(self.list_schema)
         self.router = APIRouter(
             prefix=f"/{name}",
             tags=tags,
@@ -65,6 +89,7 @@ def __init__(
             methods=["GET"],
             status_code=200,
             response_model=list[self.list_schema],  # type: ignore
+            response_model_exclude_unset=True,
         )
         self.router.add_api_route(
             "/{identifier}",
@@ -79,6 +104,27 @@ def __init__(
             methods=["POST"],
             status_code=201,
         )
+        self.router.add_api_route(
+            "/",
+            self.put_many,
+            methods=["PATCH"],
+            status_code=200,
+            response_model=list[UUID],
+        )
+        self.router.add_api_route(
+            "/",
+            self.delete_many,
+            methods=["DELETE"],
+            status_code=200,
+            response_model=list[UUID],
+        )
+        self.router.add_api_route(
+            "/restore",
+            self.restore_many,
+            methods=["POST"],
+            status_code=200,
+            response_model=list[UUID],
+        )
         self.router.add_api_route(
             "/{identifier}",
             self.put,
@@ -97,23 +143,371 @@ async def post(self, request: BaseModel) -> None:
 
         :param request: The data send throught the request.
         """
-        self.repository.insert(values=request.dict())
+        await self.repository.async_insert(values=request.dict())
+
+    def list_columns(
+        self,
+        include: list[str],
+        fields: tuple[str, ...] | None = None,
+        sort: tuple[str, ...] = (),
+    ) -> tuple[str, ...] | None:
+        """Pick the columns needed to build the listing schema.
+
+        Only the columns that the schema exposes are fetched, and the large
+        columns of the repository are left out unless explicitly included.
+        With a sparse fieldset, only the fields asked for are fetched, along
+        with the columns the pagination cursor is built from.
+
+        :param include: Large columns that should be fetched as well.
+        :param fields: The fields to send back, if not all of them.
+        :param sort: The columns the listing is sorted by.
+        :raises HTTPException: If a column to include is not a large column
+            of the repository, or a field is not a column of the schema.
+        :return: The name of the columns, or `None` to fetch whole entities.
+        """
+        unknown = set(include) - set(self.repository.large_columns)
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown columns to include: {sorted(unknown)}.",
+            )
+
+        schema_fields = self.list_schema.__fields__
+        table_columns = self.repository.model.__table__.columns
+        if fields is not None:
+            unknown = {
+                name
+                for name in fields
+                if name not in schema_fields or name not in table_columns
+            }
+            if unknown:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Unknown fields: {sorted(unknown)}.",
+                )
+
+            columns = list(fields)
+        elif not schema_fields:
+            return None
+        else:
+            columns = [
+                name
+                for name in schema_fields
+                if name in table_columns
+                and (
+                    name not in self.repository.large_columns
+                    or name in include
+                )
+            ]
+
+        # The pagination cursor is built from these columns.
+        keys = [name.removeprefix("-") for name in sort]
+        return tuple(dict.fromkeys(("id", "created_at", *keys, *columns)))
+
+    def list_filters(
+        self,
+        filters: dict[str, list[str]],
+    ) -> dict[str, Any] | None:
+        """Check the filters of a listing and convert their values.
+
+        The values are converted to the type of the field of the listing
+        schema. A filter given more than once matches any of its values,
+        which are kept in a tuple so the repository can cache the listing.
+        `None` is returned when there are no filters.
+
+        :param filters: The values of each `?filter[column]=` parameter.
+        :raises HTTPException: If a column can't be filtered or one of the
+            values is not valid.
+        """
+        unknown = set(filters) - set(self.filterable)
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=(
+                    f"Unknown columns to filter: {sorted(unknown)}, "
+                    f"allowed: {list(self.filterable)}."
+                ),
+            )
+
+        converted = {}
+        for name, values in filters.items():
+            values = tuple(self._field_value(name, value) for value in values)
+            converted[name] = values[0] if len(values) == 1 else values
+
+        return converted or None
+
+    def list_sort(self, sort: tuple[str, ...]) -> tuple[str, ...]:
+        """Check the columns a listing is sorted by.
+
+        :param sort: The columns, each prefixed with `-` for a descending
+            order.
+        :raises HTTPException: If a column can't be sorted by or is given
+            more than once.
+        """
+        names = [name.removeprefix("-") for name in sort]
+        unknown = set(names) - set(self.sortable)
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=(
+                    f"Unknown columns to sort by: {sorted(unknown)}, "
+                    f"allowed: {list(self.sortable)}."
+                ),
+            )
+
+        if len(set(names)) != len(names):
+            raise HTTPException(
+                status_code=400,
+                detail="Columns to sort by can only be given once.",
+            )
+
+        return sort
+
+    def list_after(
+        self,
+        after: tuple[Any, ...] | None,
+        keys: tuple[str, ...] | None,
+    ) -> tuple[Any, ...] | None:
+        """Check that a cursor points to a position in the listing order.
+
+        :param after: The position decoded from the cursor, if any.
+        :param keys: The columns of the listing order, or `None` for the
+            default `(created_at, id)` one.
+        :raises HTTPException: If the cursor was built for another order.
+        """
+        if after is None:
+            return None
+
+        expected = keys or ("created_at", "id")
+        try:
+            if len(after) != len(expected):
+                raise ValueError()
+
+            return tuple(
+                None if value is None else self._field_value(key, value)
+                for key, value in zip(expected, after)
+            )
+        except (HTTPException, ValueError) as e:
+            raise HTTPException(
+                status_code=400,
+                detail="The cursor does not match the order of the listing.",
+            ) from e
+
+    def _field_value(self, name: str, value: Any) -> Any:
+        """Convert a value to the type of a field of the listing schema.
+
+        :param name: The name of the field.
+        :param value: The value to convert.
+        :raises HTTPException: If the value is not valid for the field.
+        """
+        field = self.list_schema.__fields__.get(name)
+        if field is None:
+            return value
+
+        converted, errors = field.validate(value, {}, loc=name)
+        if errors:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid value for '{name}': {value}.",
+            )
+
+        return converted
+
+    async def get(
+        self,
+        response: Response,
+        parameters: ListParameters = Depends(),
+    ) -> list[BaseModel]:
+        """Async method that represents a normal get request to this API.
+
+        Results are paginated with a keyset cursor. When more rows may be
+        available, the cursor for the next page is sent back in the
+        `X-Next-Cursor` header. Only the columns of the listing schema are
+        fetched, see :meth:`list_columns`. With `?stream=json` the whole
+        listing is streamed instead, see :meth:`stream_json`, or one row per
+        line with `?stream=ndjson`, see :meth:`stream_ndjson`. With
+        `?updated_since=` only the rows changed after that moment are listed,
+        deleted ones included.
+
+        Listings can be filtered with `?filter[column]=value`, sorted with
+        `?sort=-column` and restricted to some fields with `?fields=id,name`,
+        on the columns allowed by :attr:`filterable` and :attr:`sortable`.
+        All of them are applied by the database query.
+
+        Every page carries an `ETag`, see :meth:`list_etag`. When the client
+        sends it back in `If-None-Match` and the page did not change since,
+        `304 Not Modified` is answered instead of the rows. Streamed listings
+        carry none, as their content is not known before it is sent.
+        Listings are held by the response cache until the table is written
+        to, see :mod:`carnage.api.response_cache`.
+
+        :param response: The response that will be sent to the client.
+        :param parameters: The query parameters of the request.
+        """
+        sort = self.list_sort(parameters.sort)
+        query = {
+            "columns": self.list_columns(
+                parameters.include,
+                parameters.fields,
+                sort,
+            ),
+            "updated_since": parameters.updated_since,
+            "filters": self.list_filters(parameters.filters),
+            "sort": sort,
+        }
+        cache_response(parameters.request, self.repository.cache)
+        if parameters.stream is not None:
+            stream = (
+                self.stream_ndjson
+                if parameters.stream is StreamFormat.ndjson
+                else self.stream_json
+            )
+            return StreamingResponse(  # type: ignore
+                stream(query, parameters.fields),
+                media_type=parameters.stream.media_type,
+            )
+
+        page = parameters.page
+        keys = (
+            (*(name.removeprefix("-") for name in sort), "id")
+            if sort
+            else None
+        )
+        result = await self.repository.async_select(
+            limit=page.limit,
+            after=self.list_after(page.after, keys),
+            **query,
+        )
+
+        if len(result) == page.limit:
+            response.headers["X-Next-Cursor"] = encode_cursor(
+                result[-1],
+                keys,
+            )
+
+        # The rows hold the columns of the schema as they are stored, so
+        # they are encoded as they are instead of going through the schema
+        # and the response model, see :mod:`carnage.api.serialization`.
+        body = self.encoder.encode(result, parameters.fields)
+        etag = self.list_etag(body, response.headers.get("X-Next-Cursor"))
+        if etag_matches(parameters.request, etag):
+            return not_modified(etag)  # type: ignore
+
+        response.headers["ETag"] = etag
+        return Response(  # type: ignore
+            body,
+            media_type="application/json",
+            headers=dict(response.headers),
+        )
+
+    def list_etag(self, body: bytes, cursor: str | None = None) -> str:
+        """Build the entity tag of a page of a listing.
+
+        The tag is derived from what is sent to the client, the encoded rows
+        and the cursor of the next page, so it changes with the content
+        whatever changed it, even a write this process was not told about.
+
+        :param body: The encoded rows of the page.
+        :param cursor: The cursor of the next page, if any.
+        """
+        return make_etag(self.name, body, cursor)
+
+    async def stream_chunks(
+        self,
+        query: dict[str, Any],
+    ) -> AsyncIterator[list[Any]]:
+        """Read every row of a listing, :attr:`stream_chunk_size` at a time.
+
+        Rows come from a server side cursor and the next ones are only read
+        once the previous chunk was sent, so only a chunk of them is held in
+        memory at any time and a slow client slows the reads down as well.
+        When the client disconnects, the response stops pulling chunks and
+        the cursor is closed.
+
+        :param query: The arguments given to the repository, see :meth:`get`.
+        """
+        chunk = []
+        async with aclosing(self.repository.async_stream(**query)) as rows:
+            async for row in rows:
+                chunk.append(row)
+                if len(chunk) == self.stream_chunk_size:
+                    yield chunk
+                    chunk = []
+
+        if chunk:
+            yield chunk
+
+    async def stream_json(
+        self,
+        query: dict[str, Any],
+        fields: tuple[str, ...] | None = None,
+    ) -> AsyncIterator[bytes]:
+        """Encode every row of the listing as a JSON array, chunk by chunk.
+
+        :param query: The arguments given to the repository, see :meth:`get`.
+        :param fields: The fields to send back, if not all of them.
+        """
+        yield b"["
+        separator = b""
+        async with aclosing(self.stream_chunks(query)) as chunks:
+            async for chunk in chunks:
+                # Only the items of the encoded array are sent.
+                yield separator + self.encoder.encode(chunk, fields)[1:-1]
+                separator = b","
+
+        yield b"]"
+
+    async def stream_ndjson(
+        self,
+        query: dict[str, Any],
+        fields: tuple[str, ...] | None = None,
+    ) -> AsyncIterator[bytes]:
+        """Encode every row of the listing as a JSON object per line.
 
-    async def get(self) -> list[BaseModel]:
-        """Async method that represents a normal get request to this API."""
-        result = self.repository.select()
-        return [self.list_schema.from_orm(item) for item in result]
+        Each line can be handled by the client as soon as it arrives, without
+        waiting for the rest of the listing.
 
-    async def get_by_id(self, identifier: str) -> BaseModel:
+        :param query: The arguments given to the repository, see :meth:`get`.
+        :param fields: The fields to send back, if not all of them.
+        """
+        # The response starts right away, even through the compression, and
+        # not once the first rows are read.
+        yield b""
+        async with aclosing(self.stream_chunks(query)) as chunks:
+            async for chunk in chunks:
+                yield self.encoder.encode_lines(chunk, fields)
+
+    async def get_by_id(
+        self,
+        identifier: str,
+        request: Request,
+        response: Response,
+    ) -> BaseModel:
         """Async method that represents a normal get to this API.
 
         This instance of get request is meant to be used with an identifier to
-        filter for a specific result.
+        filter for a specific result. The entity tag is derived from the last
+        time the row was written, and `304 Not Modified` is answered when the
+        client already holds it. The response is held by the response cache
+        until the table is written to.
 
         :param identifier: The unique identifier used in the query.
+        :param request: The request, holding the `If-None-Match` header.
+        :param response: The response that will be sent to the client.
         """
-        result = self.repository.select_by_id(identifier=identifier)
-        return self.list_schema.from_orm(result[0])
+        cache_response(request, self.repository.cache)
+        result = await self.repository.async_select_by_id(
+            identifier=identifier,
+        )
+        item = result[0]
+        etag = make_etag(
+            self.name, item.id, item.updated_at or item.created_at
+        )
+        if etag_matches(request, etag):
+            return not_modified(etag)  # type: ignore
+
+        response.headers["ETag"] = etag
+        return self.list_schema.from_orm(item)
 
     async def put(self, request: BaseModel, identifier: str) -> None:
         """Async method that update data for this API.
@@ -121,11 +515,63 @@ async def put(self, request: BaseModel, identifier: str) -> None:
         :param request: The data send throught the request.
         :param identifier: The unique identifier used in the query.
         """
-        self.repository.update(values=request.dict(), identifier=identifier)
+        await self.repository.async_update(
+            values=request.dict(),
+            identifier=identifier,
+        )
 
     async def delete(self, identifier: str) -> None:
         """Async method that deletes an entry for this API.
 
         :param identifier: The unique identifier used in the query.
         """
-        self.repository.delete(identifier=identifier)
+        await self.repository.async_delete(identifier=identifier)
+
+    def check_bulk_size(self, request: Sized) -> None:
+        """Refuse bulk requests that change too many rows at once.
+
+        :param request: The rows sent throught the request.
+        :raises HTTPException: If there are more rows than
+            `CARNAGE_MAX_BULK_SIZE`.
+        """
+        if len(request) > CARNAGE_MAX_BULK_SIZE:
+            raise HTTPException(
+                status_code=400,
+                detail=(
+                    f"At most {CARNAGE_MAX_BULK_SIZE} rows can be changed "
+                    "at once."
+                ),
+            )
+
+    async def put_many(self, request: dict[UUID, BaseModel]) -> list[UUID]:
+        """Async method that updates many entries of this API at once.
+
+        Every entry is updated in a single transaction.
+
+        :param request: The data to update, keyed by unique identifier.
+        :return: The identifiers of the entries updated.
+        """
+        self.check_bulk_size(request)
+        return await self.repository.async_update_many(
+            values={
+                identifier: item.dict() for identifier, item in request.items()
+            },
+        )
+
+    async def delete_many(self, request: list[UUID]) -> list[UUID]:
+        """Async method that deletes many entries of this API at once.
+
+        :param request: The unique identifiers of the entries to delete.
+        :return: The identifiers of the entries deleted.
+        """
+        self.check_bulk_size(request)
+        return await self.repository.async_delete_many(identifiers=request)
+
+    async def restore_many(self, request: list[UUID]) -> list[UUID]:
+        """Async method that restores many deleted entries of this API.
+
+        :param request: The unique identifiers of the entries to restore.
+        :return: The identifiers of the entries restored.
+        """
+        self.check_bulk_size(request)
+        return await self.repository.async_restore_many(identifiers=request)
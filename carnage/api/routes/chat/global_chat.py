@@ -25,6 +25,7 @@
 from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect
 
 from carnage.api.auth.authentication import WebSocketJWTBearer
+from carnage.api.loader import Loaders, get_loaders
 from carnage.constants import CARNAGE_CHAT_SECRET_KEY
 from carnage.database.repository.account import AccountRepository
 from carnage.database.repository.chat import GlobalChatRepository
@@ -84,23 +85,30 @@ async def save_message_to_database(
         from_account_id: str,
         message: str,
         channel: str,
+        loaders: Loaders,
     ) -> None:
         """Async method to save messages in the database.
 
+        The account is loaded once per connection, not once per message.
+
         :param from_account_id: The account id connected to the websocket.
         :param message: The actual message to be processed.
         :param channel: The chanel that the message was sent.
+        :param loaders: The loaders bound to the connection.
         """
-        account = self.account_repository.select_by_id(
-            identifier=from_account_id,
-        )[0]
+        account = await loaders[self.account_repository].load(
+            from_account_id,
+        )
+        if account is None:
+            raise ValueError(f"Unknown account '{from_account_id}'.")
+
         encrypted_message = MultiFernet(
             [
                 Fernet(CARNAGE_CHAT_SECRET_KEY),
                 Fernet(account.secret_key),
             ],
         ).encrypt(message.encode("utf-8"))
-        self.repository.insert(
+        await self.repository.async_insert(
             {
                 "message": encrypted_message.decode(),
                 "channel_chat_id": channel,
@@ -113,11 +121,13 @@ async def websocket(
         websocket: WebSocket,
         from_account_id: str,
         _: str = Depends(WebSocketJWTBearer()),
+        loaders: Loaders = Depends(get_loaders),
     ) -> None:
         """Async method that handles the webscoket for the global chat route.
 
         :param websocket: The webscoket instance to connect.
         :param from_account_id: The account id connected to the websocket.
+        :param loaders: The loaders bound to the connection.
         """
         await self.connect(from_account_id, websocket)
         try:
@@ -128,6 +138,7 @@ async def websocket(
                     from_account_id,
                     data["message"],
                     data["channel"],
+                    loaders,
                 )
         except WebSocketDisconnect:
             await self.disconnect(from_account_id)
@@ -21,6 +21,11 @@
 # SOFTWARE.
 """Module that implements the Dungeon Route."""
 
+from uuid import UUID
+
+from fastapi import Depends, Request, Response
+
+from carnage.api.parameters import ListParameters
 from carnage.api.routes.base import BaseRoute
 from carnage.api.schemas.dungeon import (
     CreateDungeonSchema,
@@ -37,6 +42,9 @@ class DungeonRoute(BaseRoute):
     create_schema = CreateDungeonSchema
     update_schema = UpdateDungeonSchema
 
+    filterable = ("name", "dungeon_schema_id")
+    sortable = ("created_at", "updated_at", "name")
+
     def __init__(
         self,
         name: str = "dungeon",
@@ -63,19 +71,34 @@ async def post(self, request: CreateDungeonSchema) -> None:
         """
         return await super().post(request)
 
-    async def get(self) -> list[ListDungeonSchema]:
-        """Async method that represents a normal get request to this API."""
-        return await super().get()
+    async def get(
+        self,
+        response: Response,
+        parameters: ListParameters = Depends(),
+    ) -> list[ListDungeonSchema]:
+        """Async method that represents a normal get request to this API.
+
+        :param response: The response that will be sent to the client.
+        :param parameters: The query parameters of the request.
+        """
+        return await super().get(response, parameters)
 
-    async def get_by_id(self, identifier: str) -> ListDungeonSchema:
+    async def get_by_id(
+        self,
+        identifier: str,
+        request: Request,
+        response: Response,
+    ) -> ListDungeonSchema:
         """Async method that represents a normal get to this API.
 
         This instance of get request is meant to be used with an identifier to
         filter for a specific result.
 
         :param identifier: The unique identifier used in the query.
+        :param request: The request, holding the `If-None-Match` header.
+        :param response: The response that will be sent to the client.
         """
-        return await super().get_by_id(identifier)
+        return await super().get_by_id(identifier, request, response)
 
     async def put(self, request: UpdateDungeonSchema, identifier: str) -> None:
         """Async method that update data for this API.
@@ -85,5 +108,15 @@ async def put(self, request: UpdateDungeonSchema, identifier: str) -> None:
         """
         return await super().put(request, identifier)
 
+    async def put_many(
+        self,
+        request: dict[UUID, UpdateDungeonSchema],
+    ) -> list[UUID]:
+        """Async method that updates many entries of this API at once.
+
+        :param request: The data to update, keyed by unique identifier.
+        """
+        return await super().put_many(request)
+
 
 route = DungeonRoute()
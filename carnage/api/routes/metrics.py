@@ -0,0 +1,115 @@
+# MIT License
+#
+# Copyright (c) 2022, Rodolfo Olivieri
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Module that implements the Metrics Route."""
+
+from typing import Any
+
+from fastapi import APIRouter, Depends
+
+from carnage.api.auth.authentication import APIJWTBearer
+from carnage.api.response_cache import response_cache
+from carnage.database.cache import cache_statistics
+from carnage.database.catalog import catalog
+from carnage.database.instrumentation import query_statistics, slow_queries
+from carnage.database.session import pool_statistics
+
+
+class MetricsRoute:
+    """Class that implements the metrics routes for an API request."""
+
+    def __init__(
+        self,
+        dependencies: list[Depends] = [Depends(APIJWTBearer())],
+    ) -> None:
+        """Constructor for HTTP API route.
+
+        :param dependencies: List of dependencies for the routes.
+        """
+        self.router = APIRouter(
+            prefix="/metrics",
+            tags=["metrics"],
+            dependencies=dependencies,
+        )
+
+        self.router.add_api_route(
+            "/pool",
+            self.pool,
+            methods=["GET"],
+            status_code=200,
+        )
+        self.router.add_api_route(
+            "/cache",
+            self.cache,
+            methods=["GET"],
+            status_code=200,
+        )
+        self.router.add_api_route(
+            "/responses",
+            self.responses,
+            methods=["GET"],
+            status_code=200,
+        )
+        self.router.add_api_route(
+            "/catalog",
+            self.catalog,
+            methods=["GET"],
+            status_code=200,
+        )
+        self.router.add_api_route(
+            "/queries",
+            self.queries,
+            methods=["GET"],
+            status_code=200,
+        )
+        self.router.add_api_route(
+            "/slow-queries",
+            self.slow_queries,
+            methods=["GET"],
+            status_code=200,
+        )
+
+    async def pool(self) -> dict[str, dict[str, int | float]]:
+        """Async method that reports the database connection pool usage."""
+        return pool_statistics()
+
+    async def cache(self) -> dict[str, dict[str, int]]:
+        """Async method that reports the entity cache counters per table."""
+        return cache_statistics()
+
+    async def responses(self) -> dict[str, Any]:
+        """Async method that reports the response cache counters."""
+        return response_cache.statistics()
+
+    async def catalog(self) -> dict[str, Any]:
+        """Async method that reports the reference tables held in memory."""
+        return catalog.statistics()
+
+    async def queries(self) -> list[dict[str, Any]]:
+        """Async method that reports the latency of each SQL statement."""
+        return query_statistics()
+
+    async def slow_queries(self) -> list[dict[str, Any]]:
+        """Async method that reports the most recent slow SQL statements."""
+        return slow_queries()
+
+
+route = MetricsRoute()
@@ -21,6 +21,11 @@
 # SOFTWARE.
 """Module that implements the Monster Route."""
 
+from uuid import UUID
+
+from fastapi import Depends, Request, Response
+
+from carnage.api.parameters import ListParameters
 from carnage.api.routes.base import BaseRoute
 from carnage.api.schemas.monster import (
     CreateMonsterSchema,
@@ -37,6 +42,15 @@ class MonsterRoute(BaseRoute):
     create_schema = CreateMonsterSchema
     update_schema = UpdateMonsterSchema
 
+    filterable = (
+        "name",
+        "is_boss",
+        "monster_type_id",
+        "size_id",
+        "aligment_id",
+    )
+    sortable = ("created_at", "updated_at", "name")
+
     def __init__(
         self,
         name: str = "monster",
@@ -63,19 +77,34 @@ async def post(self, request: CreateMonsterSchema) -> None:
         """
         return await super().post(request)
 
-    async def get(self) -> list[ListMonsterSchema]:
-        """Async method that represents a normal get request to this API."""
-        return await super().get()
+    async def get(
+        self,
+        response: Response,
+        parameters: ListParameters = Depends(),
+    ) -> list[ListMonsterSchema]:
+        """Async method that represents a normal get request to this API.
+
+        :param response: The response that will be sent to the client.
+        :param parameters: The query parameters of the request.
+        """
+        return await super().get(response, parameters)
 
-    async def get_by_id(self, identifier: str) -> ListMonsterSchema:
+    async def get_by_id(
+        self,
+        identifier: str,
+        request: Request,
+        response: Response,
+    ) -> ListMonsterSchema:
         """Async method that represents a normal get to this API.
 
         This instance of get request is meant to be used with an identifier to
         filter for a specific result.
 
         :param identifier: The unique identifier used in the query.
+        :param request: The request, holding the `If-None-Match` header.
+        :param response: The response that will be sent to the client.
         """
-        return await super().get_by_id(identifier)
+        return await super().get_by_id(identifier, request, response)
 
     async def put(self, request: UpdateMonsterSchema, identifier: str) -> None:
         """Async method that update data for this API.
@@ -85,5 +114,15 @@ async def put(self, request: UpdateMonsterSchema, identifier: str) -> None:
         """
         return await super().put(request, identifier)
 
+    async def put_many(
+        self,
+        request: dict[UUID, UpdateMonsterSchema],
+    ) -> list[UUID]:
+        """Async method that updates many entries of this API at once.
+
+        :param request: The data to update, keyed by unique identifier.
+        """
+        return await super().put_many(request)
+
 
 route = MonsterRoute()
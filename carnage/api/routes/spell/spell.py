@@ -21,6 +21,11 @@
 # SOFTWARE.
 """Module that implements the Spell Route."""
 
+from uuid import UUID
+
+from fastapi import Depends, Request, Response
+
+from carnage.api.parameters import ListParameters
 from carnage.api.routes.base import BaseRoute
 from carnage.api.schemas.spell import (
     CreateSpellSchema,
@@ -37,6 +42,14 @@ class SpellRoute(BaseRoute):
     create_schema = CreateSpellSchema
     update_schema = UpdateSpellSchema
 
+    filterable = (
+        "name",
+        "spell_duration_type_id",
+        "spell_range_type_id",
+        "spell_school_id",
+    )
+    sortable = ("created_at", "updated_at", "name")
+
     def __init__(
         self,
         name: str = "spell",
@@ -63,19 +76,34 @@ async def post(self, request: CreateSpellSchema) -> None:
         """
         return await super().post(request)
 
-    async def get(self) -> list[ListSpellSchema]:
-        """Async method that represents a normal get request to this API."""
-        return await super().get()
+    async def get(
+        self,
+        response: Response,
+        parameters: ListParameters = Depends(),
+    ) -> list[ListSpellSchema]:
+        """Async method that represents a normal get request to this API.
+
+        :param response: The response that will be sent to the client.
+        :param parameters: The query parameters of the request.
+        """
+        return await super().get(response, parameters)
 
-    async def get_by_id(self, identifier: str) -> ListSpellSchema:
+    async def get_by_id(
+        self,
+        identifier: str,
+        request: Request,
+        response: Response,
+    ) -> ListSpellSchema:
         """Async method that represents a normal get to this API.
 
         This instance of get request is meant to be used with an identifier to
         filter for a specific result.
 
         :param identifier: The unique identifier used in the query.
+        :param request: The request, holding the `If-None-Match` header.
+        :param response: The response that will be sent to the client.
         """
-        return await super().get_by_id(identifier)
+        return await super().get_by_id(identifier, request, response)
 
     async def put(self, request: UpdateSpellSchema, identifier: str) -> None:
         """Async method that update data for this API.
@@ -85,5 +113,15 @@ async def put(self, request: UpdateSpellSchema, identifier: str) -> None:
         """
         return await super().put(request, identifier)
 
+    async def put_many(
+        self,
+        request: dict[UUID, UpdateSpellSchema],
+    ) -> list[UUID]:
+        """Async method that updates many entries of this API at once.
+
+        :param request: The data to update, keyed by unique identifier.
+        """
+        return await super().put_many(request)
+
 
 route = SpellRoute()
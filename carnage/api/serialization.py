@@ -0,0 +1,145 @@
+# MIT License
+#
+# Copyright (c) 2022, Rodolfo Olivieri
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Module that implements the fast encoding of the rows of a listing.
+
+The rows read by the list endpoints hold the columns of the listing schema
+as they are stored, so they are encoded to JSON bytes straight away instead
+of being validated into schemas, validated again against the response model
+and encoded from there. UUIDs, datetimes, enums and JSONB values are encoded
+natively by :mod:`orjson`.
+"""
+
+from collections.abc import Iterable
+from operator import attrgetter
+from typing import Any, Callable
+
+import orjson
+from pydantic import BaseModel
+
+
+class RowEncoder:
+    """Class that encodes rows into the JSON of a listing schema.
+
+    The getter of each set of columns is built once and reused for every
+    row that holds the same columns.
+    """
+
+    def __init__(self, schema: type[BaseModel]) -> None:
+        """Default constructor for the row encoder.
+
+        :param schema: The schema the rows are encoded as.
+        """
+        self.names = tuple(schema.__fields__)
+        self._getters: dict[
+            tuple[str, ...],
+            Callable[[Any], tuple[Any, ...]],
+        ] = {}
+
+    def _names(
+        self,
+        row: Any,
+        fields: tuple[str, ...] | None,
+    ) -> tuple[str, ...]:
+        """Return the names encoded for a row, in the order of the schema.
+
+        Like `response_model_exclude_unset`, the fields missing from the row
+        are left out.
+
+        :param row: The first row encoded.
+        :param fields: The fields to encode, if not all of them.
+        """
+        names = self.names if fields is None else fields
+        columns = getattr(row, "_fields", None)
+        if columns is None:
+            return tuple(name for name in names if hasattr(row, name))
+
+        return tuple(name for name in names if name in columns)
+
+    def _getter(
+        self,
+        names: tuple[str, ...],
+    ) -> Callable[[Any], tuple[Any, ...]]:
+        """Return the getter of the values of some fields of a row.
+
+        :param names: The names of the fields.
+        """
+        getter = self._getters.get(names)
+        if getter is not None:
+            return getter
+
+        if len(names) > 1:
+            getter = attrgetter(*names)
+        else:
+            # A getter of a single name returns the value alone.
+            getters = [attrgetter(name) for name in names]
+
+            def getter(row: Any) -> tuple[Any, ...]:
+                """Return the value of the only field, if any."""
+                return tuple(get(row) for get in getters)
+
+        self._getters[names] = getter
+        return getter
+
+    def items(
+        self,
+        rows: Iterable[Any],
+        fields: tuple[str, ...] | None = None,
+    ) -> list[dict[str, Any]]:
+        """Turn rows into the items of a listing.
+
+        :param rows: The rows, entities or plain rows alike.
+        :param fields: The fields to encode, if not all of them.
+        """
+        rows = list(rows)
+        if not rows:
+            return []
+
+        names = self._names(rows[0], fields)
+        getter = self._getter(names)
+        return [dict(zip(names, getter(row))) for row in rows]
+
+    def encode(
+        self,
+        rows: Iterable[Any],
+        fields: tuple[str, ...] | None = None,
+    ) -> bytes:
+        """Encode rows into a JSON array.
+
+        :param rows: The rows, entities or plain rows alike.
+        :param fields: The fields to encode, if not all of them.
+        """
+        return orjson.dumps(self.items(rows, fields))
+
+    def encode_lines(
+        self,
+        rows: Iterable[Any],
+        fields: tuple[str, ...] | None = None,
+    ) -> bytes:
+        """Encode rows into JSON objects, one per line.
+
+        :param rows: The rows, entities or plain rows alike.
+        :param fields: The fields to encode, if not all of them.
+        """
+        return b"".join(
+            orjson.dumps(item, option=orjson.OPT_APPEND_NEWLINE)
+            for item in self.items(rows, fields)
+        )
@@ -27,6 +27,10 @@
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from starlette.middleware.sessions import SessionMiddleware
 
+from carnage.api.middleware import (
+    ResponseCacheMiddleware,
+    UnitOfWorkMiddleware,
+)
 from carnage.api.routes import (
     account,
     aligment,
@@ -39,6 +43,7 @@
     game_mode,
     health_check,
     item,
+    metrics,
     monster,
     player,
     race,
@@ -47,6 +52,8 @@
     vocation,
 )
 from carnage.constants import CARNAGE_ENVIRONMENT, CARNAGE_SESSION_SECRET_KEY
+from carnage.database.bus import listener
+from carnage.database.repository.reference import load_catalog
 
 
 def add_router(app: FastAPI) -> None:
@@ -75,6 +82,7 @@ def add_router(app: FastAPI) -> None:
             item.item_base_type.route.router,
             item.item_magical_type.route.router,
             item.item_rarity.route.router,
+            metrics.route.router,
             monster.monster.route.router,
             monster.monster_type.route.router,
             player.route.router,
@@ -99,11 +107,14 @@ def add_middleware(app: FastAPI) -> None:
 
     :param app: The FastAPI instance used.
     """
+    app.add_middleware(UnitOfWorkMiddleware)
     app.add_middleware(
         SessionMiddleware,
         secret_key=CARNAGE_SESSION_SECRET_KEY,
     )
     app.add_middleware(GZipMiddleware, minimum_size=1000)
+    # Responses are cached as they were compressed.
+    app.add_middleware(ResponseCacheMiddleware)
     app.add_middleware(
         CORSMiddleware,
         allow_origins=[
@@ -127,5 +138,8 @@ def create_app() -> FastAPI:
 
     add_router(app)
     add_middleware(app)
+    app.add_event_handler("startup", load_catalog)
+    app.add_event_handler("startup", listener.start)
+    app.add_event_handler("shutdown", listener.stop)
 
     return app
@@ -0,0 +1,108 @@
+# MIT License
+#
+# Copyright (c) 2022, Rodolfo Olivieri
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Module that represents the `partition` command."""
+
+import argparse
+import logging
+from typing import Any
+
+from rich.console import Console
+from rich.table import Table
+
+from carnage.database.partition import (
+    PARTITIONED_TABLES,
+    PartitionManager,
+    maintain_partitions,
+)
+from carnage.database.session import session
+
+logger = logging.getLogger(__name__)
+
+
+def add_subparser(
+    subparsers: Any,
+    parents: list[argparse.ArgumentParser],
+) -> None:
+    """Add all init parsers.
+
+    :param subparsers: subparser we are going to attach to
+    :param parents: Parent parsers, needed to ensure tree structure argparse.
+    """
+    partition_parser = subparsers.add_parser(
+        name="partition",
+        parents=parents,
+        help=(
+            "Create the upcoming partitions and retire the expired ones. "
+            "Must be run regularly, like once a day from cron, otherwise new "
+            "rows pile up in the default partition."
+        ),
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    partition_parser.add_argument(
+        "--list-partitions",
+        action="store_true",
+        default=False,
+        help="List the partitions without changing them.",
+    )
+
+    partition_parser.set_defaults(func=run)
+
+
+def _print_partitions_table() -> None:
+    """Print the partitions of every partitioned table."""
+    table = Table(title="Partitions")
+
+    table.add_column("Table", justify="left", style="cyan", no_wrap=True)
+    table.add_column("Partition", justify="left", no_wrap=True)
+    table.add_column("From", justify="left", no_wrap=True)
+    table.add_column("To", justify="left", no_wrap=True)
+
+    with session.kw["router"].writer.connect() as connection:
+        for name in PARTITIONED_TABLES:
+            for partition in PartitionManager(name).partitions(connection):
+                table.add_row(
+                    name,
+                    partition.name,
+                    str(partition.start),
+                    str(partition.end),
+                )
+
+    console = Console()
+    console.print(table)
+
+
+def run(args: argparse.Namespace) -> None:
+    """Default method that is executed that is tied to the partition command.
+
+    :param args: Arguments passed down to the command.
+    """
+    if args.list_partitions:
+        _print_partitions_table()
+        return
+
+    for table, changes in maintain_partitions().items():
+        logger.info(
+            "Partitions of '%s': %d created, %d retired",
+            table,
+            len(changes["created"]),
+            len(changes["retired"]),
+        )
@@ -30,11 +30,99 @@
     "CARNAGE_SESSION_SECRET_KEY",
 )
 CARNAGE_CHAT_SECRET_KEY: str = os.getenv("CARNAGE_CHAT_SECRET_KEY", "")
+CARNAGE_CACHE_ENABLED: bool = os.getenv(
+    "CARNAGE_CACHE_ENABLED",
+    "true",
+).lower() in ("1", "true", "yes")
+CARNAGE_CACHE_MAX_ENTRIES: int = int(
+    os.getenv("CARNAGE_CACHE_MAX_ENTRIES", "1024"),
+)
+CARNAGE_CACHE_TTL: float = float(os.getenv("CARNAGE_CACHE_TTL", "60"))
+CARNAGE_RESPONSE_CACHE_ENABLED: bool = os.getenv(
+    "CARNAGE_RESPONSE_CACHE_ENABLED",
+    "true",
+).lower() in ("1", "true", "yes")
+CARNAGE_RESPONSE_CACHE_MAX_BYTES: int = int(
+    os.getenv("CARNAGE_RESPONSE_CACHE_MAX_BYTES", "33554432"),
+)
+CARNAGE_RESPONSE_CACHE_TTL: float = float(
+    os.getenv("CARNAGE_RESPONSE_CACHE_TTL", "60"),
+)
+CARNAGE_PAGE_SIZE: int = int(os.getenv("CARNAGE_PAGE_SIZE", "100"))
+CARNAGE_MAX_PAGE_SIZE: int = int(os.getenv("CARNAGE_MAX_PAGE_SIZE", "1000"))
+CARNAGE_MAX_BULK_SIZE: int = int(os.getenv("CARNAGE_MAX_BULK_SIZE", "1000"))
 
 DATABASE_USERNAME: str | None = os.getenv("DATABASE_USERNAME")
 DATABASE_PASSWORD: str | None = os.getenv("DATABASE_PASSWORD")
 DATABASE_HOST: str | None = os.getenv("DATABASE_HOST")
 DATABASE_NAME: str | None = os.getenv("DATABASE_NAME")
+DATABASE_POOL_SIZE: int = int(os.getenv("DATABASE_POOL_SIZE", "10"))
+DATABASE_MAX_OVERFLOW: int = int(os.getenv("DATABASE_MAX_OVERFLOW", "20"))
+DATABASE_POOL_TIMEOUT: float = float(os.getenv("DATABASE_POOL_TIMEOUT", "30"))
+DATABASE_POOL_RECYCLE: int = int(os.getenv("DATABASE_POOL_RECYCLE", "1800"))
+DATABASE_POOL_PRE_PING: bool = os.getenv(
+    "DATABASE_POOL_PRE_PING",
+    "true",
+).lower() in ("1", "true", "yes")
+DATABASE_STATEMENT_TIMEOUT: int = int(
+    os.getenv("DATABASE_STATEMENT_TIMEOUT", "30000"),
+)
+DATABASE_PREPARE_THRESHOLD: int = int(
+    os.getenv("DATABASE_PREPARE_THRESHOLD", "5"),
+)
+DATABASE_INSTRUMENTATION: bool = os.getenv(
+    "DATABASE_INSTRUMENTATION",
+    "true",
+).lower() in ("1", "true", "yes")
+DATABASE_SLOW_QUERY_THRESHOLD: float = float(
+    os.getenv("DATABASE_SLOW_QUERY_THRESHOLD", "200"),
+)
+DATABASE_SLOW_QUERY_EXPLAIN: bool = os.getenv(
+    "DATABASE_SLOW_QUERY_EXPLAIN",
+    "false",
+).lower() in ("1", "true", "yes")
+DATABASE_READER_HOSTS: list[str] = [
+    host.strip()
+    for host in os.getenv("DATABASE_READER_HOSTS", "").split(",")
+    if host.strip()
+]
+DATABASE_READER_STRATEGY: str = os.getenv(
+    "DATABASE_READER_STRATEGY",
+    "round_robin",
+)
+DATABASE_STICKINESS_WINDOW: float = float(
+    os.getenv("DATABASE_STICKINESS_WINDOW", "5"),
+)
+DATABASE_STREAM_BATCH_SIZE: int = int(
+    os.getenv("DATABASE_STREAM_BATCH_SIZE", "1000"),
+)
+DATABASE_COPY_BATCH_SIZE: int = int(
+    os.getenv("DATABASE_COPY_BATCH_SIZE", "10000"),
+)
+DATABASE_PARTITION_INTERVAL: str = os.getenv(
+    "DATABASE_PARTITION_INTERVAL",
+    "month",
+)
+DATABASE_PARTITION_PREMAKE: int = int(
+    os.getenv("DATABASE_PARTITION_PREMAKE", "3"),
+)
+DATABASE_PARTITION_RETENTION: int = int(
+    os.getenv("DATABASE_PARTITION_RETENTION", "0"),
+)
+DATABASE_PARTITION_DROP: bool = os.getenv(
+    "DATABASE_PARTITION_DROP",
+    "true",
+).lower() in ("1", "true", "yes")
+DATABASE_INVALIDATION_CHANNEL: str = os.getenv(
+    "DATABASE_INVALIDATION_CHANNEL",
+    "carnage_invalidation",
+)
+DATABASE_INVALIDATION_DELAY: float = float(
+    os.getenv("DATABASE_INVALIDATION_DELAY", "50"),
+)
+DATABASE_INVALIDATION_RECONNECT: float = float(
+    os.getenv("DATABASE_INVALIDATION_RECONNECT", "5"),
+)
 
 JWT_SECRET_KEY: str | None = os.getenv("JWT_SECRET_KEY")
 JWT_ALGORITHM: str | None = os.getenv("JWT_ALGORITHM", "HS256")
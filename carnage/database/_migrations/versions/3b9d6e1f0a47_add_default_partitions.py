@@ -0,0 +1,65 @@
+# MIT License
+#
+# Copyright (c) 2022, Rodolfo Olivieri
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""add default partitions.
+
+Revision ID: 3b9d6e1f0a47
+Revises: b4e8f1a26c37
+Create Date: 2026-10-18 18:21:07.514862
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "3b9d6e1f0a47"
+down_revision = "b4e8f1a26c37"
+branch_labels = None
+depends_on = None
+
+# Tables partitioned by range of `created_at`. Rows created past the last
+# partition, when the `partition` command did not run in time, land in the
+# default partition instead of being refused.
+tables = ("global_chats", "dungeon_histories")
+
+
+def upgrade() -> None:
+    for table in tables:
+        op.execute(
+            f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT",
+        )
+
+
+def downgrade() -> None:
+    connection = op.get_bind()
+    for table in tables:
+        # Rows are never removed here, the ones in the default partition must
+        # be moved to their own partition first, see `carnage partition`.
+        count = connection.execute(
+            sa.text(f"SELECT count(*) FROM {table}_default"),
+        ).scalar()
+        if count:
+            raise RuntimeError(
+                f"{count} rows are still in {table}_default, run "
+                "`carnage partition` before downgrading.",
+            )
+
+        op.drop_table(f"{table}_default")
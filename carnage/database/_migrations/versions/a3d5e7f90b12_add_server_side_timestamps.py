@@ -0,0 +1,82 @@
+# MIT License
+#
+# Copyright (c) 2022, Rodolfo Olivieri
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""add server side timestamps.
+
+Revision ID: a3d5e7f90b12
+Revises: f7c2d8e51a09
+Create Date: 2026-10-18 16:31:08.194620
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "a3d5e7f90b12"
+down_revision = "f7c2d8e51a09"
+branch_labels = None
+depends_on = None
+
+tables = (
+    "accounts",
+    "aligments",
+    "channel_chats",
+    "conditions",
+    "difficulties",
+    "dungeon_difficulties",
+    "dungeon_histories",
+    "dungeon_schemas",
+    "dungeons",
+    "game_modes",
+    "global_chats",
+    "item_base_types",
+    "item_magical_types",
+    "item_rarities",
+    "items",
+    "monster_types",
+    "monsters",
+    "players",
+    "races",
+    "sizes",
+    "spell_duration_types",
+    "spell_range_types",
+    "spell_schools",
+    "spells",
+    "vocation_spells",
+    "vocations",
+)
+
+
+def upgrade() -> None:
+    for table in tables:
+        for column in ("created_at", "updated_at"):
+            op.alter_column(table, column, server_default=sa.func.now())
+
+        # Serves the listings filtered with `?updated_since=`, which include
+        # the deleted rows, so the index is not partial.
+        op.create_index(f"ix_{table}_updated_at", table, ["updated_at"])
+
+
+def downgrade() -> None:
+    for table in tables:
+        op.drop_index(f"ix_{table}_updated_at", table_name=table)
+        for column in ("created_at", "updated_at"):
+            op.alter_column(table, column, server_default=None)
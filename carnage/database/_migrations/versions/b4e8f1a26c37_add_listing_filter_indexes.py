@@ -0,0 +1,64 @@
+# MIT License
+#
+# Copyright (c) 2022, Rodolfo Olivieri
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""add listing filter indexes.
+
+Revision ID: b4e8f1a26c37
+Revises: a3d5e7f90b12
+Create Date: 2026-10-18 17:12:55.402917
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "b4e8f1a26c37"
+down_revision = "a3d5e7f90b12"
+branch_labels = None
+depends_on = None
+
+# Columns that the list endpoints can filter with `?filter[column]=` on the
+# tables that keep growing. The reference tables are small and served from
+# memory, and the names are already covered by the unique indexes.
+indexes = {
+    "players": [["dungeon_id"], ["vocation_id"]],
+    "accounts": [["provider"]],
+}
+
+
+def upgrade() -> None:
+    for table, column_sets in indexes.items():
+        for columns in column_sets:
+            op.create_index(
+                f"ix_{table}_{'_'.join(columns)}",
+                table,
+                columns,
+                postgresql_where=sa.text("deleted_at IS NULL"),
+            )
+
+
+def downgrade() -> None:
+    for table, column_sets in indexes.items():
+        for columns in column_sets:
+            op.drop_index(
+                f"ix_{table}_{'_'.join(columns)}",
+                table_name=table,
+            )
@@ -0,0 +1,80 @@
+# MIT License
+#
+# Copyright (c) 2022, Rodolfo Olivieri
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""add pagination indexes.
+
+Revision ID: b7e3c91a5d20
+Revises: f4f1c4da349e
+Create Date: 2026-10-18 09:12:41.503127
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "b7e3c91a5d20"
+down_revision = "f4f1c4da349e"
+branch_labels = None
+depends_on = None
+
+tables = [
+    "accounts",
+    "aligments",
+    "channel_chats",
+    "conditions",
+    "difficulties",
+    "dungeon_difficulties",
+    "dungeon_histories",
+    "dungeon_schemas",
+    "dungeons",
+    "game_modes",
+    "global_chats",
+    "item_base_types",
+    "item_magical_types",
+    "item_rarities",
+    "items",
+    "monster_types",
+    "monsters",
+    "players",
+    "races",
+    "sizes",
+    "spell_duration_types",
+    "spell_range_types",
+    "spell_schools",
+    "spells",
+    "vocation_spells",
+    "vocations",
+]
+
+
+def upgrade() -> None:
+    for table in tables:
+        op.create_index(
+            f"ix_{table}_created_at_id",
+            table,
+            ["created_at", "id"],
+            postgresql_where=sa.text("deleted_at IS NULL"),
+        )
+
+
+def downgrade() -> None:
+    for table in tables:
+        op.drop_index(f"ix_{table}_created_at_id", table_name=table)
@@ -0,0 +1,87 @@
+# MIT License
+#
+# Copyright (c) 2022, Rodolfo Olivieri
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""add upsert unique indexes.
+
+Revision ID: c5a8e2f17b94
+Revises: b7e3c91a5d20
+Create Date: 2026-10-18 11:02:18.240913
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "c5a8e2f17b94"
+down_revision = "b7e3c91a5d20"
+branch_labels = None
+depends_on = None
+
+# The conflict target of the repositories that upsert: accounts, created on
+# login, and the reference tables filled by the seeds.
+conflict_targets = {
+    "accounts": ["username"],
+    "aligments": ["name"],
+    "conditions": ["name"],
+    "difficulties": ["name"],
+    "dungeon_difficulties": ["level"],
+    "game_modes": ["name"],
+    "item_base_types": ["name"],
+    "item_magical_types": ["name"],
+    "item_rarities": ["name"],
+    "monster_types": ["name"],
+    "sizes": ["name"],
+    "spell_duration_types": ["name"],
+    "spell_range_types": ["name"],
+    "spell_schools": ["name"],
+    "vocation_spells": ["vocation_id", "spell_id"],
+}
+
+
+def upgrade() -> None:
+    connection = op.get_bind()
+    for table, columns in conflict_targets.items():
+        # Rows are never removed here, duplicates must be solved by hand
+        # before the index can be created.
+        group = ", ".join(columns)
+        duplicated = connection.execute(
+            sa.text(
+                f"SELECT {group} FROM {table} WHERE deleted_at IS NULL "
+                f"GROUP BY {group} HAVING count(*) > 1",
+            ),
+        ).all()
+        if duplicated:
+            raise RuntimeError(
+                f"Duplicated rows in {table} on ({group}): {duplicated}",
+            )
+
+        op.create_index(
+            f"uq_{table}_{'_'.join(columns)}",
+            table,
+            columns,
+            unique=True,
+            postgresql_where=sa.text("deleted_at IS NULL"),
+        )
+
+
+def downgrade() -> None:
+    for table, columns in conflict_targets.items():
+        op.drop_index(f"uq_{table}_{'_'.join(columns)}", table_name=table)
@@ -0,0 +1,66 @@
+# MIT License
+#
+# Copyright (c) 2022, Rodolfo Olivieri
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""add lookup indexes.
+
+Revision ID: d9f04b6a3e21
+Revises: c5a8e2f17b94
+Create Date: 2026-10-18 12:27:05.618342
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "d9f04b6a3e21"
+down_revision = "c5a8e2f17b94"
+branch_labels = None
+depends_on = None
+
+# Columns filtered by the repository lookups that are not already covered
+# by a primary key or an unique index. The composite index on dungeon
+# histories also serves the lookups by player alone.
+indexes = {
+    "accounts": [["nickname"]],
+    "dungeon_histories": [["player_id", "dungeon_id"], ["dungeon_id"]],
+    "dungeon_schemas": [["dungeon_difficulty_id"]],
+    "vocation_spells": [["spell_id"]],
+}
+
+
+def upgrade() -> None:
+    for table, column_sets in indexes.items():
+        for columns in column_sets:
+            op.create_index(
+                f"ix_{table}_{'_'.join(columns)}",
+                table,
+                columns,
+                postgresql_where=sa.text("deleted_at IS NULL"),
+            )
+
+
+def downgrade() -> None:
+    for table, column_sets in indexes.items():
+        for columns in column_sets:
+            op.drop_index(
+                f"ix_{table}_{'_'.join(columns)}",
+                table_name=table,
+            )
@@ -0,0 +1,192 @@
+# MIT License
+#
+# Copyright (c) 2022, Rodolfo Olivieri
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""partition chats and dungeon histories.
+
+Revision ID: e2a6f9c47b18
+Revises: d9f04b6a3e21
+Create Date: 2026-10-18 14:02:41.208315
+
+"""
+from datetime import datetime
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects.postgresql import UUID
+
+# revision identifiers, used by Alembic.
+revision = "e2a6f9c47b18"
+down_revision = "d9f04b6a3e21"
+branch_labels = None
+depends_on = None
+
+# Monthly partitions created ahead of the current month. Later partitions are
+# created by the `partition` command.
+premake = 3
+
+
+def columns(table: str) -> list[sa.Column]:
+    """Build the columns of a table, without its primary key."""
+    if table == "global_chats":
+        specific = [
+            sa.Column(
+                "from_account_id",
+                UUID(as_uuid=True),
+                sa.ForeignKey("accounts.id"),
+                nullable=False,
+            ),
+            sa.Column("message", sa.String(), nullable=False),
+            sa.Column(
+                "channel_chat_id",
+                UUID(as_uuid=True),
+                sa.ForeignKey("channel_chats.id"),
+                nullable=False,
+            ),
+        ]
+    else:
+        specific = [
+            sa.Column("last_level", sa.Integer(), nullable=False),
+            sa.Column("last_room", sa.Integer(), nullable=False),
+            sa.Column("is_player_alive", sa.Boolean(), nullable=False),
+            sa.Column("is_dungeon_complete", sa.Boolean(), nullable=False),
+            sa.Column(
+                "player_id",
+                UUID(as_uuid=True),
+                sa.ForeignKey("players.id"),
+                nullable=False,
+            ),
+            sa.Column(
+                "dungeon_id",
+                UUID(as_uuid=True),
+                sa.ForeignKey("dungeons.id"),
+                nullable=False,
+            ),
+        ]
+
+    return [
+        sa.Column("id", UUID(as_uuid=True), nullable=False),
+        *specific,
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("deleted_at", sa.DateTime(), nullable=True),
+    ]
+
+
+# Indexes of the tables, besides the primary key, created by the earlier
+# revisions. They are partial indexes on the rows that are not deleted.
+indexes = {
+    "global_chats": [["created_at", "id"]],
+    "dungeon_histories": [
+        ["created_at", "id"],
+        ["player_id", "dungeon_id"],
+        ["dungeon_id"],
+    ],
+}
+
+
+def create_indexes(table: str) -> None:
+    for index_columns in indexes[table]:
+        op.create_index(
+            f"ix_{table}_{'_'.join(index_columns)}",
+            table,
+            index_columns,
+            postgresql_where=sa.text("deleted_at IS NULL"),
+        )
+
+
+def move_aside(table: str) -> str:
+    """Rename a table, and its primary key, so a new one can take its place.
+
+    The other indexes are dropped, they are created again on the new table.
+    """
+    old = f"{table}_old"
+    for index_columns in indexes[table]:
+        op.drop_index(
+            f"ix_{table}_{'_'.join(index_columns)}",
+            table_name=table,
+        )
+    op.rename_table(table, old)
+    op.execute(
+        f"ALTER TABLE {old} RENAME CONSTRAINT {table}_pkey TO {old}_pkey"
+    )
+    return old
+
+
+def copy_rows(source: str, target: str) -> None:
+    names = ", ".join(column.name for column in columns(target))
+    op.execute(f"INSERT INTO {target} ({names}) SELECT {names} FROM {source}")
+
+
+def month_start(moment: datetime) -> datetime:
+    return moment.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def next_month(start: datetime) -> datetime:
+    year, month = divmod(start.month, 12)
+    return start.replace(year=start.year + year, month=month + 1)
+
+
+def create_partitions(table: str, source: str) -> None:
+    """Create monthly partitions covering the rows of the source table."""
+    bounds = sa.text(f"SELECT min(created_at), max(created_at) FROM {source}")
+    oldest, newest = op.get_bind().execute(bounds).one()
+    current = month_start(datetime.now())
+    start = month_start(min(oldest, current) if oldest else current)
+    horizon = current
+    for _ in range(premake + 1):
+        horizon = next_month(horizon)
+    if newest and newest >= horizon:
+        horizon = next_month(month_start(newest))
+
+    while start < horizon:
+        end = next_month(start)
+        op.execute(
+            f"CREATE TABLE {table}_p{start:%Y%m%d} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{start.isoformat(' ')}') "
+            f"TO ('{end.isoformat(' ')}')",
+        )
+        start = end
+
+
+def upgrade() -> None:
+    for table in indexes:
+        old = move_aside(table)
+        # The partition key has to be part of the primary key.
+        op.create_table(
+            table,
+            *columns(table),
+            sa.PrimaryKeyConstraint("id", "created_at"),
+            postgresql_partition_by="RANGE (created_at)",
+        )
+        create_partitions(table, old)
+        copy_rows(old, table)
+        op.drop_table(old)
+        create_indexes(table)
+
+
+def downgrade() -> None:
+    for table in indexes:
+        old = move_aside(table)
+        op.create_table(table, *columns(table), sa.PrimaryKeyConstraint("id"))
+        copy_rows(old, table)
+        # Dropping the partitioned table drops its partitions as well.
+        op.drop_table(old)
+        create_indexes(table)
@@ -0,0 +1,77 @@
+# MIT License
+#
+# Copyright (c) 2022, Rodolfo Olivieri
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""generate uuid7 identifiers.
+
+Revision ID: f7c2d8e51a09
+Revises: e2a6f9c47b18
+Create Date: 2026-10-18 15:46:12.730194
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "f7c2d8e51a09"
+down_revision = "e2a6f9c47b18"
+branch_labels = None
+depends_on = None
+
+# Tables whose identifiers are time ordered, see `BaseMixin.id_generator`.
+# The rows already there keep their identifiers, which are referenced by
+# other tables. Only the new rows get an UUID version 7.
+tables = ("global_chats", "dungeon_histories", "players")
+
+# Server side twin of `carnage.database.models.base.uuid7`, used by the rows
+# inserted without going through the models.
+uuid7_function = """
+CREATE OR REPLACE FUNCTION uuid_generate_v7() RETURNS uuid AS $$
+DECLARE
+    value bytea := uuid_send(gen_random_uuid());
+    milliseconds bigint := floor(
+        extract(epoch FROM clock_timestamp()) * 1000
+    );
+BEGIN
+    value := overlay(
+        value PLACING substring(int8send(milliseconds) FROM 3) FROM 1 FOR 6
+    );
+    value := set_byte(value, 6, (get_byte(value, 6) & 15) | 112);
+    RETURN encode(value, 'hex')::uuid;
+END
+$$ LANGUAGE plpgsql VOLATILE PARALLEL SAFE
+"""
+
+
+def upgrade() -> None:
+    op.execute(uuid7_function)
+    for table in tables:
+        op.alter_column(
+            table,
+            "id",
+            server_default=sa.text("uuid_generate_v7()"),
+        )
+
+
+def downgrade() -> None:
+    for table in tables:
+        op.alter_column(table, "id", server_default=None)
+
+    op.execute("DROP FUNCTION uuid_generate_v7()")
@@ -0,0 +1,195 @@
+# MIT License
+#
+# Copyright (c) 2022, Rodolfo Olivieri
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Module that implements the helpers used to bulk load rows with COPY.
+
+`COPY FROM STDIN` skips the parsing and parameter binding that a regular
+`INSERT` pays for every row, which makes it the fastest way to ingest large
+amounts of data in PostgreSQL. Since rows are sent straight to the server,
+the Python side defaults that SQLAlchemy would normally apply (like the
+`id` of a model) are filled in here before a row is written.
+"""
+
+import enum
+import itertools
+from collections.abc import Callable, Iterable, Iterator
+from typing import Any
+
+from psycopg.types.json import Jsonb
+from sqlalchemy import Column, Table
+from sqlalchemy.engine import Dialect
+from sqlalchemy.types import JSON
+
+Progress = Callable[[int], None]
+
+
+def batches(
+    rows: Iterable[dict[str, Any]],
+    size: int,
+) -> Iterator[list[dict[str, Any]]]:
+    """Split the rows in lists of at most `size` elements.
+
+    :param rows: The rows to split, which may be a generator.
+    :param size: The maximum number of rows in each batch.
+    """
+    iterator = iter(rows)
+    while batch := list(itertools.islice(iterator, size)):
+        yield batch
+
+
+def key_groups(rows: list[dict[str, Any]]) -> list[list[dict[str, Any]]]:
+    """Group the rows of a batch by the columns they hold.
+
+    A column can only be left to its server side default when no row of the
+    `COPY` sends it, so rows holding different columns are copied apart.
+
+    :param rows: The batch of rows being copied.
+    :return: The groups, in the order their first row appears.
+    """
+    groups: dict[frozenset[str], list[dict[str, Any]]] = {}
+    for row in rows:
+        groups.setdefault(frozenset(row), []).append(row)
+
+    return list(groups.values())
+
+
+def copy_columns(table: Table, rows: list[dict[str, Any]]) -> list[Column]:
+    """Return the columns that must be sent for a batch of rows.
+
+    Columns that are not present in any row and have no Python side default
+    are left out, so the server side defaults can take place. Defaults that
+    are SQL expressions, like `now()`, are left to the server as well.
+
+    :param table: The table receiving the rows.
+    :param rows: The batch of rows being copied.
+    """
+    keys = set().union(*rows)
+    return [
+        column
+        for column in table.columns
+        if column.key in keys
+        or (
+            column.default is not None and not column.default.is_clause_element
+        )
+    ]
+
+
+def copy_statement(
+    table: Table,
+    columns: list[Column],
+    dialect: Dialect,
+) -> str:
+    """Build the `COPY FROM STDIN` statement for the given columns.
+
+    :param table: The table receiving the rows.
+    :param columns: The columns sent for each row.
+    :param dialect: The dialect used to quote the identifiers.
+    """
+    preparer = dialect.identifier_preparer
+    names = ", ".join(preparer.format_column(column) for column in columns)
+    return f"COPY {preparer.format_table(table)} ({names}) FROM STDIN"
+
+
+def adapt_value(column: Column, value: Any) -> Any:
+    """Adapt a value to what psycopg expects to write in a COPY.
+
+    :param column: The column the value belongs to.
+    :param value: The value to adapt.
+    """
+    if isinstance(column.type, JSON):
+        if value is None and column.type.none_as_null:
+            return None
+        return Jsonb(value)
+
+    if isinstance(value, enum.Enum):
+        # SQLAlchemy persists enums by their names, not their values.
+        return value.name
+
+    return value
+
+
+def adapt_row(columns: list[Column], row: dict[str, Any]) -> tuple:
+    """Turn a row into the tuple written to the COPY stream.
+
+    :param columns: The columns sent for each row.
+    :param row: The values of the row, keyed by column name.
+    """
+    values = []
+    for column in columns:
+        if column.key in row:
+            value = row[column.key]
+        elif column.default is not None and column.default.is_callable:
+            value = column.default.arg(None)
+        elif column.default is not None and column.default.is_scalar:
+            value = column.default.arg
+        else:
+            value = None
+
+        values.append(adapt_value(column, value))
+
+    return tuple(values)
+
+
+def copy_rows(
+    connection: Any,
+    table: Table,
+    rows: list[dict[str, Any]],
+    dialect: Dialect,
+) -> None:
+    """Copy a batch of rows using a psycopg connection.
+
+    Rows holding different columns are copied apart, see
+    :func:`key_groups`.
+
+    :param connection: The psycopg connection used to write the rows.
+    :param table: The table receiving the rows.
+    :param rows: The batch of rows to copy.
+    :param dialect: The dialect used to quote the identifiers.
+    """
+    with connection.cursor() as cursor:
+        for group in key_groups(rows):
+            columns = copy_columns(table, group)
+            statement = copy_statement(table, columns, dialect)
+            with cursor.copy(statement) as copy:
+                for row in group:
+                    copy.write_row(adapt_row(columns, row))
+
+
+async def async_copy_rows(
+    connection: Any,
+    table: Table,
+    rows: list[dict[str, Any]],
+    dialect: Dialect,
+) -> None:
+    """Asynchronous version of :func:`copy_rows`.
+
+    :param connection: The psycopg async connection used to write the rows.
+    :param table: The table receiving the rows.
+    :param rows: The batch of rows to copy.
+    :param dialect: The dialect used to quote the identifiers.
+    """
+    async with connection.cursor() as cursor:
+        for group in key_groups(rows):
+            columns = copy_columns(table, group)
+            statement = copy_statement(table, columns, dialect)
+            async with cursor.copy(statement) as copy:
+                for row in group:
+                    await copy.write_row(adapt_row(columns, row))
@@ -0,0 +1,270 @@
+# MIT License
+#
+# Copyright (c) 2022, Rodolfo Olivieri
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Module that keeps the caches of every worker in sync with the writes.
+
+Each write that goes through a repository publishes the table and the
+identifiers of the rows it changed with ``pg_notify``, in the same transaction
+as the write, so the notification is only delivered once it is committed.
+Every API worker listens on ``DATABASE_INVALIDATION_CHANNEL`` in the
+background and evicts the matching entries of its caches and catalog.
+Notifications are coalesced for ``DATABASE_INVALIDATION_DELAY`` milliseconds
+before being applied, and everything is flushed each time the listener
+connects, since the notifications sent while it was away are lost.
+"""
+
+import asyncio
+import json
+import logging
+import uuid
+from collections.abc import Iterable
+from typing import Any
+
+import psycopg
+from psycopg import sql
+from sqlalchemy import Engine, TextClause, text
+
+from carnage.constants import (
+    DATABASE_INVALIDATION_CHANNEL,
+    DATABASE_INVALIDATION_DELAY,
+    DATABASE_INVALIDATION_RECONNECT,
+)
+from carnage.database.cache import clear_caches, evict
+from carnage.database.catalog import catalog
+from carnage.database.session import async_session
+
+logger = logging.getLogger(__name__)
+
+#: Identifier of the current process, so it skips its own notifications.
+ORIGIN: str = uuid.uuid4().hex
+
+#: Largest payload sent, Postgres refuses payloads of 8000 bytes or more.
+#: Larger notifications flush the whole table instead.
+MAX_PAYLOAD: int = 7900
+
+_NOTIFY = text("SELECT pg_notify(:channel, :payload)")
+
+
+def payload(table: str, identifiers: Iterable[Any] | None) -> str:
+    """Build the payload of a notification.
+
+    :param table: The name of the table written.
+    :param identifiers: The unique identifiers of the rows written, or
+        `None` if they are not known.
+    """
+    if identifiers is not None:
+        identifiers = sorted({str(identifier) for identifier in identifiers})
+
+    message = json.dumps(
+        {"origin": ORIGIN, "table": table, "ids": identifiers},
+    )
+    if len(message.encode()) > MAX_PAYLOAD:
+        message = json.dumps({"origin": ORIGIN, "table": table, "ids": None})
+
+    return message
+
+
+def notify_statement(
+    bind: Engine,
+    table: str,
+    identifiers: Iterable[Any] | None,
+    channel: str = DATABASE_INVALIDATION_CHANNEL,
+) -> TextClause | None:
+    """Build the statement that publishes a write to the other workers.
+
+    :param bind: The engine the write is executed on.
+    :param table: The name of the table written.
+    :param identifiers: The unique identifiers of the rows written, or
+        `None` if they are not known.
+    :param channel: The channel to notify.
+    :return: The statement, or `None` if there is nobody to tell.
+    """
+    if not channel or bind.dialect.name != "postgresql":
+        return None
+
+    return _NOTIFY.bindparams(
+        channel=channel,
+        payload=payload(table, identifiers),
+    )
+
+
+def flush() -> None:
+    """Forget everything cached by the current worker."""
+    clear_caches()
+    catalog.clear()
+
+
+class Invalidations:
+    """Class that coalesces the notifications received, per table."""
+
+    def __init__(self) -> None:
+        """Default constructor for the invalidations."""
+        self.tables: dict[str, set[str] | None] = {}
+
+    def add(self, table: str, identifiers: Iterable[str] | None) -> None:
+        """Add the rows of a notification.
+
+        :param table: The name of the table written.
+        :param identifiers: The unique identifiers of the rows written, or
+            `None` to flush the whole table.
+        """
+        if identifiers is None or (
+            table in self.tables and self.tables[table] is None
+        ):
+            self.tables[table] = None
+        else:
+            self.tables.setdefault(table, set()).update(identifiers)
+
+    def parse(self, message: str) -> bool:
+        """Add the rows of a notification payload.
+
+        Notifications published by the current process are skipped, its
+        caches were already invalidated by the write itself.
+
+        :param message: The payload of the notification.
+        :return: If the notification was added.
+        """
+        try:
+            data = json.loads(message)
+            origin, table, identifiers = (
+                data["origin"],
+                data["table"],
+                data["ids"],
+            )
+        except (ValueError, TypeError, KeyError):
+            logger.warning("Ignoring invalid notification '%s'", message)
+            return False
+
+        if origin == ORIGIN:
+            return False
+
+        self.add(table, identifiers)
+        return True
+
+    def apply(self) -> None:
+        """Evict the rows added from the caches and the catalog."""
+        for table, identifiers in self.tables.items():
+            evict(table, identifiers)
+            if catalog.get(table) is not None:
+                catalog.discard(table)
+
+        self.tables.clear()
+
+
+class InvalidationListener:
+    """Class that listens to the writes of the other workers."""
+
+    def __init__(
+        self,
+        channel: str = DATABASE_INVALIDATION_CHANNEL,
+        delay: float = DATABASE_INVALIDATION_DELAY,
+        reconnect: float = DATABASE_INVALIDATION_RECONNECT,
+    ) -> None:
+        """Default constructor for the invalidation listener.
+
+        :param channel: The channel to listen to.
+        :param delay: Milliseconds spent coalescing notifications.
+        :param reconnect: Seconds to wait before connecting again.
+        """
+        self.channel = channel
+        self.delay = delay
+        self.reconnect = reconnect
+        self.received = 0
+        self.flushes = 0
+        self._task: asyncio.Task | None = None
+
+    def _conninfo(self) -> str:
+        """Build the connection string of the primary database."""
+        url = async_session.kw["router"].writer.url
+        return url.set(drivername="postgresql").render_as_string(
+            hide_password=False,
+        )
+
+    async def _connect(self) -> psycopg.AsyncConnection:
+        """Open the connection used to listen to the channel."""
+        connection = await psycopg.AsyncConnection.connect(
+            self._conninfo(),
+            autocommit=True,
+        )
+        await connection.execute(
+            sql.SQL("LISTEN {}").format(sql.Identifier(self.channel)),
+        )
+        return connection
+
+    async def receive(self, connection: psycopg.AsyncConnection) -> None:
+        """Wait for a notification and apply it with the ones that follow.
+
+        :param connection: The connection listening to the channel.
+        """
+        invalidations = Invalidations()
+        async for notify in connection.notifies(stop_after=1):
+            self.received += 1
+            invalidations.parse(notify.payload)
+
+        async for notify in connection.notifies(timeout=self.delay / 1000):
+            self.received += 1
+            invalidations.parse(notify.payload)
+
+        invalidations.apply()
+
+    async def listen(self) -> None:
+        """Listen to the channel until cancelled.
+
+        The listener connects again after a while if the connection is lost.
+        """
+        while True:
+            try:
+                async with await self._connect() as connection:
+                    flush()
+                    self.flushes += 1
+                    logger.info("Listening to '%s'", self.channel)
+                    while True:
+                        await self.receive(connection)
+            except (psycopg.OperationalError, OSError) as error:
+                logger.warning(
+                    "Lost the connection to '%s', retrying in %ss: %s",
+                    self.channel,
+                    self.reconnect,
+                    error,
+                )
+                await asyncio.sleep(self.reconnect)
+
+    async def start(self) -> None:
+        """Start listening in the background, unless the bus is disabled."""
+        if self.channel and self._task is None:
+            self._task = asyncio.create_task(self.listen())
+
+    async def stop(self) -> None:
+        """Stop listening."""
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+        self._task = None
+
+
+#: Listener started by the API workers.
+listener = InvalidationListener()
@@ -0,0 +1,297 @@
+# MIT License
+#
+# Copyright (c) 2022, Rodolfo Olivieri
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Module that implements the entity cache used by the repositories."""
+
+import functools
+import inspect
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterable, Mapping
+from typing import Any
+
+from carnage.constants import (
+    CARNAGE_CACHE_ENABLED,
+    CARNAGE_CACHE_MAX_ENTRIES,
+    CARNAGE_CACHE_TTL,
+)
+from carnage.database.session import read_from_writer
+from carnage.database.unit_of_work import current_unit_of_work
+
+#: Sentinel returned by :meth:`EntityCache.get` when a key is not cached.
+MISSING = object()
+
+
+class EntityCache:
+    """Class that caches query results for a single model.
+
+    The cache is a least recently used mapping bounded by a number of entries,
+    where every entry expires after a time to live. Repositories invalidate it
+    every time they write to the model table.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_entries: int = CARNAGE_CACHE_MAX_ENTRIES,
+        ttl: float = CARNAGE_CACHE_TTL,
+        enabled: bool = CARNAGE_CACHE_ENABLED,
+    ) -> None:
+        """Default constructor for the entity cache.
+
+        :param name: The name of the cache, usually the table name.
+        :param max_entries: Maximum number of entries held at the same time.
+        :param ttl: Number of seconds an entry is considered fresh.
+        :param enabled: If the cache should store anything at all.
+        """
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.enabled = enabled
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable) -> Any:
+        """Get a fresh value from the cache.
+
+        :param key: The key used to store the value.
+        :return: The value cached or :data:`MISSING`.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return MISSING
+
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return MISSING
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value in the cache, evicting the oldest entries if needed.
+
+        :param key: The key used to store the value.
+        :param value: The value to store.
+        """
+        if not self.enabled or self.max_entries <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def discard(self, key: Hashable) -> None:
+        """Drop a single entry, if it is cached.
+
+        :param key: The key used to store the value.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def invalidate(self) -> None:
+        """Drop every entry held by the cache."""
+        with self._lock:
+            self._entries.clear()
+            self.invalidations += 1
+
+    def evict(self, identifiers: Iterable[Any]) -> None:
+        """Drop the entries that may hold any of the rows given.
+
+        Only the entries of ``select_by_id`` are known to hold a single row,
+        so the ones for other identifiers are kept. Every other entry, like
+        the listings, is dropped.
+
+        :param identifiers: The unique identifiers of the rows written.
+        """
+        identifiers = {str(identifier) for identifier in identifiers}
+        with self._lock:
+            for key in list(self._entries):
+                name, *arguments = key
+                if name != "select_by_id" or (
+                    str(arguments[0][1]) in identifiers
+                ):
+                    del self._entries[key]
+            self.invalidations += 1
+
+    def statistics(self) -> dict[str, int]:
+        """Report the counters of the cache."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+
+_caches: dict[str, EntityCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_cache(model: Any) -> EntityCache:
+    """Get (or create) the cache that belongs to a model.
+
+    :param model: The model class that owns the cache.
+    """
+    name = getattr(model, "__tablename__", model.__name__)
+    with _caches_lock:
+        if name not in _caches:
+            _caches[name] = EntityCache(name=name)
+
+        return _caches[name]
+
+
+def clear_caches() -> None:
+    """Drop every entry of every cache."""
+    with _caches_lock:
+        caches = list(_caches.values())
+
+    for cache in caches:
+        cache.invalidate()
+
+
+def evict(name: str, identifiers: Iterable[Any] | None = None) -> None:
+    """Drop the entries of a cache that may hold any of the rows given.
+
+    :param name: The name of the cache, usually the table name.
+    :param identifiers: The unique identifiers of the rows written, or
+        `None` to drop every entry of the cache.
+    """
+    with _caches_lock:
+        cache = _caches.get(name)
+
+    if cache is None:
+        return
+
+    if identifiers is None:
+        cache.invalidate()
+    else:
+        cache.evict(identifiers)
+
+
+def cache_statistics() -> dict[str, dict[str, int]]:
+    """Report the counters of every cache, keyed by its name."""
+    with _caches_lock:
+        caches = list(_caches.values())
+
+    return {cache.name: cache.statistics() for cache in caches}
+
+
+def cached(method: Callable[..., Any]) -> Callable[..., Any]:
+    """Decorator that caches the result of a repository read method.
+
+    The result is stored in the cache of the repository model, keyed by the
+    method name and its arguments. The synchronous method and its ``async_``
+    twin share the same entries. Mappings, like the filters of a listing,
+    are keyed by their sorted items. Calls with arguments that can't be
+    hashed are never cached. The results stored are read from the primary,
+    see :func:`carnage.database.session.read_from_writer`, so a fill that
+    follows a write never caches what a lagging replica returned. Entries
+    filled inside a unit of work are dropped if it is rolled back, see
+    :mod:`carnage.database.unit_of_work`.
+
+    :param method: The repository method to decorate.
+    """
+    signature = inspect.signature(method)
+    name = method.__name__.removeprefix("async_")
+
+    def _key(args: tuple[Any, ...], kwargs: dict[str, Any]) -> Hashable:
+        """Build the cache key for a call."""
+        bound = signature.bind(None, *args, **kwargs)
+        bound.apply_defaults()
+        arguments = []
+        for argument, value in tuple(bound.arguments.items())[1:]:
+            kind = signature.parameters[argument].kind
+            if kind is inspect.Parameter.VAR_KEYWORD or isinstance(
+                value,
+                Mapping,
+            ):
+                value = tuple(sorted(value.items()))
+            arguments.append((argument, value))
+
+        key = (name, *arguments)
+        hash(key)
+        return key
+
+    if inspect.iscoroutinefunction(method):
+
+        @functools.wraps(method)
+        async def async_wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+            """Asynchronous wrapper around the cached method."""
+            if not self.cache.enabled:
+                return await method(self, *args, **kwargs)
+
+            try:
+                key = _key(args, kwargs)
+            except TypeError:
+                return await method(self, *args, **kwargs)
+
+            value = self.cache.get(key)
+            if value is MISSING:
+                with read_from_writer():
+                    value = await method(self, *args, **kwargs)
+                self.cache.set(key, value)
+                work = current_unit_of_work()
+                if work is not None:
+                    work.cached(self.cache, key, value)
+
+            return value
+
+        return async_wrapper
+
+    @functools.wraps(method)
+    def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+        """Synchronous wrapper around the cached method."""
+        if not self.cache.enabled:
+            return method(self, *args, **kwargs)
+
+        try:
+            key = _key(args, kwargs)
+        except TypeError:
+            return method(self, *args, **kwargs)
+
+        value = self.cache.get(key)
+        if value is MISSING:
+            with read_from_writer():
+                value = method(self, *args, **kwargs)
+            self.cache.set(key, value)
+
+        return value
+
+    return wrapper
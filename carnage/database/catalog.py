@@ -0,0 +1,212 @@
+# MIT License
+#
+# Copyright (c) 2022, Rodolfo Olivieri
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Module that implements the in-memory catalog of the reference tables.
+
+Reference tables, like sizes or spell schools, are small and rarely change.
+Their rows are loaded once into immutable snapshots, indexed by identifier
+and name, and served from memory afterwards. A snapshot is never changed in
+place: a refresh builds a new one and swaps it in, so readers always see a
+consistent table.
+
+Loads can race, so every snapshot carries the version taken before its rows
+were read, and the catalog never replaces a snapshot with an older one, nor
+keeps one read before the table was discarded.
+"""
+
+import threading
+from bisect import bisect_right
+from collections.abc import Iterable
+from datetime import datetime
+from types import MappingProxyType
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import Row
+
+
+def _position(row: Row) -> tuple[datetime, UUID]:
+    """Return the `(created_at, id)` position of a row, used to sort it."""
+    return row.created_at, row.id
+
+
+class CatalogTable:
+    """Immutable snapshot of the rows of a reference table."""
+
+    __slots__ = ("name", "version", "rows", "by_id", "by_name", "_positions")
+
+    def __init__(self, name: str, rows: Iterable[Row], version: int) -> None:
+        """Default constructor for the catalog table.
+
+        :param name: The name of the table.
+        :param rows: The non deleted rows of the table.
+        :param version: The version of the catalog this snapshot belongs to.
+        """
+        self.name = name
+        self.version = version
+        self.rows: tuple[Row, ...] = tuple(sorted(rows, key=_position))
+        self.by_id = MappingProxyType({row.id: row for row in self.rows})
+        self.by_name = MappingProxyType(
+            {row.name: row for row in self.rows if "name" in row._fields},
+        )
+        self._positions = [_position(row) for row in self.rows]
+
+    def __len__(self) -> int:
+        """Return the number of rows in the table."""
+        return len(self.rows)
+
+    def page(
+        self,
+        limit: int | None = None,
+        after: tuple[datetime, UUID] | None = None,
+    ) -> list[Row]:
+        """Return the rows in `(created_at, id)` order, like the repository.
+
+        :param limit: Maximum number of rows to return.
+        :param after: The `(created_at, id)` position to start after.
+        """
+        start = bisect_right(self._positions, after) if after else 0
+        end = None if limit is None else start + limit
+        return list(self.rows[start:end])
+
+    def get(self, identifier: str | UUID) -> Row | None:
+        """Return the row with an identifier, if any.
+
+        :param identifier: The unique identifier of the row.
+        """
+        try:
+            return self.by_id.get(UUID(str(identifier)))
+        except ValueError:
+            return None
+
+    def find(self, **values: Any) -> Row | None:
+        """Return the first row matching all the values, if any.
+
+        :param values: The values to match, keyed by column name.
+        :raises KeyError: If one of the columns does not exist.
+        """
+        if values.keys() == {"id"}:
+            return self.get(values["id"])
+
+        if values.keys() == {"name"}:
+            return self.by_name.get(values["name"])
+
+        for row in self.rows:
+            if all(
+                row._mapping[name] == value for name, value in values.items()
+            ):
+                return row
+
+        return None
+
+
+class Catalog:
+    """Class that holds the snapshots of every reference table loaded."""
+
+    def __init__(self) -> None:
+        """Default constructor for the catalog."""
+        self.version = 0
+        self._floors: dict[str, int] = {}
+        self._floor = 0
+        self._tables: MappingProxyType[str, CatalogTable] = MappingProxyType(
+            {},
+        )
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> CatalogTable | None:
+        """Return the snapshot of a table, or `None` if it is not loaded.
+
+        :param name: The name of the table.
+        """
+        return self._tables.get(name)
+
+    def next_version(self) -> int:
+        """Take the version of a snapshot, before reading its rows."""
+        with self._lock:
+            self.version += 1
+            return self.version
+
+    def store(
+        self,
+        name: str,
+        rows: Iterable[Row],
+        version: int | None = None,
+    ) -> CatalogTable:
+        """Replace the snapshot of a table with new rows.
+
+        The snapshot is not kept if the catalog already holds a newer one,
+        or if the table was discarded after the version was taken.
+
+        :param name: The name of the table.
+        :param rows: The non deleted rows of the table.
+        :param version: The version taken by :meth:`next_version` before
+            reading the rows, or `None` to take a new one.
+        :return: The snapshot held by the catalog, or the new one if it
+            was read too early to be kept.
+        """
+        rows = tuple(rows)
+        with self._lock:
+            if version is None:
+                self.version += 1
+                version = self.version
+
+            current = self._tables.get(name)
+            if current is not None and current.version > version:
+                return current
+
+            table = CatalogTable(name, rows, version)
+            if version >= max(self._floors.get(name, 0), self._floor):
+                self._tables = MappingProxyType({**self._tables, name: table})
+
+        return table
+
+    def discard(self, name: str) -> None:
+        """Forget the snapshot of a table, it is loaded again when needed.
+
+        :param name: The name of the table.
+        """
+        with self._lock:
+            self._floors[name] = self.version + 1
+            tables = dict(self._tables)
+            tables.pop(name, None)
+            self._tables = MappingProxyType(tables)
+
+    def clear(self) -> None:
+        """Forget every snapshot, they are loaded again when needed."""
+        with self._lock:
+            self._floor = self.version + 1
+            self._floors.clear()
+            self._tables = MappingProxyType({})
+
+    def statistics(self) -> dict[str, Any]:
+        """Report the version of the catalog and of each of its tables."""
+        tables = self._tables
+        return {
+            "version": self.version,
+            "tables": {
+                name: {"rows": len(table), "version": table.version}
+                for name, table in tables.items()
+            },
+        }
+
+
+#: Global catalog shared by every reference repository.
+catalog = Catalog()
@@ -0,0 +1,296 @@
+# MIT License
+#
+# Copyright (c) 2022, Rodolfo Olivieri
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Module that records how long every SQL statement takes.
+
+Listeners attached to the engines time each statement sent to the database
+and aggregate the results per normalized statement and per repository method
+that issued it. Statements slower than ``DATABASE_SLOW_QUERY_THRESHOLD``
+milliseconds are logged and kept in a short slow-query log, optionally with
+the plan reported by ``EXPLAIN (ANALYZE, BUFFERS)``.
+"""
+
+import logging
+import re
+import sys
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from typing import Any
+
+from sqlalchemy import Engine, event
+from sqlalchemy.engine import Connection, ExecutionContext
+
+from carnage.constants import (
+    DATABASE_SLOW_QUERY_EXPLAIN,
+    DATABASE_SLOW_QUERY_THRESHOLD,
+)
+
+logger = logging.getLogger(__name__)
+
+#: Upper bounds, in seconds, of the latency histogram buckets. A last bucket
+#: counts everything slower than the last bound.
+BUCKETS: tuple[float, ...] = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+#: Maximum number of distinct statements tracked. Statements seen after the
+#: limit is reached are aggregated under :data:`OTHER`.
+MAX_STATEMENTS: int = 1000
+
+#: Maximum number of entries kept in the slow-query log.
+MAX_SLOW_QUERIES: int = 100
+
+#: Key used for statements that do not fit in the statistics anymore.
+OTHER: str = "<other>"
+
+#: Execution option holding the repository method that issued a statement.
+CALLER_OPTION: str = "carnage_caller"
+
+_WHITESPACE = re.compile(r"\s+")
+_MULTI_VALUES = re.compile(
+    r"(VALUES \((?:[^()]|\(\w+\))*\))(?:, \((?:[^()]|\(\w+\))*\))+",
+)
+_MULTI_VALUES_PARAMETER = re.compile(r"(?:__|_m)\d+\)s")
+
+
+class QueryStatistics:
+    """Counters of a single statement issued by a single caller."""
+
+    __slots__ = ("count", "total_time", "max_time", "rows", "histogram")
+
+    def __init__(self) -> None:
+        """Default constructor for the query statistics."""
+        self.count = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.rows = 0
+        self.histogram = [0] * (len(BUCKETS) + 1)
+
+    def record(self, elapsed: float, rows: int) -> None:
+        """Account for one execution of the statement.
+
+        :param elapsed: Time taken by the execution, in seconds.
+        :param rows: Number of rows returned or affected.
+        """
+        self.count += 1
+        self.total_time += elapsed
+        self.max_time = max(self.max_time, elapsed)
+        self.rows += rows
+        self.histogram[bisect_left(BUCKETS, elapsed)] += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics as a serializable dictionary."""
+        return {
+            "count": self.count,
+            "total_time": self.total_time,
+            "average_time": self.total_time / self.count,
+            "max_time": self.max_time,
+            "rows": self.rows,
+            "histogram": dict(
+                zip(
+                    [*(str(bound) for bound in BUCKETS), "+Inf"],
+                    self.histogram,
+                ),
+            ),
+        }
+
+
+_lock = threading.Lock()
+_statistics: dict[tuple[str, str], QueryStatistics] = {}
+_slow_queries: deque[dict[str, Any]] = deque(maxlen=MAX_SLOW_QUERIES)
+_explained: set[str] = set()
+
+
+def normalize(statement: str) -> str:
+    """Normalize a statement so executions of it are grouped together.
+
+    Whitespace is collapsed and multi-row `VALUES` lists are folded into
+    their first row, so inserting 10 or 100 rows counts as the same
+    statement.
+
+    :param statement: The SQL sent to the database.
+    """
+    statement = _WHITESPACE.sub(" ", statement).strip()
+    statement = _MULTI_VALUES.sub(r"\1, ...", statement)
+    return _MULTI_VALUES_PARAMETER.sub(")s", statement)
+
+
+def caller_options(owner: object, depth: int = 1) -> dict[str, str]:
+    """Build the execution options naming the method running a statement.
+
+    The options are meant to be given to `execute`, rather than attached to
+    the statement, so prebuilt statements are not copied on every call.
+
+    :param owner: The object, usually a repository, issuing the statement.
+    :param depth: How many frames above the caller of this function the
+        method to report is.
+    """
+    name = sys._getframe(depth + 1).f_code.co_name
+    return {CALLER_OPTION: f"{type(owner).__name__}.{name}"}
+
+
+def _explain(
+    connection: Connection,
+    statement: str,
+    parameters: Any,
+) -> list[str] | None:
+    """Run `EXPLAIN (ANALYZE, BUFFERS)` on a statement.
+
+    A fresh cursor is used, so the results of the statement being explained
+    are left untouched.
+
+    :param connection: The connection the statement ran on.
+    :param statement: The SQL of the statement.
+    :param parameters: The parameters the statement ran with.
+    :return: The lines of the plan, or `None` if it could not be obtained.
+    """
+    try:
+        cursor = connection.connection.cursor()
+        try:
+            cursor.execute(
+                f"EXPLAIN (ANALYZE, BUFFERS) {statement}",
+                parameters,
+            )
+            return [row[0] for row in cursor.fetchall()]
+        finally:
+            cursor.close()
+    except Exception:  # noqa: B902
+        logger.debug("Could not explain statement", exc_info=True)
+        return None
+
+
+def _before_cursor_execute(
+    connection: Connection,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: ExecutionContext,
+    executemany: bool,
+) -> None:
+    """Store the time a statement started at in the connection info."""
+    connection.info.setdefault("query_start_time", []).append(
+        time.perf_counter(),
+    )
+
+
+def _after_cursor_execute(
+    connection: Connection,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: ExecutionContext,
+    executemany: bool,
+) -> None:
+    """Record the time taken by a statement and log it if it was slow."""
+    elapsed = time.perf_counter() - connection.info["query_start_time"].pop()
+    caller = context.execution_options.get(CALLER_OPTION, "unknown")
+    rows = max(cursor.rowcount, 0)
+    key = normalize(statement)
+
+    with _lock:
+        if (caller, key) not in _statistics and (
+            len(_statistics) >= MAX_STATEMENTS
+        ):
+            key = OTHER
+        _statistics.setdefault((caller, key), QueryStatistics()).record(
+            elapsed,
+            rows,
+        )
+
+    threshold = DATABASE_SLOW_QUERY_THRESHOLD / 1000
+    if not threshold or elapsed < threshold:
+        return
+
+    logger.warning(
+        "Slow query from %s took %.1f ms: %s",
+        caller,
+        elapsed * 1000,
+        key,
+    )
+
+    plan = None
+    if (
+        DATABASE_SLOW_QUERY_EXPLAIN
+        and not executemany
+        and key.upper().startswith("SELECT")
+    ):
+        with _lock:
+            explain = key not in _explained
+            _explained.add(key)
+
+        if explain:
+            plan = _explain(connection, statement, parameters)
+
+    with _lock:
+        _slow_queries.append(
+            {
+                "caller": caller,
+                "statement": key,
+                "time": elapsed,
+                "rows": rows,
+                "timestamp": time.time(),
+                "plan": plan,
+            },
+        )
+
+
+def instrument(engine: Engine) -> None:
+    """Attach the listeners timing every statement to an engine.
+
+    :param engine: The (synchronous) engine to instrument. Asynchronous
+        engines are instrumented through their `sync_engine`.
+    """
+    if not event.contains(
+        engine,
+        "before_cursor_execute",
+        _before_cursor_execute,
+    ):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def query_statistics() -> list[dict[str, Any]]:
+    """Collect the statistics of every statement, slowest in total first."""
+    with _lock:
+        statistics = [
+            {"caller": caller, "statement": statement, **value.as_dict()}
+            for (caller, statement), value in _statistics.items()
+        ]
+
+    return sorted(
+        statistics,
+        key=lambda statistic: statistic["total_time"],
+        reverse=True,
+    )
+
+
+def slow_queries() -> list[dict[str, Any]]:
+    """Return the slow-query log, most recent first."""
+    with _lock:
+        return list(reversed(_slow_queries))
+
+
+def reset() -> None:
+    """Forget every statistic and slow query recorded so far."""
+    with _lock:
+        _statistics.clear()
+        _slow_queries.clear()
+        _explained.clear()
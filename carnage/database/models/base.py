@@ -21,21 +21,84 @@
 # SOFTWARE.
 """Module that represents the Base Model."""
 
+import os
+import threading
+import time
 import uuid
-from datetime import datetime
+from collections.abc import Callable
+from typing import ClassVar
 
-from sqlalchemy import Column, DateTime
+from sqlalchemy import Column, DateTime, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import Mapped, declared_attr
+
+_uuid7_lock = threading.Lock()
+_uuid7_last = 0
+
+
+def uuid7() -> uuid.UUID:
+    """Generate a time ordered UUID, version 7 of RFC 9562.
+
+    The first 48 bits hold the Unix timestamp in milliseconds and the next
+    12 bits a fraction of the millisecond, the rest is random. Identifiers
+    generated by the same process are strictly increasing, even within the
+    same fraction of a millisecond.
+    """
+    global _uuid7_last
+
+    nanoseconds = time.time_ns()
+    value = (nanoseconds // 1_000_000) << 12
+    value |= (nanoseconds % 1_000_000) * 4096 // 1_000_000
+    with _uuid7_lock:
+        value = max(value, _uuid7_last + 1)
+        _uuid7_last = value
+
+    random = int.from_bytes(os.urandom(8)) & (1 << 62) - 1
+    return uuid.UUID(
+        int=(value >> 12) << 80
+        | 0x7 << 76
+        | (value & 0xFFF) << 64
+        | 0b10 << 62
+        | random,
+    )
 
 
 class BaseMixin:
     """A mixin class that gathers the default columns for any models."""
 
     __name__ = "BaseMixin"
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    created_at = Column(DateTime, default=datetime.now(), nullable=False)
-    updated_at = Column(DateTime, default=datetime.now(), nullable=False)
+
+    #: Function generating the identifier of new rows. Tables that grow
+    #: quickly use :func:`uuid7`, so new rows land at the right edge of the
+    #: primary key index instead of at random places.
+    id_generator: ClassVar[Callable[[], uuid.UUID]] = staticmethod(uuid.uuid4)
+
+    @declared_attr
+    def id(cls) -> Mapped[uuid.UUID]:
+        """Primary key of the model, generated by :attr:`id_generator`."""
+        return Column(
+            UUID(as_uuid=True),
+            primary_key=True,
+            default=cls.id_generator,
+        )
+
+    created_at = Column(
+        DateTime,
+        default=func.now(),
+        server_default=func.now(),
+        nullable=False,
+    )
+    #: Bumped by every update, so clients can ask for the rows changed
+    #: since a given moment.
+    updated_at = Column(
+        DateTime,
+        default=func.now(),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+        index=True,
+    )
     deleted_at = Column(DateTime, default=None, nullable=True)
 
 
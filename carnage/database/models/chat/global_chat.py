@@ -26,7 +26,7 @@
 from sqlalchemy import Column, ForeignKey, String
 from sqlalchemy.dialects.postgresql import UUID
 
-from carnage.database.models.base import BaseModel
+from carnage.database.models.base import BaseModel, uuid7
 
 
 class ChannelEnum(enum.Enum):
@@ -39,6 +39,7 @@ class GlobalChatModel(BaseModel):
     """A model-class that represents an Global Chat."""
 
     __tablename__ = "global_chats"
+    id_generator = staticmethod(uuid7)
 
     message = Column(String(100))
 
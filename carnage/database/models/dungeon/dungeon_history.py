@@ -24,13 +24,14 @@
 from sqlalchemy import Boolean, Column, ForeignKey, Integer
 from sqlalchemy.dialects.postgresql import UUID
 
-from carnage.database.models.base import BaseModel
+from carnage.database.models.base import BaseModel, uuid7
 
 
 class DungeonHistoryModel(BaseModel):
     """A model-class that represents an Dungeon History."""
 
     __tablename__ = "dungeon_histories"
+    id_generator = staticmethod(uuid7)
 
     last_level = Column(Integer())
     last_room = Column(Integer())
@@ -24,13 +24,14 @@
 from sqlalchemy import Boolean, Column, ForeignKey, String
 from sqlalchemy.dialects.postgresql import UUID
 
-from carnage.database.models.base import BaseModel
+from carnage.database.models.base import BaseModel, uuid7
 
 
 class PlayerModel(BaseModel):
     """A model-class that represents an Player."""
 
     __tablename__ = "players"
+    id_generator = staticmethod(uuid7)
 
     name = Column(String(100))
     description = Column(String())
@@ -0,0 +1,374 @@
+# MIT License
+#
+# Copyright (c) 2022, Rodolfo Olivieri
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Module that manages the partitions of the time partitioned tables.
+
+``global_chats`` and ``dungeon_histories`` are partitioned by range of
+``created_at``, one partition per month or per week. The partitions ahead of
+time are created here, and old partitions are detached (and dropped) as a
+whole instead of deleting their rows one by one.
+
+The maintenance has to run regularly, like once a day from cron with the
+`partition` command. Rows created past the last partition land in the
+``DEFAULT`` partition instead of being refused, and are moved to their own
+partition once it is created.
+"""
+
+import logging
+import re
+from datetime import datetime, timedelta
+from typing import NamedTuple
+
+from sqlalchemy import Connection, Engine, text
+
+from carnage.constants import (
+    DATABASE_PARTITION_DROP,
+    DATABASE_PARTITION_INTERVAL,
+    DATABASE_PARTITION_PREMAKE,
+    DATABASE_PARTITION_RETENTION,
+)
+from carnage.database.bus import notify_statement
+from carnage.database.cache import evict
+from carnage.database.session import session
+
+logger = logging.getLogger(__name__)
+
+#: Tables partitioned by range of `created_at`.
+PARTITIONED_TABLES: tuple[str, ...] = ("global_chats", "dungeon_histories")
+
+#: Length of the partitions that can be created.
+INTERVALS: tuple[str, ...] = ("month", "week")
+
+_BOUNDS = re.compile(r"FROM \('([^']+)'\) TO \('([^']+)'\)")
+
+_PARTITIONS_QUERY = text(
+    "SELECT child.relname, pg_get_expr(child.relpartbound, child.oid) "
+    "FROM pg_inherits "
+    "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+    "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+    "WHERE parent.relname = :table",
+)
+
+
+class Partition(NamedTuple):
+    """A partition holding the rows created in `[start, end)`."""
+
+    name: str
+    start: datetime
+    end: datetime
+
+
+def period_start(moment: datetime, interval: str) -> datetime:
+    """Return the start of the period a moment belongs to.
+
+    Months start on their first day and weeks on monday, both at midnight.
+
+    :param moment: The moment to look for.
+    :param interval: The length of the periods, see :data:`INTERVALS`.
+    """
+    start = moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    if interval == "week":
+        return start - timedelta(days=start.weekday())
+
+    return start.replace(day=1)
+
+
+def shift(start: datetime, interval: str, periods: int) -> datetime:
+    """Move the start of a period by a number of periods.
+
+    :param start: The start of a period.
+    :param interval: The length of the periods, see :data:`INTERVALS`.
+    :param periods: Number of periods to move, negative to move back.
+    """
+    if interval == "week":
+        return start + timedelta(weeks=periods)
+
+    year, month = divmod(start.month - 1 + periods, 12)
+    return start.replace(year=start.year + year, month=month + 1)
+
+
+def _bounds(start: datetime, end: datetime) -> str:
+    """Build the SQL bounds of the partition holding `[start, end)`.
+
+    :param start: The lower bound of the partition.
+    :param end: The upper bound of the partition.
+    """
+    return (
+        f"FOR VALUES FROM ('{start.isoformat(' ')}') "
+        f"TO ('{end.isoformat(' ')}')"
+    )
+
+
+class PartitionManager:
+    """Class that creates and retires the partitions of a table."""
+
+    def __init__(
+        self,
+        table: str,
+        interval: str = DATABASE_PARTITION_INTERVAL,
+        premake: int = DATABASE_PARTITION_PREMAKE,
+        retention: int = DATABASE_PARTITION_RETENTION,
+        drop: bool = DATABASE_PARTITION_DROP,
+    ) -> None:
+        """Default constructor for the partition manager.
+
+        :param table: The name of the partitioned table.
+        :param interval: The length of each partition, see :data:`INTERVALS`.
+        :param premake: Number of partitions created ahead of the current
+            one.
+        :param retention: Number of partitions kept before the current one.
+            Use 0 to keep all of them.
+        :param drop: Drop the partitions that are detached, otherwise they
+            are kept as plain tables.
+        :raises ValueError: If the interval is not known.
+        """
+        if interval not in INTERVALS:
+            raise ValueError(
+                f"Unknown partition interval '{interval}'. "
+                f"Use one of {INTERVALS}.",
+            )
+
+        self.table = table
+        self.interval = interval
+        self.premake = premake
+        self.retention = retention
+        self.drop = drop
+
+    def partition_name(self, start: datetime) -> str:
+        """Name the partition starting at a given moment.
+
+        :param start: The lower bound of the partition.
+        """
+        return f"{self.table}_p{start:%Y%m%d}"
+
+    def _children(self, connection: Connection) -> list[tuple[str, str]]:
+        """List the name and the bounds of every partition of the table.
+
+        :param connection: The connection to the primary database.
+        """
+        return list(
+            connection.execute(_PARTITIONS_QUERY, {"table": self.table}),
+        )
+
+    def default_partition(self, connection: Connection) -> str | None:
+        """Return the name of the `DEFAULT` partition of the table, if any.
+
+        :param connection: The connection to the primary database.
+        """
+        for name, bound in self._children(connection):
+            if bound == "DEFAULT":
+                return name
+
+        return None
+
+    def partitions(self, connection: Connection) -> list[Partition]:
+        """List the range partitions of the table, oldest first.
+
+        :param connection: The connection to the primary database.
+        """
+        partitions = []
+        for name, bound in self._children(connection):
+            match = _BOUNDS.search(bound)
+            if match:
+                start, end = map(datetime.fromisoformat, match.groups())
+                partitions.append(Partition(name, start, end))
+
+        return sorted(partitions, key=lambda partition: partition.start)
+
+    def create_partitions(
+        self,
+        connection: Connection,
+        now: datetime,
+    ) -> list[str]:
+        """Create the missing partitions up to `premake` periods ahead.
+
+        New partitions start where the latest one ends, so changing the
+        interval never leaves a gap or an overlap between partitions. When
+        the table has a `DEFAULT` partition, the rows it holds for the
+        period of a new partition are moved to it before it is attached, as
+        Postgres refuses to create a partition overlapping those rows.
+
+        :param connection: The connection to the primary database.
+        :param now: The current moment.
+        :return: The name of the partitions created.
+        """
+        current = period_start(now, self.interval)
+        horizon = shift(current, self.interval, self.premake + 1)
+        partitions = self.partitions(connection)
+        start = partitions[-1].end if partitions else current
+        default = self.default_partition(connection)
+
+        preparer = connection.dialect.identifier_preparer
+        created = []
+        while start < horizon:
+            end = shift(period_start(start, self.interval), self.interval, 1)
+            name = self.partition_name(start)
+            if default is None:
+                connection.execute(
+                    text(
+                        f"CREATE TABLE {preparer.quote(name)} "
+                        f"PARTITION OF {preparer.quote(self.table)} "
+                        f"{_bounds(start, end)}",
+                    ),
+                )
+            else:
+                self._attach_partition(connection, name, default, start, end)
+
+            logger.info("Created partition '%s'", name)
+            created.append(name)
+            start = end
+
+        return created
+
+    def _attach_partition(
+        self,
+        connection: Connection,
+        name: str,
+        default: str,
+        start: datetime,
+        end: datetime,
+    ) -> None:
+        """Create a partition out of the rows of the `DEFAULT` partition.
+
+        :param connection: The connection to the primary database.
+        :param name: The name of the new partition.
+        :param default: The name of the `DEFAULT` partition.
+        :param start: The lower bound of the new partition.
+        :param end: The upper bound of the new partition.
+        """
+        preparer = connection.dialect.identifier_preparer
+        table = preparer.quote(self.table)
+        partition = preparer.quote(name)
+        connection.execute(
+            text(
+                f"CREATE TABLE {partition} "
+                f"(LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)",
+            ),
+        )
+        connection.execute(
+            text(
+                f"WITH moved AS (DELETE FROM {preparer.quote(default)} "
+                f"WHERE created_at >= '{start.isoformat(' ')}' "
+                f"AND created_at < '{end.isoformat(' ')}' RETURNING *) "
+                f"INSERT INTO {partition} SELECT * FROM moved",
+            ),
+        )
+        connection.execute(
+            text(
+                f"ALTER TABLE {table} ATTACH PARTITION {partition} "
+                f"{_bounds(start, end)}",
+            ),
+        )
+
+    def retire_partitions(
+        self,
+        connection: Connection,
+        now: datetime,
+    ) -> list[str]:
+        """Detach, and drop, the partitions older than the retention.
+
+        Their rows are gone from the table, so the other workers are told to
+        forget what they cached of it once the transaction is committed, see
+        :mod:`carnage.database.bus`.
+
+        :param connection: The connection to the primary database.
+        :param now: The current moment.
+        :return: The name of the partitions retired.
+        """
+        if self.retention <= 0:
+            return []
+
+        cutoff = shift(
+            period_start(now, self.interval),
+            self.interval,
+            -self.retention,
+        )
+        preparer = connection.dialect.identifier_preparer
+        retired = []
+        for partition in self.partitions(connection):
+            if partition.end > cutoff:
+                break
+
+            name = preparer.quote(partition.name)
+            connection.execute(
+                text(
+                    f"ALTER TABLE {preparer.quote(self.table)} "
+                    f"DETACH PARTITION {name}",
+                ),
+            )
+            if self.drop:
+                connection.execute(text(f"DROP TABLE {name}"))
+
+            logger.info("Retired partition '%s'", partition.name)
+            retired.append(partition.name)
+
+        if retired:
+            statement = notify_statement(connection.engine, self.table, None)
+            if statement is not None:
+                connection.execute(statement)
+
+        return retired
+
+    def maintain(
+        self,
+        connection: Connection,
+        now: datetime | None = None,
+    ) -> dict[str, list[str]]:
+        """Create the upcoming partitions and retire the expired ones.
+
+        :param connection: The connection to the primary database.
+        :param now: The current moment, defaults to now.
+        :return: The name of the partitions created and retired.
+        """
+        now = now or datetime.now()
+        return {
+            "created": self.create_partitions(connection, now),
+            "retired": self.retire_partitions(connection, now),
+        }
+
+
+def maintain_partitions(
+    engine: Engine | None = None,
+    now: datetime | None = None,
+) -> dict[str, dict[str, list[str]]]:
+    """Maintain the partitions of every partitioned table.
+
+    Everything runs in a single transaction on the primary database. It is
+    meant to be run regularly, see the `partition` command. Once committed,
+    the caches of the tables whose partitions were retired are evicted.
+
+    :param engine: The engine of the primary database, defaults to the one
+        of the global session.
+    :param now: The current moment, defaults to now.
+    :return: The partitions created and retired, keyed by table.
+    """
+    engine = engine or session.kw["router"].writer
+    with engine.begin() as connection:
+        changes = {
+            table: PartitionManager(table).maintain(connection, now)
+            for table in PARTITIONED_TABLES
+        }
+
+    for table, table_changes in changes.items():
+        if table_changes["retired"]:
+            evict(table)
+
+    return changes
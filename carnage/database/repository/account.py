@@ -20,10 +20,9 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 """Module that represents the Account repository."""
-from functools import lru_cache
-
-from sqlalchemy import select
+from sqlalchemy import StatementLambdaElement
 
+from carnage.database.cache import cached
 from carnage.database.models.account import AccountModel
 from carnage.database.repository.base import BaseRepository
 
@@ -31,6 +30,8 @@
 class AccountRepository(BaseRepository):
     """Class that overrides the base repository methods."""
 
+    conflict_target = ("username",)
+
     def __init__(
         self,
         model: type[AccountModel] = AccountModel,
@@ -41,30 +42,58 @@ def __init__(
         """
         super().__init__(model)
 
-    @lru_cache
+    def _select_by_username_statement(
+        self,
+        username: str,
+    ) -> StatementLambdaElement:
+        """Build the statement used to select an account by username.
+
+        :param username: Username to be used in the filter.
+        """
+        return self._select_by_statement(username=username)
+
+    def _select_by_nickname_statement(
+        self,
+        nickname: str,
+    ) -> StatementLambdaElement:
+        """Build the statement used to select an account by nickname.
+
+        :param nickname: Nickname to be used in the filter.
+        """
+        return self._select_by_statement(nickname=nickname)
+
+    @cached
     def select_by_username(self, username: str) -> AccountModel:
         """Get results from database filtering by username.
 
         :param username: Username to be used in the filter.
         """
-        statement = select(self.model).where(
-            self.model.username == username
-            and self.deleted_at == None,  # type: ignore # noqa
-        )
-
-        with self.session() as session:
-            return session.execute(statement=statement).first()
+        return self._first(self._select_by_username_statement(username))
 
-    @lru_cache
+    @cached
     def select_by_nickname(self, nickname: str) -> AccountModel:
         """Get results from database filtering by nickname.
 
         :param nickanem: Nickname to be used in the filter.
         """
-        statement = select(self.model).where(
-            self.model.nickname == nickname
-            and self.deleted_at == None,  # type: ignore # noqa
+        return self._first(self._select_by_nickname_statement(nickname))
+
+    @cached
+    async def async_select_by_username(self, username: str) -> AccountModel:
+        """Asynchronous version of :meth:`select_by_username`.
+
+        :param username: Username to be used in the filter.
+        """
+        return await self._async_first(
+            self._select_by_username_statement(username),
         )
 
-        with self.session() as session:
-            return session.execute(statement=statement).first()
+    @cached
+    async def async_select_by_nickname(self, nickname: str) -> AccountModel:
+        """Asynchronous version of :meth:`select_by_nickname`.
+
+        :param nickname: Nickname to be used in the filter.
+        """
+        return await self._async_first(
+            self._select_by_nickname_statement(nickname),
+        )
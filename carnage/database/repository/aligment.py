@@ -23,10 +23,10 @@
 
 from carnage.database.models.aligment import AligmentModel
 from carnage.database.models.base import BaseModel
-from carnage.database.repository.base import BaseRepository
+from carnage.database.repository.reference import ReferenceRepository
 
 
-class AligmentRepository(BaseRepository):
+class AligmentRepository(ReferenceRepository):
     """Class that overrides the base repository methods."""
 
     def __init__(
@@ -21,18 +21,99 @@
 # SOFTWARE.
 """Module that represents the Base repository."""
 
+import functools
+import logging
+from collections.abc import (
+    AsyncIterator,
+    Callable,
+    Iterable,
+    Iterator,
+    Mapping,
+)
+from contextlib import AbstractAsyncContextManager
 from datetime import datetime
-from functools import lru_cache
 from typing import Any
+from uuid import UUID
 
-from sqlalchemy import insert, select, update
+from sqlalchemy import (
+    Column,
+    ColumnElement,
+    Delete,
+    Insert,
+    Row,
+    Select,
+    StatementLambdaElement,
+    Update,
+    Values,
+    and_,
+    any_,
+    bindparam,
+    column,
+    false,
+    func,
+    insert,
+    lambda_stmt,
+    or_,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from carnage.constants import (
+    DATABASE_COPY_BATCH_SIZE,
+    DATABASE_STREAM_BATCH_SIZE,
+)
+from carnage.database.bulk import Progress, async_copy_rows, batches, copy_rows
+from carnage.database.bus import notify_statement
+from carnage.database.cache import cached, get_cache
+from carnage.database.instrumentation import caller_options
 from carnage.database.models.base import BaseModel
-from carnage.database.session import session
+from carnage.database.session import async_session, session
+from carnage.database.unit_of_work import current_unit_of_work
+
+logger = logging.getLogger(__name__)
+
+
+def _equals(column: Column, value: Any) -> Callable[[Select], Select]:
+    """Build the lambda filtering a lambda statement on a column value.
+
+    Each lambda gets its own closure, the ones created in a loop would all
+    share the variables of the loop and bind its last value.
+
+    :param column: The column to filter on.
+    :param value: The value the column must be equal to.
+    """
+    return lambda statement: statement.where(column == value)
 
 
 class BaseRepository:
-    """Class that implements the base repository methods."""
+    """Class that implements the base repository methods.
+
+    Every method that talks to the database comes in two flavours: a
+    synchronous one, used by the CLI and the seeds, and an asynchronous twin
+    prefixed with ``async_``, meant to be awaited from the API routes so the
+    event loop is never blocked by database I/O. Both flavours share the same
+    statement builders.
+
+    Read methods are cached per model (see :mod:`carnage.database.cache`) and
+    every write evicts the rows it touched from the cache, in the current
+    worker and, through :mod:`carnage.database.bus`, in the other ones.
+
+    The asynchronous methods share the session of the current unit of work,
+    if any (see :mod:`carnage.database.unit_of_work`), and leave the commit
+    to it.
+    """
+
+    #: Columns too large to be sent in listings unless asked for.
+    large_columns: tuple[str, ...] = ()
+
+    #: Columns identifying a row for :meth:`upsert`. They must be covered by
+    #: an unique index restricted to the rows that are not deleted. Empty
+    #: for tables without such an index, which can't be upserted.
+    conflict_target: tuple[str, ...] = ()
 
     def __init__(self, model: BaseModel = BaseModel) -> None:
         """Default constructor for base repository.
@@ -40,83 +121,914 @@ def __init__(self, model: BaseModel = BaseModel) -> None:
         :param model: The model used in the repository.
         """
         self.session = session
+        self.async_session = async_session
         self.model = model
+        self.cache = get_cache(model)
 
-    def insert(self, values: list[dict[str, Any]] | dict[str, Any]) -> None:
-        """Default method to make insertions in the database.
+    @staticmethod
+    def _written(rows: list[Row]) -> list[UUID] | None:
+        """Return the identifiers of the rows sent back by a write.
 
-        :param values: List or dictionary of values to insert
+        :param rows: The rows sent back by the `RETURNING` clauses.
+        :return: The identifiers, or `None` if they are not known.
+        """
+        if not rows:
+            return None
+
+        try:
+            return [row.id for row in rows]
+        except AttributeError:
+            return None
+
+    def _notify(self, session: Any, identifiers: list[UUID] | None) -> None:
+        """Tell the other workers about a write, before it is committed.
+
+        :param session: The session the write is executed in.
+        :param identifiers: The identifiers of the rows written, or `None`
+            if they are not known.
         """
-        statement = insert(self.model).values(values)
+        statement = notify_statement(
+            session.get_bind(),
+            self.model.__tablename__,
+            identifiers,
+        )
+        if statement is not None:
+            session.execute(statement)
+
+    async def _async_notify(
+        self,
+        session: Any,
+        identifiers: list[UUID] | None,
+    ) -> None:
+        """Asynchronous version of :meth:`_notify`."""
+        statement = notify_statement(
+            session.get_bind(),
+            self.model.__tablename__,
+            identifiers,
+        )
+        if statement is not None:
+            await session.execute(statement)
 
+    def _async_scope(self) -> AbstractAsyncContextManager[AsyncSession]:
+        """Open the session used by an asynchronous method.
+
+        The session of the current unit of work is borrowed if there is one,
+        see :mod:`carnage.database.unit_of_work`.
+        """
+        work = current_unit_of_work()
+        if work is None:
+            return self.async_session()
+
+        return work.scope(self.async_session)
+
+    async def _async_commit(
+        self,
+        session: AsyncSession,
+        identifiers: list[UUID] | None,
+    ) -> None:
+        """Commit a write, or leave it to the current unit of work.
+
+        :param session: The session the write is executed in.
+        :param identifiers: The identifiers of the rows written, or `None`
+            if they are not known.
+        """
+        work = current_unit_of_work()
+        if work is None:
+            await session.commit()
+            await self._async_after_write(identifiers)
+        else:
+            work.after_commit(
+                functools.partial(self._async_after_write, identifiers),
+            )
+
+    def _after_write(self, identifiers: list[UUID] | None = None) -> None:
+        """Forget what is known of the rows after a write went through.
+
+        :param identifiers: The identifiers of the rows written, or `None`
+            to forget the whole table.
+        """
+        if identifiers is None:
+            self.cache.invalidate()
+        else:
+            self.cache.evict(identifiers)
+
+    async def _async_after_write(
+        self,
+        identifiers: list[UUID] | None = None,
+    ) -> None:
+        """Asynchronous version of :meth:`_after_write`."""
+        self._after_write(identifiers)
+
+    def _execute(self, statement: Insert | Update | Delete) -> list[Row]:
+        """Execute a statement that changes data and commit it.
+
+        :param statement: The statement to execute.
+        :return: The rows sent back by a `RETURNING` clause, if any.
+        """
         with self.session() as session:
-            session.execute(statement=statement)
+            result = session.execute(
+                statement=statement,
+                execution_options=caller_options(self),
+            )
+            rows = result.all() if result.returns_rows else []
+            identifiers = self._written(rows)
+            self._notify(session, identifiers)
             session.commit()
 
-    @lru_cache
-    def select(self) -> list[BaseModel]:
-        """Default method to retrieve information from the database."""
-        statement = select(self.model).where(
-            self.model.deleted_at == None,  # noqa
-        )
+        self._after_write(identifiers)
+        return rows
+
+    def _execute_all(
+        self,
+        statements: list[Insert | Update | Delete],
+    ) -> list[Row]:
+        """Execute statements that change data in a single transaction.
+
+        :param statements: The statements to execute, in order.
+        :return: The rows sent back by the `RETURNING` clauses, if any.
+        """
+        if not statements:
+            return []
 
+        rows = []
+        options = caller_options(self)
         with self.session() as session:
-            return session.execute(statement=statement).scalars().all()
+            for statement in statements:
+                result = session.execute(
+                    statement=statement,
+                    execution_options=options,
+                )
+                rows.extend(result.all() if result.returns_rows else [])
+            identifiers = self._written(rows)
+            self._notify(session, identifiers)
+            session.commit()
 
-    @lru_cache
-    def select_first(self) -> BaseModel:
-        """Default method to get first information from the database."""
-        statement = select(self.model).where(
-            self.model.deleted_at == None,  # noqa
-        )
+        self._after_write(identifiers)
+        return rows
+
+    def _all(
+        self,
+        statement: Select | StatementLambdaElement,
+    ) -> list[BaseModel]:
+        """Execute a statement and return all the entities found.
 
+        :param statement: The statement to execute.
+        """
         with self.session() as session:
-            return session.execute(statement=statement).first()
+            result = session.execute(
+                statement=statement,
+                execution_options=caller_options(self),
+            )
+            return result.scalars().all()
 
-    @lru_cache
-    def select_by_id(self, identifier: str) -> BaseModel:
-        """Default method to select by filtering using an identifier.
+    def _rows(self, statement: Select) -> list[Row]:
+        """Execute a statement and return all the rows found as tuples.
+
+        :param statement: The statement to execute.
+        """
+        with self.session() as session:
+            return session.execute(
+                statement=statement,
+                execution_options=caller_options(self),
+            ).all()
+
+    def _first(
+        self,
+        statement: Select | StatementLambdaElement,
+    ) -> BaseModel:
+        """Execute a statement and return the first row found.
+
+        :param statement: The statement to execute.
+        """
+        with self.session() as session:
+            return session.execute(
+                statement=statement,
+                execution_options=caller_options(self),
+            ).first()
+
+    async def _async_execute(
+        self, statement: Insert | Update | Delete
+    ) -> list[Row]:
+        """Asynchronously execute a statement that changes data and commit it.
+
+        :param statement: The statement to execute.
+        :return: The rows sent back by a `RETURNING` clause, if any.
+        """
+        async with self._async_scope() as session:
+            result = await session.execute(
+                statement=statement,
+                execution_options=caller_options(self),
+            )
+            rows = result.all() if result.returns_rows else []
+            identifiers = self._written(rows)
+            await self._async_notify(session, identifiers)
+            await self._async_commit(session, identifiers)
+
+        return rows
+
+    async def _async_execute_all(
+        self,
+        statements: list[Insert | Update | Delete],
+    ) -> list[Row]:
+        """Asynchronously execute statements in a single transaction.
+
+        :param statements: The statements to execute, in order.
+        :return: The rows sent back by the `RETURNING` clauses, if any.
+        """
+        if not statements:
+            return []
+
+        rows = []
+        options = caller_options(self)
+        async with self._async_scope() as session:
+            for statement in statements:
+                result = await session.execute(
+                    statement=statement,
+                    execution_options=options,
+                )
+                rows.extend(result.all() if result.returns_rows else [])
+            identifiers = self._written(rows)
+            await self._async_notify(session, identifiers)
+            await self._async_commit(session, identifiers)
+
+        return rows
+
+    async def _async_all(
+        self,
+        statement: Select | StatementLambdaElement,
+    ) -> list[BaseModel]:
+        """Asynchronously execute a statement and return all the entities.
+
+        :param statement: The statement to execute.
+        """
+        async with self._async_scope() as session:
+            result = await session.execute(
+                statement=statement,
+                execution_options=caller_options(self),
+            )
+            return result.scalars().all()
+
+    async def _async_rows(self, statement: Select) -> list[Row]:
+        """Asynchronously execute a statement and return the rows as tuples.
+
+        :param statement: The statement to execute.
+        """
+        async with self._async_scope() as session:
+            result = await session.execute(
+                statement=statement,
+                execution_options=caller_options(self),
+            )
+            return result.all()
+
+    async def _async_first(
+        self,
+        statement: Select | StatementLambdaElement,
+    ) -> BaseModel:
+        """Asynchronously execute a statement and return the first row.
+
+        :param statement: The statement to execute.
+        """
+        async with self._async_scope() as session:
+            result = await session.execute(
+                statement=statement,
+                execution_options=caller_options(self),
+            )
+            return result.first()
+
+    def _insert_statement(
+        self,
+        values: list[dict[str, Any]] | dict[str, Any],
+    ) -> Insert:
+        """Build the statement used to insert values.
+
+        :param values: List or dictionary of values to insert
+        """
+        return insert(self.model).values(values).returning(self.model.id)
+
+    def _upsert_statement(
+        self,
+        values: list[dict[str, Any]] | dict[str, Any],
+        conflict_target: tuple[str, ...] | None = None,
+        update_columns: tuple[str, ...] = (),
+    ) -> Insert:
+        """Build the `INSERT ... ON CONFLICT` statement used to upsert values.
+
+        :param values: List or dictionary of values to upsert.
+        :param conflict_target: Columns identifying a row, defaults to
+            :attr:`conflict_target`.
+        :param update_columns: Columns overwritten when the row exists. When
+            empty, existing rows are left untouched.
+        :raises ValueError: If there is no conflict target to use.
+        """
+        conflict_target = conflict_target or self.conflict_target
+        if not conflict_target:
+            table = self.model.__tablename__
+            raise ValueError(f"No conflict target to upsert into {table}")
+
+        statement = postgresql.insert(self.model).values(values)
+        conflict = {
+            "index_elements": conflict_target,
+            "index_where": self.model.deleted_at.is_(None),
+        }
+
+        if update_columns:
+            statement = statement.on_conflict_do_update(
+                set_={
+                    column: statement.excluded[column]
+                    for column in update_columns
+                },
+                **conflict,
+            )
+        else:
+            statement = statement.on_conflict_do_nothing(**conflict)
+
+        return statement.returning(*self.model.__table__.columns)
+
+    def _select_statement(
+        self,
+        limit: int | None = None,
+        after: tuple[Any, ...] | None = None,
+        columns: tuple[str, ...] | None = None,
+        updated_since: datetime | None = None,
+        filters: Mapping[str, Any] | None = None,
+        sort: tuple[str, ...] = (),
+    ) -> Select:
+        """Build the statement used to select every non deleted row.
+
+        Rows are ordered by `(created_at, id)`, which is covered by an index
+        on every table, so a page costs the same no matter how deep it is.
+
+        :param limit: Maximum number of rows to select.
+        :param after: The `(created_at, id)` position to start after, or the
+            values of the `sort` columns and `id` when sorting.
+        :param columns: Name of the columns to select. When not given, the
+            whole entity is selected.
+        :param updated_since: When given, only the rows updated after this
+            moment are selected, including the deleted ones, so the deletions
+            are seen as well.
+        :param filters: Values the rows must match, keyed by column name,
+            see :meth:`_filter_predicate`.
+        :param sort: Columns to order the rows by instead, each prefixed with
+            `-` for a descending order. The `id` always breaks the ties.
+        :raises KeyError: If one of the columns does not exist.
+        """
+        entities = (
+            [self.model]
+            if columns is None
+            else [self.model.__table__.columns[name] for name in columns]
+        )
+        statement = select(*entities).where(
+            self._listing_predicate(updated_since, filters),
+        )
+        if sort:
+            keys = self._sort_keys(sort)
+            statement = statement.order_by(
+                *(
+                    column.desc() if descending else column.asc()
+                    for column, descending in keys
+                ),
+            )
+            if after is not None:
+                statement = statement.where(
+                    self._keyset_predicate(keys, after)
+                )
+                (column, descending), value = keys[0], after[0]
+                if column.key == "created_at" and value is not None:
+                    # Same as below, a plain bound on the partition key lets
+                    # the planner skip the partitions past the position.
+                    statement = statement.where(
+                        column <= value if descending else column >= value,
+                    )
+        else:
+            statement = statement.order_by(
+                self.model.created_at,
+                self.model.id,
+            )
+            if after is not None:
+                # The bound on `created_at` alone is implied by the row
+                # comparison, but only a plain comparison on the partition
+                # key lets the planner skip the partitions of the older rows.
+                statement = statement.where(
+                    tuple_(self.model.created_at, self.model.id)
+                    > tuple_(*after),
+                    self.model.created_at >= after[0],
+                )
+
+        if limit is not None:
+            statement = statement.limit(limit)
+
+        return statement
+
+    def _listing_predicate(
+        self,
+        updated_since: datetime | None = None,
+        filters: Mapping[str, Any] | None = None,
+    ) -> ColumnElement[bool]:
+        """Build the predicate matching the rows of a listing.
+
+        :param updated_since: When given, only the rows updated after this
+            moment are matched, including the deleted ones.
+        :param filters: Values the rows must match, keyed by column name,
+            see :meth:`_filter_predicate`.
+        :raises KeyError: If one of the columns does not exist.
+        """
+        predicate = (
+            self.where()
+            if updated_since is None
+            else self.model.updated_at > updated_since
+        )
+        if filters:
+            predicate = and_(predicate, self._filter_predicate(filters))
+
+        return predicate
+
+    def _filter_predicate(
+        self,
+        filters: Mapping[str, Any],
+    ) -> ColumnElement[bool]:
+        """Build the predicate matching the rows with the values given.
+
+        A list of values matches any of them, and `None` matches `NULL`.
+
+        :param filters: The values to match, keyed by column name.
+        :raises KeyError: If one of the columns does not exist.
+        """
+        columns = self.model.__table__.columns
+        predicates = []
+        for name, value in filters.items():
+            if isinstance(value, (list, tuple, set)):
+                predicates.append(columns[name].in_(value))
+            elif value is None:
+                predicates.append(columns[name].is_(None))
+            else:
+                predicates.append(columns[name] == value)
+
+        return and_(*predicates)
+
+    def _sort_keys(self, sort: tuple[str, ...]) -> list[tuple[Column, bool]]:
+        """Return the columns to order by, with `id` to break the ties.
+
+        :param sort: Name of the columns, each prefixed with `-` for a
+            descending order.
+        :raises KeyError: If one of the columns does not exist.
+        :return: The columns, each with whether it is descending.
+        """
+        columns = self.model.__table__.columns
+        keys = [
+            (columns[name.removeprefix("-")], name.startswith("-"))
+            for name in sort
+        ]
+        return [*keys, (self.model.id, False)]
+
+    @staticmethod
+    def _keyset_predicate(
+        keys: list[tuple[Column, bool]],
+        after: tuple[Any, ...],
+    ) -> ColumnElement[bool]:
+        """Build the predicate matching the rows that sort after a position.
+
+        `NULL` is taken as larger than every other value, like Postgres does
+        by default, so it comes last when ascending and first when descending.
+
+        :param keys: The columns the rows are ordered by, see
+            :meth:`_sort_keys`.
+        :param after: The values of the position, one for each key.
+        :raises ValueError: If there is not a value for each key.
+        """
+        if len(after) != len(keys):
+            raise ValueError("The position does not match the order.")
+
+        def equal(column: Column, value: Any) -> ColumnElement[bool]:
+            """Match the rows tied with the position on a column."""
+            return column.is_(None) if value is None else column == value
+
+        def beyond(
+            column: Column,
+            descending: bool,
+            value: Any,
+        ) -> ColumnElement[bool]:
+            """Match the rows strictly after the position on a column."""
+            if value is None:
+                return column.is_not(None) if descending else false()
+            if descending:
+                return column < value
+            if column.nullable:
+                return or_(column > value, column.is_(None))
+            return column > value
+
+        return or_(
+            *(
+                and_(
+                    *(
+                        equal(column, value)
+                        for (column, _), value in zip(keys[:index], after)
+                    ),
+                    beyond(column, descending, after[index]),
+                )
+                for index, (column, descending) in enumerate(keys)
+            ),
+        )
+
+    def where(self, **values: Any) -> ColumnElement[bool]:
+        """Build a predicate matching the non deleted rows with given values.
+
+        Every value is compared for equality against the column of the same
+        name and all comparisons are combined with `AND`, along with
+        `deleted_at IS NULL`. The predicates of the lookups in the
+        repositories are backed by an index restricted to the rows that are
+        not deleted, so each lookup is a single index probe.
+
+        :param values: The values to match, keyed by column name.
+        :raises KeyError: If one of the columns does not exist.
+        """
+        columns = self.model.__table__.columns
+        return and_(
+            *(columns[name] == value for name, value in values.items()),
+            self.model.deleted_at.is_(None),
+        )
+
+    def _select_by_statement(self, **values: Any) -> StatementLambdaElement:
+        """Build the statement used to select the rows matching the values.
+
+        The statement is a lambda statement: it is built and compiled once
+        per model and set of columns, and later calls only extract the new
+        values from the closures, skipping the construction of the `select`
+        and the computation of its cache key. It holds the same predicate as
+        :meth:`where`.
+
+        :param values: The values to match, keyed by column name.
+        :raises KeyError: If one of the columns does not exist.
+        """
+        model = self.model
+        columns = model.__table__.columns
+        statement = lambda_stmt(lambda: select(model))
+        for name, value in values.items():
+            statement += _equals(columns[name], value)
+
+        return statement + (
+            lambda statement: statement.where(model.deleted_at.is_(None))
+        )
+
+    def _select_by_id_statement(
+        self,
+        identifier: str,
+    ) -> StatementLambdaElement:
+        """Build the statement used to select a row by its identifier.
 
         :param identifier: The unique identifier to query in the database.
         """
-        statement = select(self.model).where(
-            self.model.id == identifier
-            and self.model.deleted_at == None,  # noqa
+        return self._select_by_statement(id=identifier)
+
+    def _select_by_ids_statement(
+        self,
+        identifiers: Iterable[str | UUID],
+    ) -> Select:
+        """Build the statement used to select many rows by their identifiers.
+
+        The identifiers are sent as a single array parameter, so the
+        statement is the same no matter how many identifiers are given.
+
+        :param identifiers: The unique identifiers to query in the database.
+        """
+        return select(self.model).where(
+            self._has_identifier(identifiers),
+            self.where(),
         )
-        with self.session() as session:
-            return session.execute(statement=statement).first()
 
-    @lru_cache
-    def select_by_name(self, name: str) -> BaseModel:
-        """Default method to select rows by using a name.
+    def _has_identifier(
+        self,
+        identifiers: Iterable[str | UUID],
+    ) -> ColumnElement[bool]:
+        """Build a predicate matching the rows with any of the identifiers.
 
-        :param name: The name to use in the query in the database.
+        The identifiers are sent as a single array parameter.
+
+        :param identifiers: The unique identifiers to match.
         """
-        statement = select(self.model).where(
-            self.model.name == name and self.model.deleted_at == None,  # noqa
+        return self.model.id == any_(
+            bindparam(
+                "identifiers",
+                [UUID(str(identifier)) for identifier in identifiers],
+                type_=ARRAY(self.model.id.type),
+            ),
         )
 
-        with self.session() as session:
-            return session.execute(statement=statement).first()
+    def _select_by_name_statement(self, name: str) -> StatementLambdaElement:
+        """Build the statement used to select a row by its name.
 
-    def update(self, values: dict[str, Any], identifier: str) -> None:
-        """Default method to update values in the database.
+        :param name: The name to use in the query in the database.
+        """
+        return self._select_by_statement(name=name)
+
+    def _update_statement(
+        self,
+        values: dict[str, Any],
+        identifier: str,
+    ) -> Update:
+        """Build the statement used to update a row.
 
         :param values: Dictionary of values to update in the database.
         :param identifier: The unique identifier to query in the database.
         """
-        statement = (
+        return (
             update(self.model)
             .values(values)
             .where(
                 self.model.id == identifier,
             )
+            .returning(self.model.id)
+        )
+
+    def _delete_statement(self, identifier: str) -> Update:
+        """Build the statement used to soft delete a row.
+
+        `deleted_at` is set by the database clock, like `created_at` and
+        `updated_at`. Postgres' `now()` is the start of the transaction, so
+        every row deleted by the same transaction gets the same moment.
+
+        :param identifier: The unique identifier to query in the database.
+        """
+        return (
+            update(self.model)
+            .values({"deleted_at": func.now()})
+            .where(self.model.id == identifier)
+            .returning(self.model.id)
+        )
+
+    def _update_many_statements(
+        self,
+        values: Mapping[str | UUID, dict[str, Any]],
+    ) -> list[Update]:
+        """Build the statements used to update many rows with their values.
+
+        Each statement joins the table against a `VALUES` list holding the
+        new values of every row, so rows updating the same columns are
+        updated by a single statement.
+
+        :param values: Dictionary of values to update, keyed by the unique
+            identifier of the row.
+        :raises KeyError: If one of the columns does not exist.
+        """
+        groups: dict[tuple[str, ...], list[tuple[Any, ...]]] = {}
+        for identifier, row in values.items():
+            if row:
+                groups.setdefault(tuple(row), []).append(
+                    (UUID(str(identifier)), *row.values()),
+                )
+
+        table_columns = self.model.__table__.columns
+        statements = []
+        for names, rows in groups.items():
+            data = Values(
+                *(
+                    column(name, table_columns[name].type)
+                    for name in ("id", *names)
+                ),
+                name="data",
+            ).data(rows)
+            statements.append(
+                update(self.model)
+                .values({name: data.c[name] for name in names})
+                .where(self.model.id == data.c.id, self.where())
+                .returning(self.model.id),
+            )
+
+        return statements
+
+    def _delete_many_statement(
+        self,
+        identifiers: Iterable[str | UUID],
+    ) -> Update:
+        """Build the statement used to soft delete many rows.
+
+        `deleted_at` is set like in :meth:`_delete_statement`.
+
+        :param identifiers: The unique identifiers of the rows to delete.
+        """
+        return (
+            update(self.model)
+            .values({"deleted_at": func.now()})
+            .where(self._has_identifier(identifiers), self.where())
+            .returning(self.model.id)
         )
 
+    def _restore_many_statement(
+        self,
+        identifiers: Iterable[str | UUID],
+    ) -> Update:
+        """Build the statement used to restore many soft deleted rows.
+
+        :param identifiers: The unique identifiers of the rows to restore.
+        """
+        return (
+            update(self.model)
+            .values({"deleted_at": None})
+            .where(
+                self._has_identifier(identifiers),
+                self.model.deleted_at.is_not(None),
+            )
+            .returning(self.model.id)
+        )
+
+    def insert(self, values: list[dict[str, Any]] | dict[str, Any]) -> None:
+        """Default method to make insertions in the database.
+
+        :param values: List or dictionary of values to insert
+        """
+        self._execute(self._insert_statement(values))
+
+    def bulk_insert(
+        self,
+        values: Iterable[dict[str, Any]],
+        batch_size: int = DATABASE_COPY_BATCH_SIZE,
+        progress: Progress | None = None,
+    ) -> int:
+        """Load a large amount of rows with `COPY FROM STDIN`.
+
+        Rows are streamed to the server in batches of `batch_size` and the
+        whole load happens in a single transaction. Engines that are not
+        backed by psycopg 3 fall back to batched multi-row inserts.
+
+        :param values: The rows to insert, which may be a generator.
+        :param batch_size: Number of rows sent in each batch.
+        :param progress: Callable receiving the number of rows loaded so far
+            after each batch.
+        :return: The number of rows inserted.
+        """
+        table = self.model.__table__
+        total = 0
         with self.session() as session:
-            session.execute(statement=statement)
+            connection = session.connection()
+            for batch in batches(values, batch_size):
+                if connection.dialect.driver == "psycopg":
+                    copy_rows(
+                        connection.connection.driver_connection,
+                        table,
+                        batch,
+                        connection.dialect,
+                    )
+                else:
+                    session.execute(
+                        insert(self.model),
+                        batch,
+                        execution_options=caller_options(self, 0),
+                    )
+
+                total += len(batch)
+                logger.debug("Loaded %d rows into '%s'", total, table.name)
+                if progress:
+                    progress(total)
+
+            self._notify(session, None)
             session.commit()
 
+        self._after_write()
+        return total
+
+    @cached
+    def select(
+        self,
+        limit: int | None = None,
+        after: tuple[Any, ...] | None = None,
+        columns: tuple[str, ...] | None = None,
+        updated_since: datetime | None = None,
+        filters: Mapping[str, Any] | None = None,
+        sort: tuple[str, ...] = (),
+    ) -> list[BaseModel] | list[Row]:
+        """Default method to retrieve information from the database.
+
+        :param limit: Maximum number of rows to retrieve.
+        :param after: The `(created_at, id)` position to start after, or the
+            values of the `sort` columns and `id` when sorting.
+        :param columns: Name of the columns to retrieve. When given, plain
+            rows holding only those columns are returned instead of entities.
+        :param updated_since: When given, only the rows updated after this
+            moment are retrieved, including the deleted ones.
+        :param filters: Values the rows must match, keyed by column name.
+        :param sort: Columns to order the rows by instead of `created_at`,
+            each prefixed with `-` for a descending order.
+        """
+        statement = self._select_statement(
+            limit=limit,
+            after=after,
+            columns=columns,
+            updated_since=updated_since,
+            filters=filters,
+            sort=sort,
+        )
+        if columns is None:
+            return self._all(statement)
+
+        return self._rows(statement)
+
+    def stream(
+        self,
+        batch_size: int = DATABASE_STREAM_BATCH_SIZE,
+        columns: tuple[str, ...] | None = None,
+        updated_since: datetime | None = None,
+        filters: Mapping[str, Any] | None = None,
+        sort: tuple[str, ...] = (),
+    ) -> Iterator[BaseModel | Row]:
+        """Iterate over every non deleted row using a server side cursor.
+
+        Rows are fetched `batch_size` at a time, so the memory used stays
+        the same no matter how many rows the table holds. The session is
+        kept open until the iteration is over.
+
+        :param batch_size: Number of rows fetched from the cursor at a time.
+        :param columns: Name of the columns to retrieve. When given, plain
+            rows holding only those columns are yielded instead of entities.
+        :param updated_since: When given, only the rows updated after this
+            moment are retrieved, including the deleted ones.
+        :param filters: Values the rows must match, keyed by column name.
+        :param sort: Columns to order the rows by instead of `created_at`,
+            each prefixed with `-` for a descending order.
+        """
+        statement = self._select_statement(
+            columns=columns,
+            updated_since=updated_since,
+            filters=filters,
+            sort=sort,
+        ).execution_options(yield_per=batch_size)
+        with self.session() as session:
+            result = session.execute(
+                statement=statement,
+                execution_options=caller_options(self, 0),
+            )
+            yield from result if columns else result.scalars()
+
+    @cached
+    def select_first(self) -> BaseModel:
+        """Default method to get first information from the database."""
+        return self._first(self._select_statement())
+
+    @cached
+    def select_by_id(self, identifier: str) -> BaseModel:
+        """Default method to select by filtering using an identifier.
+
+        :param identifier: The unique identifier to query in the database.
+        """
+        return self._first(self._select_by_id_statement(identifier))
+
+    def select_by_ids(
+        self,
+        identifiers: Iterable[str | UUID],
+    ) -> list[BaseModel]:
+        """Select many entities at once by filtering using their identifiers.
+
+        :param identifiers: The unique identifiers to query in the database.
+        :return: The entities found, in no particular order.
+        """
+        return self._all(self._select_by_ids_statement(identifiers))
+
+    @cached
+    def select_by(self, **values: Any) -> BaseModel:
+        """Select the first row matching the given values.
+
+        :param values: The values to match, keyed by column name.
+        """
+        return self._first(self._select_by_statement(**values))
+
+    @cached
+    def select_by_name(self, name: str) -> BaseModel:
+        """Default method to select rows by using a name.
+
+        :param name: The name to use in the query in the database.
+        """
+        return self._first(self._select_by_name_statement(name))
+
+    def upsert(
+        self,
+        values: list[dict[str, Any]] | dict[str, Any],
+        conflict_target: tuple[str, ...] | None = None,
+        update_columns: tuple[str, ...] = (),
+    ) -> list[Row]:
+        """Insert values, or update the rows that already exist.
+
+        Everything happens in a single `INSERT ... ON CONFLICT` statement,
+        which is safe to run concurrently, unlike a select followed by an
+        insert.
+
+        :param values: List or dictionary of values to upsert.
+        :param conflict_target: Columns identifying a row, defaults to
+            :attr:`conflict_target`.
+        :param update_columns: Columns overwritten when the row exists. When
+            empty, existing rows are left untouched.
+        :return: The rows inserted or updated. Rows left untouched are not
+            returned.
+        """
+        return self._execute(
+            self._upsert_statement(values, conflict_target, update_columns),
+        )
+
+    def update(self, values: dict[str, Any], identifier: str) -> None:
+        """Default method to update values in the database.
+
+        :param values: Dictionary of values to update in the database.
+        :param identifier: The unique identifier to query in the database.
+        """
+        self._execute(self._update_statement(values, identifier))
+
     def delete(self, identifier: str) -> None:
         """Default method to remove entries from the database.
 
@@ -125,12 +1037,293 @@ def delete(self, identifier: str) -> None:
 
         :param identifier: The unique identifier to query in the database.
         """
-        statement = (
-            update(self.model)
-            .values({"deleted_at": datetime.now()})
-            .where(self.model.id == identifier)
+        self._execute(self._delete_statement(identifier))
+
+    def update_many(
+        self,
+        values: Mapping[str | UUID, dict[str, Any]],
+    ) -> list[UUID]:
+        """Update many rows, each with its own values, in one transaction.
+
+        :param values: Dictionary of values to update, keyed by the unique
+            identifier of the row.
+        :return: The identifiers of the rows updated. Deleted or unknown rows
+            are skipped.
+        """
+        rows = self._execute_all(self._update_many_statements(values))
+        return [row.id for row in rows]
+
+    def delete_many(self, identifiers: Iterable[str | UUID]) -> list[UUID]:
+        """Soft delete many rows with a single statement.
+
+        :param identifiers: The unique identifiers of the rows to delete.
+        :return: The identifiers of the rows deleted. Rows already deleted
+            are skipped.
+        """
+        identifiers = list(identifiers)
+        if not identifiers:
+            return []
+
+        rows = self._execute(self._delete_many_statement(identifiers))
+        return [row.id for row in rows]
+
+    def restore_many(self, identifiers: Iterable[str | UUID]) -> list[UUID]:
+        """Restore many soft deleted rows with a single statement.
+
+        :param identifiers: The unique identifiers of the rows to restore.
+        :return: The identifiers of the rows restored. Rows that are not
+            deleted are skipped.
+        """
+        identifiers = list(identifiers)
+        if not identifiers:
+            return []
+
+        rows = self._execute(self._restore_many_statement(identifiers))
+        return [row.id for row in rows]
+
+    async def async_insert(
+        self,
+        values: list[dict[str, Any]] | dict[str, Any],
+    ) -> None:
+        """Asynchronous version of :meth:`insert`.
+
+        :param values: List or dictionary of values to insert
+        """
+        await self._async_execute(self._insert_statement(values))
+
+    async def async_bulk_insert(
+        self,
+        values: Iterable[dict[str, Any]],
+        batch_size: int = DATABASE_COPY_BATCH_SIZE,
+        progress: Progress | None = None,
+    ) -> int:
+        """Asynchronous version of :meth:`bulk_insert`.
+
+        :param values: The rows to insert, which may be a generator.
+        :param batch_size: Number of rows sent in each batch.
+        :param progress: Callable receiving the number of rows loaded so far
+            after each batch.
+        :return: The number of rows inserted.
+        """
+        table = self.model.__table__
+        total = 0
+        async with self._async_scope() as session:
+            connection = await session.connection()
+            raw_connection = await connection.get_raw_connection()
+            for batch in batches(values, batch_size):
+                await async_copy_rows(
+                    raw_connection.driver_connection,
+                    table,
+                    batch,
+                    connection.dialect,
+                )
+
+                total += len(batch)
+                logger.debug("Loaded %d rows into '%s'", total, table.name)
+                if progress:
+                    progress(total)
+
+            await self._async_notify(session, None)
+            await self._async_commit(session, None)
+
+        return total
+
+    @cached
+    async def async_select(
+        self,
+        limit: int | None = None,
+        after: tuple[Any, ...] | None = None,
+        columns: tuple[str, ...] | None = None,
+        updated_since: datetime | None = None,
+        filters: Mapping[str, Any] | None = None,
+        sort: tuple[str, ...] = (),
+    ) -> list[BaseModel] | list[Row]:
+        """Asynchronous version of :meth:`select`.
+
+        :param limit: Maximum number of rows to retrieve.
+        :param after: The `(created_at, id)` position to start after, or the
+            values of the `sort` columns and `id` when sorting.
+        :param columns: Name of the columns to retrieve. When given, plain
+            rows holding only those columns are returned instead of entities.
+        :param updated_since: When given, only the rows updated after this
+            moment are retrieved, including the deleted ones.
+        :param filters: Values the rows must match, keyed by column name.
+        :param sort: Columns to order the rows by instead of `created_at`,
+            each prefixed with `-` for a descending order.
+        """
+        statement = self._select_statement(
+            limit=limit,
+            after=after,
+            columns=columns,
+            updated_since=updated_since,
+            filters=filters,
+            sort=sort,
         )
+        if columns is None:
+            return await self._async_all(statement)
 
-        with self.session() as session:
-            session.execute(statement=statement)
-            session.commit()
+        return await self._async_rows(statement)
+
+    async def async_stream(
+        self,
+        batch_size: int = DATABASE_STREAM_BATCH_SIZE,
+        columns: tuple[str, ...] | None = None,
+        updated_since: datetime | None = None,
+        filters: Mapping[str, Any] | None = None,
+        sort: tuple[str, ...] = (),
+    ) -> AsyncIterator[BaseModel | Row]:
+        """Asynchronous version of :meth:`stream`.
+
+        :param batch_size: Number of rows fetched from the cursor at a time.
+        :param columns: Name of the columns to retrieve. When given, plain
+            rows holding only those columns are yielded instead of entities.
+        :param updated_since: When given, only the rows updated after this
+            moment are retrieved, including the deleted ones.
+        :param filters: Values the rows must match, keyed by column name.
+        :param sort: Columns to order the rows by instead of `created_at`,
+            each prefixed with `-` for a descending order.
+        """
+        statement = self._select_statement(
+            columns=columns,
+            updated_since=updated_since,
+            filters=filters,
+            sort=sort,
+        ).execution_options(yield_per=batch_size)
+        async with self._async_scope() as session:
+            result = await session.stream(
+                statement,
+                execution_options=caller_options(self, 0),
+            )
+            async for item in result if columns else result.scalars():
+                yield item
+
+    @cached
+    async def async_select_first(self) -> BaseModel:
+        """Asynchronous version of :meth:`select_first`."""
+        return await self._async_first(self._select_statement())
+
+    @cached
+    async def async_select_by_id(self, identifier: str) -> BaseModel:
+        """Asynchronous version of :meth:`select_by_id`.
+
+        :param identifier: The unique identifier to query in the database.
+        """
+        return await self._async_first(
+            self._select_by_id_statement(identifier),
+        )
+
+    async def async_select_by_ids(
+        self,
+        identifiers: Iterable[str | UUID],
+    ) -> list[BaseModel]:
+        """Asynchronous version of :meth:`select_by_ids`.
+
+        :param identifiers: The unique identifiers to query in the database.
+        :return: The entities found, in no particular order.
+        """
+        return await self._async_all(
+            self._select_by_ids_statement(identifiers),
+        )
+
+    @cached
+    async def async_select_by(self, **values: Any) -> BaseModel:
+        """Asynchronous version of :meth:`select_by`.
+
+        :param values: The values to match, keyed by column name.
+        """
+        return await self._async_first(self._select_by_statement(**values))
+
+    @cached
+    async def async_select_by_name(self, name: str) -> BaseModel:
+        """Asynchronous version of :meth:`select_by_name`.
+
+        :param name: The name to use in the query in the database.
+        """
+        return await self._async_first(self._select_by_name_statement(name))
+
+    async def async_upsert(
+        self,
+        values: list[dict[str, Any]] | dict[str, Any],
+        conflict_target: tuple[str, ...] | None = None,
+        update_columns: tuple[str, ...] = (),
+    ) -> list[Row]:
+        """Asynchronous version of :meth:`upsert`.
+
+        :param values: List or dictionary of values to upsert.
+        :param conflict_target: Columns identifying a row, defaults to
+            :attr:`conflict_target`.
+        :param update_columns: Columns overwritten when the row exists. When
+            empty, existing rows are left untouched.
+        :return: The rows inserted or updated. Rows left untouched are not
+            returned.
+        """
+        return await self._async_execute(
+            self._upsert_statement(values, conflict_target, update_columns),
+        )
+
+    async def async_update(
+        self,
+        values: dict[str, Any],
+        identifier: str,
+    ) -> None:
+        """Asynchronous version of :meth:`update`.
+
+        :param values: Dictionary of values to update in the database.
+        :param identifier: The unique identifier to query in the database.
+        """
+        await self._async_execute(self._update_statement(values, identifier))
+
+    async def async_delete(self, identifier: str) -> None:
+        """Asynchronous version of :meth:`delete`.
+
+        :param identifier: The unique identifier to query in the database.
+        """
+        await self._async_execute(self._delete_statement(identifier))
+
+    async def async_update_many(
+        self,
+        values: Mapping[str | UUID, dict[str, Any]],
+    ) -> list[UUID]:
+        """Asynchronous version of :meth:`update_many`.
+
+        :param values: Dictionary of values to update, keyed by the unique
+            identifier of the row.
+        """
+        rows = await self._async_execute_all(
+            self._update_many_statements(values),
+        )
+        return [row.id for row in rows]
+
+    async def async_delete_many(
+        self,
+        identifiers: Iterable[str | UUID],
+    ) -> list[UUID]:
+        """Asynchronous version of :meth:`delete_many`.
+
+        :param identifiers: The unique identifiers of the rows to delete.
+        """
+        identifiers = list(identifiers)
+        if not identifiers:
+            return []
+
+        rows = await self._async_execute(
+            self._delete_many_statement(identifiers),
+        )
+        return [row.id for row in rows]
+
+    async def async_restore_many(
+        self,
+        identifiers: Iterable[str | UUID],
+    ) -> list[UUID]:
+        """Asynchronous version of :meth:`restore_many`.
+
+        :param identifiers: The unique identifiers of the rows to restore.
+        """
+        identifiers = list(identifiers)
+        if not identifiers:
+            return []
+
+        rows = await self._async_execute(
+            self._restore_many_statement(identifiers),
+        )
+        return [row.id for row in rows]
@@ -22,10 +22,10 @@
 """Module that represents the Condition repository."""
 
 from carnage.database.models.condition import ConditionModel
-from carnage.database.repository.base import BaseRepository
+from carnage.database.repository.reference import ReferenceRepository
 
 
-class ConditionRepository(BaseRepository):
+class ConditionRepository(ReferenceRepository):
     """Class that overrides the base repository methods."""
 
     def __init__(
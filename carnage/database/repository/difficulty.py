@@ -22,10 +22,10 @@
 """Module that represents the Difficulty repository."""
 
 from carnage.database.models.difficulty import DifficultyModel
-from carnage.database.repository.base import BaseRepository
+from carnage.database.repository.reference import ReferenceRepository
 
 
-class DifficultyRepository(BaseRepository):
+class DifficultyRepository(ReferenceRepository):
     """Class that overrides the base repository methods."""
 
     def __init__(self, model: type[DifficultyModel] = DifficultyModel) -> None:
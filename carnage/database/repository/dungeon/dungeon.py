@@ -28,6 +28,8 @@
 class DungeonRepository(BaseRepository):
     """Class that overrides the base repository methods."""
 
+    large_columns = ("plot",)
+
     def __init__(self, model: type[DungeonModel] = DungeonModel) -> None:
         """Default constructor for repository.
 
@@ -21,19 +21,17 @@
 # SOFTWARE.
 """Module that represents the Dungeon Difficulty repository."""
 
-from functools import lru_cache
-
-from sqlalchemy import select
-
 from carnage.database.models.dungeon.dungeon_difficulty import (
     DungeonDifficultyModel,
 )
-from carnage.database.repository.base import BaseRepository
+from carnage.database.repository.reference import ReferenceRepository
 
 
-class DungeonDifficultyRepository(BaseRepository):
+class DungeonDifficultyRepository(ReferenceRepository):
     """Class that overrides the base repository methods."""
 
+    conflict_target = ("level",)
+
     def __init__(
         self,
         model: type[DungeonDifficultyModel] = DungeonDifficultyModel,
@@ -44,15 +42,9 @@ def __init__(
         """
         super().__init__(model)
 
-    @lru_cache
     def select_by_level(self, level: str) -> DungeonDifficultyModel:
         """Get results from database filtering by level.
 
         :param level: Level to be used in the filter.
         """
-        statement = select(self.model).where(
-            self.model.level == level and self.deleted_at == None,  # type: ignore # noqa
-        )
-
-        with self.session() as session:
-            return session.execute(statement=statement).first()
+        return self.select_by(level=level)
@@ -21,10 +21,7 @@
 # SOFTWARE.
 """Module that represents the Dungeon History repository."""
 
-from functools import lru_cache
-
-from sqlalchemy import select
-
+from carnage.database.cache import cached
 from carnage.database.models.dungeon import DungeonHistoryModel
 from carnage.database.repository.base import BaseRepository
 
@@ -42,35 +39,23 @@ def __init__(
         """
         super().__init__(model)
 
-    @lru_cache
+    @cached
     def select_by_player_id(self, player_id: str) -> DungeonHistoryModel:
         """Get results from database filtering by player id.
 
         :param player_id: Player id to be used in the filter.
         """
-        statement = select(self.model).where(
-            self.model.player_id == player_id
-            and self.deleted_at == None,  # type: ignore # noqa
-        )
-
-        with self.session() as session:
-            return session.execute(statement=statement).first()
+        return self._first(self._select_by_statement(player_id=player_id))
 
-    @lru_cache
+    @cached
     def select_by_dungeon_id(self, dungeon_id: str) -> DungeonHistoryModel:
         """Get results from database filtering by dungeon id.
 
         :param dungeon_id: Dungeon id to be used in the filter.
         """
-        statement = select(self.model).where(
-            self.model.dungeon_id == dungeon_id
-            and self.deleted_at == None,  # type: ignore # noqa
-        )
-
-        with self.session() as session:
-            return session.execute(statement=statement).first()
+        return self._first(self._select_by_statement(dungeon_id=dungeon_id))
 
-    @lru_cache
+    @cached
     def select_by_player_and_dungeon_id(
         self,
         player_id: str,
@@ -81,11 +66,9 @@ def select_by_player_and_dungeon_id(
         :param player_id: Player id to be used in the filter.
         :param dungeon_id: Dungeon id to be used in the filter.
         """
-        statement = select(self.model).where(
-            self.model.player_id == player_id
-            and self.model.dungeon_id == dungeon_id
-            and self.deleted_at == None,  # type: ignore # noqa
+        return self._first(
+            self._select_by_statement(
+                player_id=player_id,
+                dungeon_id=dungeon_id,
+            ),
         )
-
-        with self.session() as session:
-            return session.execute(statement=statement).first()
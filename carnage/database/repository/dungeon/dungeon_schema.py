@@ -21,10 +21,7 @@
 # SOFTWARE.
 """Module that represents the Dungeon Schema repository."""
 
-from functools import lru_cache
-
-from sqlalchemy import select
-
+from carnage.database.cache import cached
 from carnage.database.models.dungeon import DungeonSchemaModel
 from carnage.database.repository.base import BaseRepository
 
@@ -32,6 +29,8 @@
 class DungeonSchemaRepository(BaseRepository):
     """Class that overrides the base repository methods."""
 
+    large_columns = ("schema",)
+
     def __init__(
         self,
         model: type[DungeonSchemaModel] = DungeonSchemaModel,
@@ -42,7 +41,7 @@ def __init__(
         """
         super().__init__(model)
 
-    @lru_cache
+    @cached
     def select_by_dungeon_difficulty(
         self,
         dungeon_difficulty_id: str,
@@ -52,10 +51,8 @@ def select_by_dungeon_difficulty(
         :param dungeon_difficulty_id: Dungeon difficulty id to be used in the
             filter.
         """
-        statement = select(self.model).where(
-            self.model.dungeon_difficulty_id == dungeon_difficulty_id
-            and self.deleted_at == None,  # type: ignore # noqa
+        return self._all(
+            self._select_by_statement(
+                dungeon_difficulty_id=dungeon_difficulty_id,
+            ),
         )
-
-        with self.session() as session:
-            return session.execute(statement=statement).scalars().all()
@@ -22,10 +22,10 @@
 """Module that represents the Game Mode repository."""
 
 from carnage.database.models.game_mode import GameModeModel
-from carnage.database.repository.base import BaseRepository
+from carnage.database.repository.reference import ReferenceRepository
 
 
-class GameModeRepository(BaseRepository):
+class GameModeRepository(ReferenceRepository):
     """Class that overrides the base repository methods."""
 
     def __init__(self, model: type[GameModeModel] = GameModeModel) -> None:
@@ -22,10 +22,10 @@
 """Module that represents the Item Base Type repository."""
 
 from carnage.database.models.item.item_base_type import ItemBaseTypeModel
-from carnage.database.repository.base import BaseRepository
+from carnage.database.repository.reference import ReferenceRepository
 
 
-class ItemBaseTypeRepository(BaseRepository):
+class ItemBaseTypeRepository(ReferenceRepository):
     """Class that overrides the base repository methods."""
 
     def __init__(
@@ -22,10 +22,10 @@
 """Module that represents the Item Magical Type repository."""
 
 from carnage.database.models.item import ItemMagicalTypeModel
-from carnage.database.repository.base import BaseRepository
+from carnage.database.repository.reference import ReferenceRepository
 
 
-class ItemMagicalTypeRepository(BaseRepository):
+class ItemMagicalTypeRepository(ReferenceRepository):
     """Class that overrides the base repository methods."""
 
     def __init__(
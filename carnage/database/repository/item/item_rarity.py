@@ -22,10 +22,10 @@
 """Module that represents the Item Rarity repository."""
 
 from carnage.database.models.item.item_rarity import ItemRarityModel
-from carnage.database.repository.base import BaseRepository
+from carnage.database.repository.reference import ReferenceRepository
 
 
-class ItemRarityRepository(BaseRepository):
+class ItemRarityRepository(ReferenceRepository):
     """Class that overrides the base repository methods."""
 
     def __init__(self, model: type[ItemRarityModel] = ItemRarityModel) -> None:
@@ -23,10 +23,10 @@
 
 from carnage.database.models.base import BaseModel
 from carnage.database.models.monster import MonsterTypeModel
-from carnage.database.repository.base import BaseRepository
+from carnage.database.repository.reference import ReferenceRepository
 
 
-class MonsterTypeRepository(BaseRepository):
+class MonsterTypeRepository(ReferenceRepository):
     """Class that overrides the base repository methods."""
 
     def __init__(self, model: BaseModel = MonsterTypeModel) -> None:
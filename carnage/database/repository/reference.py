@@ -0,0 +1,340 @@
+# MIT License
+#
+# Copyright (c) 2022, Rodolfo Olivieri
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Module that implements the repository of the reference tables."""
+
+import logging
+from collections.abc import AsyncIterator, Iterable, Iterator, Mapping
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import Row, Select, select
+
+from carnage.constants import DATABASE_STREAM_BATCH_SIZE
+from carnage.database.catalog import CatalogTable, catalog
+from carnage.database.repository.base import BaseRepository
+from carnage.database.session import WRITER_OPTION
+
+logger = logging.getLogger(__name__)
+
+
+class ReferenceRepository(BaseRepository):
+    """Class that serves a reference table from the in-memory catalog.
+
+    The whole table is loaded into :data:`carnage.database.catalog.catalog`
+    the first time it is read, or at startup by :func:`load_catalog`, and
+    every read is answered from memory afterwards. Reads return immutable
+    rows instead of entities. Each write that goes through the repository
+    loads the table again once it is committed.
+
+    The table is always loaded from the primary database, a replica could
+    still miss the write that triggered the load and the stale snapshot
+    would be kept until the next write.
+    """
+
+    conflict_target = ("name",)
+
+    def _catalog_statement(self) -> Select:
+        """Build the statement used to load the whole table."""
+        return (
+            select(*self.model.__table__.columns)
+            .where(self.where())
+            .execution_options(**{WRITER_OPTION: True})
+        )
+
+    def load(self) -> CatalogTable:
+        """Load the table into the catalog, replacing the previous snapshot."""
+        version = catalog.next_version()
+        return catalog.store(
+            self.model.__tablename__,
+            self._rows(self._catalog_statement()),
+            version,
+        )
+
+    async def async_load(self) -> CatalogTable:
+        """Asynchronous version of :meth:`load`."""
+        version = catalog.next_version()
+        return catalog.store(
+            self.model.__tablename__,
+            await self._async_rows(self._catalog_statement()),
+            version,
+        )
+
+    def table(self) -> CatalogTable:
+        """Return the snapshot of the table, loading it if needed."""
+        return catalog.get(self.model.__tablename__) or self.load()
+
+    async def async_table(self) -> CatalogTable:
+        """Asynchronous version of :meth:`table`."""
+        return catalog.get(self.model.__tablename__) or await self.async_load()
+
+    def _after_write(self, identifiers: list[UUID] | None = None) -> None:
+        """Load the table again after a write went through.
+
+        :param identifiers: The identifiers of the rows written, or `None`
+            if they are not known.
+        """
+        super()._after_write(identifiers)
+        self.load()
+
+    async def _async_after_write(
+        self,
+        identifiers: list[UUID] | None = None,
+    ) -> None:
+        """Asynchronous version of :meth:`_after_write`."""
+        await super()._async_after_write(identifiers)
+        await self.async_load()
+
+    def select(
+        self,
+        limit: int | None = None,
+        after: tuple[Any, ...] | None = None,
+        columns: tuple[str, ...] | None = None,
+        updated_since: datetime | None = None,
+        filters: Mapping[str, Any] | None = None,
+        sort: tuple[str, ...] = (),
+    ) -> list[Row]:
+        """Return the rows of the table, a page at a time.
+
+        Listings that are filtered, sorted or restricted to the rows updated
+        since a moment are answered by the database instead of the catalog,
+        which only holds the non deleted rows in their default order.
+
+        :param limit: Maximum number of rows to retrieve.
+        :param after: The position to start after.
+        :param columns: Ignored, whole rows are returned by the catalog.
+        :param updated_since: When given, only the rows updated after this
+            moment are returned, including the deleted ones.
+        :param filters: Values the rows must match, keyed by column name.
+        :param sort: Columns to order the rows by instead of `created_at`.
+        """
+        if updated_since is not None or filters or sort:
+            return super().select(
+                limit,
+                after,
+                columns,
+                updated_since,
+                filters,
+                sort,
+            )
+
+        return self.table().page(limit=limit, after=after)
+
+    def stream(
+        self,
+        batch_size: int = 0,
+        columns: tuple[str, ...] | None = None,
+        updated_since: datetime | None = None,
+        filters: Mapping[str, Any] | None = None,
+        sort: tuple[str, ...] = (),
+    ) -> Iterator[Row]:
+        """Iterate over every row of the table.
+
+        :param batch_size: Ignored, the rows are already in memory.
+        :param columns: Ignored, whole rows are returned by the catalog.
+        :param updated_since: When given, only the rows updated after this
+            moment are returned, see :meth:`select`.
+        :param filters: Values the rows must match, see :meth:`select`.
+        :param sort: Columns to order the rows by, see :meth:`select`.
+        """
+        if updated_since is not None or filters or sort:
+            yield from super().stream(
+                batch_size or DATABASE_STREAM_BATCH_SIZE,
+                columns,
+                updated_since,
+                filters,
+                sort,
+            )
+            return
+
+        yield from self.table().rows
+
+    def select_first(self) -> tuple[Row] | None:
+        """Return the first row of the table."""
+        rows = self.table().page(limit=1)
+        return (rows[0],) if rows else None
+
+    def select_by_id(self, identifier: str) -> tuple[Row] | None:
+        """Return the row with an identifier.
+
+        :param identifier: The unique identifier of the row.
+        """
+        return self.select_by(id=identifier)
+
+    def select_by_ids(
+        self,
+        identifiers: Iterable[str | UUID],
+    ) -> list[Row]:
+        """Return the rows with any of the identifiers.
+
+        :param identifiers: The unique identifiers of the rows.
+        """
+        table = self.table()
+        rows = (table.get(identifier) for identifier in identifiers)
+        return [row for row in rows if row is not None]
+
+    def select_by(self, **values: Any) -> tuple[Row] | None:
+        """Return the first row matching all the values.
+
+        :param values: The values to match, keyed by column name.
+        """
+        row = self.table().find(**values)
+        return None if row is None else (row,)
+
+    def select_by_name(self, name: str) -> tuple[Row] | None:
+        """Return the row with a name.
+
+        :param name: The name of the row.
+        """
+        return self.select_by(name=name)
+
+    async def async_select(
+        self,
+        limit: int | None = None,
+        after: tuple[Any, ...] | None = None,
+        columns: tuple[str, ...] | None = None,
+        updated_since: datetime | None = None,
+        filters: Mapping[str, Any] | None = None,
+        sort: tuple[str, ...] = (),
+    ) -> list[Row]:
+        """Asynchronous version of :meth:`select`.
+
+        :param limit: Maximum number of rows to retrieve.
+        :param after: The position to start after.
+        :param columns: Ignored, whole rows are returned by the catalog.
+        :param updated_since: When given, only the rows updated after this
+            moment are returned, see :meth:`select`.
+        :param filters: Values the rows must match, see :meth:`select`.
+        :param sort: Columns to order the rows by, see :meth:`select`.
+        """
+        if updated_since is not None or filters or sort:
+            return await super().async_select(
+                limit,
+                after,
+                columns,
+                updated_since,
+                filters,
+                sort,
+            )
+
+        table = await self.async_table()
+        return table.page(limit=limit, after=after)
+
+    async def async_stream(
+        self,
+        batch_size: int = 0,
+        columns: tuple[str, ...] | None = None,
+        updated_since: datetime | None = None,
+        filters: Mapping[str, Any] | None = None,
+        sort: tuple[str, ...] = (),
+    ) -> AsyncIterator[Row]:
+        """Asynchronous version of :meth:`stream`.
+
+        :param batch_size: Ignored, the rows are already in memory.
+        :param columns: Ignored, whole rows are returned by the catalog.
+        :param updated_since: When given, only the rows updated after this
+            moment are returned, see :meth:`select`.
+        :param filters: Values the rows must match, see :meth:`select`.
+        :param sort: Columns to order the rows by, see :meth:`select`.
+        """
+        if updated_since is not None or filters or sort:
+            async for item in super().async_stream(
+                batch_size or DATABASE_STREAM_BATCH_SIZE,
+                columns,
+                updated_since,
+                filters,
+                sort,
+            ):
+                yield item
+            return
+
+        for row in (await self.async_table()).rows:
+            yield row
+
+    async def async_select_first(self) -> tuple[Row] | None:
+        """Asynchronous version of :meth:`select_first`."""
+        rows = (await self.async_table()).page(limit=1)
+        return (rows[0],) if rows else None
+
+    async def async_select_by_id(self, identifier: str) -> tuple[Row] | None:
+        """Asynchronous version of :meth:`select_by_id`.
+
+        :param identifier: The unique identifier of the row.
+        """
+        return await self.async_select_by(id=identifier)
+
+    async def async_select_by_ids(
+        self,
+        identifiers: Iterable[str | UUID],
+    ) -> list[Row]:
+        """Asynchronous version of :meth:`select_by_ids`.
+
+        :param identifiers: The unique identifiers of the rows.
+        """
+        table = await self.async_table()
+        rows = (table.get(identifier) for identifier in identifiers)
+        return [row for row in rows if row is not None]
+
+    async def async_select_by(self, **values: Any) -> tuple[Row] | None:
+        """Asynchronous version of :meth:`select_by`.
+
+        :param values: The values to match, keyed by column name.
+        """
+        row = (await self.async_table()).find(**values)
+        return None if row is None else (row,)
+
+    async def async_select_by_name(self, name: str) -> tuple[Row] | None:
+        """Asynchronous version of :meth:`select_by_name`.
+
+        :param name: The name of the row.
+        """
+        return await self.async_select_by(name=name)
+
+
+def reference_repositories() -> list[type[ReferenceRepository]]:
+    """Gather every reference repository, however deep it inherits."""
+    pending = [ReferenceRepository]
+    found = []
+    while pending:
+        subclasses = pending.pop().__subclasses__()
+        found.extend(subclasses)
+        pending.extend(subclasses)
+
+    return found
+
+
+async def load_catalog() -> None:
+    """Load every reference table into the catalog.
+
+    Meant to run when the application starts. Tables that fail to load are
+    loaded again the first time they are read.
+    """
+    for repository in reference_repositories():
+        try:
+            table = await repository().async_load()
+        except Exception:  # noqa: B902
+            logger.exception(
+                "Could not load '%s' into the catalog", repository
+            )
+            continue
+
+        logger.debug("Loaded %d rows of '%s'", len(table), table.name)
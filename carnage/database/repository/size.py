@@ -23,10 +23,10 @@
 
 from carnage.database.models.base import BaseModel
 from carnage.database.models.size import SizeModel
-from carnage.database.repository.base import BaseRepository
+from carnage.database.repository.reference import ReferenceRepository
 
 
-class SizeRepository(BaseRepository):
+class SizeRepository(ReferenceRepository):
     """Class that overrides the base repository methods."""
 
     def __init__(self, model: BaseModel = SizeModel) -> None:
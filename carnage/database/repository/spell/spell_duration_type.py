@@ -22,10 +22,10 @@
 """Module that represents the Spell Duration Type repository."""
 
 from carnage.database.models.spell import SpellDurationTypeModel
-from carnage.database.repository.base import BaseRepository
+from carnage.database.repository.reference import ReferenceRepository
 
 
-class SpellDurationTypeRepository(BaseRepository):
+class SpellDurationTypeRepository(ReferenceRepository):
     """Class that overrides the base repository methods."""
 
     def __init__(
@@ -22,10 +22,10 @@
 """Module that represents the Spell Range Type repository."""
 
 from carnage.database.models.spell import SpellRangeTypeModel
-from carnage.database.repository.base import BaseRepository
+from carnage.database.repository.reference import ReferenceRepository
 
 
-class SpellRangeTypeRepository(BaseRepository):
+class SpellRangeTypeRepository(ReferenceRepository):
     """Class that overrides the base repository methods."""
 
     def __init__(
@@ -22,10 +22,10 @@
 """Module that represents the Spell School repository."""
 
 from carnage.database.models.spell import SpellSchoolModel
-from carnage.database.repository.base import BaseRepository
+from carnage.database.repository.reference import ReferenceRepository
 
 
-class SpellSchoolRepository(BaseRepository):
+class SpellSchoolRepository(ReferenceRepository):
     """Class that overrides the base repository methods."""
 
     def __init__(
@@ -21,10 +21,7 @@
 # SOFTWARE.
 """Module that represents the Vocation Spell repository."""
 
-from functools import lru_cache
-
-from sqlalchemy import select
-
+from carnage.database.cache import cached
 from carnage.database.models.vocation import VocationSpellModel
 from carnage.database.repository.base import BaseRepository
 
@@ -32,6 +29,8 @@
 class VocationSpellRepository(BaseRepository):
     """Class that overrides the base repository methods."""
 
+    conflict_target = ("vocation_id", "spell_id")
+
     def __init__(
         self,
         model: type[VocationSpellModel] = VocationSpellModel,
@@ -42,16 +41,10 @@ def __init__(
         """
         super().__init__(model)
 
-    @lru_cache
+    @cached
     def select_by_spell_id(self, spell_id: str) -> VocationSpellModel:
         """Get results from database filtering by spell id.
 
         :param spell_id: Spell id to be used in the filter.
         """
-        statement = select(self.model).where(
-            self.model.spell_id == spell_id
-            and self.deleted_at == None,  # type: ignore # noqa
-        )
-
-        with self.session() as session:
-            return session.execute(statement=statement).first()
+        return self._first(self._select_by_statement(spell_id=spell_id))
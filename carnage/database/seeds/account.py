@@ -20,7 +20,6 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 """Module that represents the Account seeding."""
-import logging
 from typing import Any
 
 from cryptography.fernet import Fernet
@@ -29,8 +28,6 @@
 from carnage.database.repository.account import AccountRepository
 from carnage.database.seeds.base import BaseSeed
 
-logger = logging.getLogger(__name__)
-
 
 class AccountSeed(BaseSeed):
     """Class that overrides the base seed methods."""
@@ -45,25 +42,6 @@ class AccountSeed(BaseSeed):
         },
     ]
 
-    def validate_seed(self, seed: dict[str, str]) -> bool:
-        """Validate if a seed already exists in the database.
-
-        :param seed: The current seed being seeded.
-        """
-        logger.debug(
-            "Validating the current seed with username: '%s'",
-            seed["username"],
-        )
-
-        result = self.repository.select_by_username(  # type: ignore
-            username=seed["username"],
-        )
-        if result:
-            logger.debug("Seed already exists in the database")
-            return True
-
-        return False
-
     def __init__(
         self,
         repository: type[AccountRepository] = AccountRepository,
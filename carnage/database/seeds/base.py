@@ -45,7 +45,7 @@ def __init__(
         """
         self.repository = repository()
 
-    def validate_seed(self, seed: dict[str, str]) -> bool:
+    def validate_seed(self, seed: dict[str, Any]) -> bool:
         """Validate if a seed already exists in the database.
 
         :param seed: The current seed being seeded.
@@ -63,11 +63,25 @@ def validate_seed(self, seed: dict[str, str]) -> bool:
         return False
 
     def seed(self) -> None:
-        """Method to seed data into the database."""
+        """Method to seed data into the database.
+
+        When the repository has a conflict target, the data is upserted in a
+        single statement and seeds already present in the database are left
+        untouched. Otherwise, only the seeds whose name is not found yet are
+        inserted.
+        """
         if not self.data:
             raise ValueError(f"No seed data found for {self.name}")
 
-        for seed in self.data:
-            if not self.validate_seed(seed=seed):
-                self.repository.insert(self.data)
-                logger.info("Seeded '%s' successfully", self.name)
+        if self.repository.conflict_target:
+            rows = self.repository.upsert(self.data)
+        else:
+            rows = [seed for seed in self.data if not self.validate_seed(seed)]
+            if rows:
+                self.repository.insert(rows)
+
+        logger.info(
+            "Seeded '%s' successfully, %d new rows",
+            self.name,
+            len(rows),
+        )
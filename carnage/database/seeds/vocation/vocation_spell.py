@@ -21,7 +21,6 @@
 # SOFTWARE.
 """Module that represents the Vocation Spell seeding."""
 
-import logging
 from typing import Any
 
 from carnage.database.repository.spell import SpellRepository
@@ -31,8 +30,6 @@
 )
 from carnage.database.seeds.base import BaseSeed
 
-logger = logging.getLogger(__name__)
-
 
 class VocationSpellSeed(BaseSeed):
     """Class that overrides the base seed methods."""
@@ -56,25 +53,6 @@ def __init__(
         self.vocation_repository = VocationRepository()
         self.spell_repository = SpellRepository()
 
-    def validate_seed(self, seed: dict[str, str]) -> bool:
-        """Validate if a seed already exists in the database.
-
-        :param seed: The current seed being seeded.
-        """
-        logger.debug(
-            "Validating the current seed with spell_id: '%s'",
-            seed["spell_id"],
-        )
-
-        result = self.repository.select_by_spell_id(  # type: ignore
-            spell_id=seed["spell_id"],
-        )
-        if result:
-            logger.debug("Seed already exists in the database")
-            return True
-
-        return False
-
     def seed(self) -> None:
         """Method to seed data into the database."""
         vocation = self.vocation_repository.select_first()
@@ -19,16 +19,335 @@
 # LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
-"""Module that represents the database session."""
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+"""Module that represents the database session.
+
+Writes always go to the primary database, while plain reads are spread over
+the replicas listed in `DATABASE_READER_HOSTS`. Once a request (or an
+account, across requests) writes something, its reads stick to the primary
+for `DATABASE_STICKINESS_WINDOW` seconds, so it never reads stale data from
+a replica that did not catch up yet. Reads that must never be stale, like
+the loads of the catalog, can ask for the primary with the
+:data:`WRITER_OPTION` execution option. So do the reads whose results are
+shared by the caches, see :func:`read_from_writer` and :func:`bind_writer`,
+otherwise a cache filled right after a write could keep the rows a replica
+held before it for its whole time to live.
+"""
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+from sqlalchemy import Engine, create_engine, exc
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import (
+    AsyncAdaptedQueuePool,
+    PoolProxiedConnection,
+    QueuePool,
+)
 
 from carnage.constants import (
     DATABASE_HOST,
+    DATABASE_INSTRUMENTATION,
+    DATABASE_MAX_OVERFLOW,
     DATABASE_NAME,
     DATABASE_PASSWORD,
+    DATABASE_POOL_PRE_PING,
+    DATABASE_POOL_RECYCLE,
+    DATABASE_POOL_SIZE,
+    DATABASE_POOL_TIMEOUT,
+    DATABASE_PREPARE_THRESHOLD,
+    DATABASE_READER_HOSTS,
+    DATABASE_READER_STRATEGY,
+    DATABASE_STATEMENT_TIMEOUT,
+    DATABASE_STICKINESS_WINDOW,
     DATABASE_USERNAME,
 )
+from carnage.database.instrumentation import instrument
+
+#: Execution option sending a read to the primary instead of a replica.
+WRITER_OPTION: str = "carnage_writer"
+
+#: Moment of the last write made by the current request.
+_written_at: ContextVar[float | None] = ContextVar("written_at", default=None)
+
+#: Whether the reads of the current context must go to the primary.
+_writer_reads: ContextVar[bool] = ContextVar("writer_reads", default=False)
+
+#: Account that issued the current request, if any.
+_account: ContextVar[str | None] = ContextVar("account", default=None)
+
+#: Moment of the last write made by each account.
+_account_written_at: dict[str, float] = {}
+_account_lock = threading.Lock()
+
+
+def bind_account(account: str | None) -> None:
+    """Tie the current request to an account for read-your-writes.
+
+    :param account: An unique key of the account, like its email.
+    """
+    _account.set(account)
+
+
+def bind_writer() -> None:
+    """Send every read left in the current request to the primary.
+
+    Used by the requests whose response is cached and shared with the other
+    clients, so it never holds rows older than the last write.
+    """
+    _writer_reads.set(True)
+
+
+@contextmanager
+def read_from_writer() -> Iterator[None]:
+    """Send the reads made within the block to the primary.
+
+    Used to fill the entity cache, see :func:`carnage.database.cache.cached`.
+    """
+    token = _writer_reads.set(True)
+    try:
+        yield
+    finally:
+        _writer_reads.reset(token)
+
+
+def mark_write() -> None:
+    """Record that the current request (and account) wrote something."""
+    now = time.monotonic()
+    _written_at.set(now)
+
+    account = _account.get()
+    if account is None:
+        return
+
+    with _account_lock:
+        _account_written_at[account] = now
+        expired = [
+            key
+            for key, written_at in _account_written_at.items()
+            if now - written_at >= DATABASE_STICKINESS_WINDOW
+        ]
+        for key in expired:
+            del _account_written_at[key]
+
+
+def is_sticky() -> bool:
+    """Whether the reads of the current request must go to the primary."""
+    now = time.monotonic()
+    written_at = _written_at.get()
+    if (
+        written_at is not None
+        and now - written_at < DATABASE_STICKINESS_WINDOW
+    ):
+        return True
+
+    account = _account.get()
+    if account is None:
+        return False
+
+    with _account_lock:
+        written_at = _account_written_at.get(account)
+
+    return (
+        written_at is not None
+        and now - written_at < DATABASE_STICKINESS_WINDOW
+    )
+
+
+class TimedPoolMixin:
+    """A mixin that keeps track of how long checkouts wait on a pool.
+
+    The time measured covers everything needed to hand a connection to the
+    caller: waiting for a free slot, opening a new connection when the pool
+    is allowed to overflow and the optional pre-ping.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Default constructor for the mixin.
+
+        :param args: Positional arguments forwarded to the pool.
+        :param kwargs: Keyword arguments forwarded to the pool.
+        """
+        super().__init__(*args, **kwargs)
+        self._statistics_lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.timeout_wait_time = 0.0
+        self.wait_time = 0.0
+        self.max_wait_time = 0.0
+
+    def connect(self) -> PoolProxiedConnection:
+        """Check out a connection while measuring the time spent waiting.
+
+        Only the checkouts that succeed are counted, along with their wait.
+        The time spent by the ones that timed out is kept apart, so it does
+        not skew the average wait.
+        """
+        start = time.perf_counter()
+        try:
+            connection = super().connect()  # type: ignore
+        except exc.TimeoutError:
+            elapsed = time.perf_counter() - start
+            with self._statistics_lock:
+                self.timeouts += 1
+                self.timeout_wait_time += elapsed
+            raise
+
+        elapsed = time.perf_counter() - start
+        with self._statistics_lock:
+            self.checkouts += 1
+            self.wait_time += elapsed
+            self.max_wait_time = max(self.max_wait_time, elapsed)
+
+        return connection
+
+
+class TimedQueuePool(TimedPoolMixin, QueuePool):
+    """Queue pool used by the synchronous engine."""
+
+
+class TimedAsyncAdaptedQueuePool(TimedPoolMixin, AsyncAdaptedQueuePool):
+    """Queue pool used by the asynchronous engine."""
+
+
+class ReplicaRouter:
+    """Class that picks the engine used to run a statement."""
+
+    strategies = ("round_robin", "least_connections")
+
+    def __init__(
+        self,
+        writer: Engine,
+        readers: list[Engine],
+        strategy: str = DATABASE_READER_STRATEGY,
+    ) -> None:
+        """Default constructor for the router.
+
+        :param writer: The engine connected to the primary database.
+        :param readers: The engines connected to the replicas.
+        :param strategy: How a replica is picked, either `round_robin` or
+            `least_connections`.
+        :raises ValueError: If the strategy is not known.
+        """
+        if strategy not in self.strategies:
+            raise ValueError(f"Unknown reader strategy '{strategy}'.")
+
+        self.writer = writer
+        self.readers = readers
+        self.strategy = strategy
+        self._lock = threading.Lock()
+        self._next = 0
+
+    def get_reader(self) -> Engine:
+        """Return the engine that should serve the next read."""
+        if not self.readers or is_sticky():
+            return self.writer
+
+        if self.strategy == "least_connections":
+            return min(
+                self.readers,
+                key=lambda engine: engine.pool.checkedout(),  # type: ignore
+            )
+
+        with self._lock:
+            engine = self.readers[self._next % len(self.readers)]
+            self._next += 1
+
+        return engine
+
+
+class RoutingSession(Session):
+    """Session that sends reads to the replicas and writes to the primary."""
+
+    def __init__(
+        self,
+        *args: Any,
+        router: ReplicaRouter | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Default constructor for the session.
+
+        :param args: Positional arguments forwarded to the session.
+        :param router: The router used to pick an engine.
+        :param kwargs: Keyword arguments forwarded to the session.
+        """
+        super().__init__(*args, **kwargs)
+        self.router = router
+
+    def get_bind(
+        self,
+        mapper: Any = None,
+        clause: Any = None,
+        **kwargs: Any,
+    ) -> Engine:
+        """Return the engine a statement should be executed on.
+
+        Anything that is not a `SELECT` outside of a flush, including
+        connections requested without a statement, is treated as a write.
+        Lambda statements are classified by the statement they hold. Reads
+        with the :data:`WRITER_OPTION`, or made where :func:`bind_writer` or
+        :func:`read_from_writer` apply, go to the primary without making the
+        next reads stick to it.
+
+        :param mapper: The mapper involved in the operation, if any.
+        :param clause: The statement being executed, if any.
+        :param kwargs: Extra arguments given by SQLAlchemy.
+        """
+        if self.router is None:
+            return super().get_bind(mapper, clause=clause, **kwargs)
+
+        if getattr(clause, "is_select", False) and not self._flushing:
+            if _writer_reads.get() or clause.get_execution_options().get(
+                WRITER_OPTION,
+            ):
+                return self.router.writer
+
+            return self.router.get_reader()
+
+        mark_write()
+        return self.router.writer
+
+
+def _database_url(driver: str, host: str | None = DATABASE_HOST) -> str:
+    """Build the url used to connect to the database.
+
+    :param driver: The SQLAlchemy driver name, like `psycopg`.
+    :param host: The host (and optional port) of the database server.
+    """
+    return f"postgresql+{driver}://{DATABASE_USERNAME}:{DATABASE_PASSWORD}@{host}/{DATABASE_NAME}"  # noqa
+
+
+def _engine_options() -> dict[str, Any]:
+    """Gather the options shared by every engine created in this module.
+
+    Both engines use psycopg (3), which prepares a statement on the server
+    once it ran `DATABASE_PREPARE_THRESHOLD` times on a connection, so the
+    frequent lookups of the repositories are only planned once.
+    """
+    connect_args: dict[str, Any] = {
+        "prepare_threshold": (
+            DATABASE_PREPARE_THRESHOLD
+            if DATABASE_PREPARE_THRESHOLD >= 0
+            else None
+        ),
+    }
+
+    if DATABASE_STATEMENT_TIMEOUT > 0:
+        connect_args[
+            "options"
+        ] = f"-c statement_timeout={DATABASE_STATEMENT_TIMEOUT}"
+
+    return {
+        "pool_size": DATABASE_POOL_SIZE,
+        "max_overflow": DATABASE_MAX_OVERFLOW,
+        "pool_timeout": DATABASE_POOL_TIMEOUT,
+        "pool_recycle": DATABASE_POOL_RECYCLE,
+        "pool_pre_ping": DATABASE_POOL_PRE_PING,
+        "connect_args": connect_args,
+    }
 
 
 def create_session() -> sessionmaker:
@@ -37,11 +356,117 @@ def create_session() -> sessionmaker:
     :return: A new database session.
     :rtype: sessionmaker.
     """
-    engine = create_engine(
-        f"postgresql+psycopg2://{DATABASE_USERNAME}:{DATABASE_PASSWORD}@{DATABASE_HOST}/{DATABASE_NAME}",  # noqa
+    writer, *readers = (
+        create_engine(
+            _database_url("psycopg", host),
+            poolclass=TimedQueuePool,
+            **_engine_options(),
+        )
+        for host in (DATABASE_HOST, *DATABASE_READER_HOSTS)
+    )
+    if DATABASE_INSTRUMENTATION:
+        for engine in (writer, *readers):
+            instrument(engine)
+
+    return sessionmaker(
+        bind=writer,
+        class_=RoutingSession,
+        router=ReplicaRouter(writer, readers),
+    )
+
+
+def create_async_session() -> async_sessionmaker:
+    """Create a new asynchronous database session.
+
+    The asynchronous engine uses the psycopg (3) driver too, which talks to
+    the database without blocking the event loop.
+
+    :return: A new asynchronous database session.
+    :rtype: async_sessionmaker.
+    """
+    writer, *readers = (
+        create_async_engine(
+            _database_url("psycopg", host),
+            poolclass=TimedAsyncAdaptedQueuePool,
+            **_engine_options(),
+        )
+        for host in (DATABASE_HOST, *DATABASE_READER_HOSTS)
+    )
+    if DATABASE_INSTRUMENTATION:
+        for engine in (writer, *readers):
+            instrument(engine.sync_engine)
+
+    return async_sessionmaker(
+        bind=writer,
+        sync_session_class=RoutingSession,
+        router=ReplicaRouter(
+            writer.sync_engine,
+            [reader.sync_engine for reader in readers],
+        ),
+        expire_on_commit=False,
     )
-    return sessionmaker(bind=engine)
+
+
+def get_pool_statistics(engine: Engine) -> dict[str, int | float]:
+    """Collect live statistics of the pool used by an engine.
+
+    :param engine: The (synchronous) engine that owns the pool.
+    :return: A dictionary with the pool statistics.
+    """
+    pool = engine.pool
+    statistics: dict[str, int | float] = {
+        "size": pool.size(),  # type: ignore
+        "checked_out": pool.checkedout(),  # type: ignore
+        "idle": pool.checkedin(),  # type: ignore
+        "overflow": max(pool.overflow(), 0),  # type: ignore
+    }
+
+    if isinstance(pool, TimedPoolMixin):
+        with pool._statistics_lock:
+            checkouts = pool.checkouts
+            statistics.update(
+                {
+                    "checkouts": checkouts,
+                    "timeouts": pool.timeouts,
+                    "timeout_wait_time": pool.timeout_wait_time,
+                    "wait_time": pool.wait_time,
+                    "average_wait_time": (
+                        pool.wait_time / checkouts if checkouts else 0.0
+                    ),
+                    "max_wait_time": pool.max_wait_time,
+                },
+            )
+
+    return statistics
 
 
 #: Global instance of a session for sqlalchemy.
 session = create_session()
+
+#: Global instance of an asynchronous session for sqlalchemy.
+async_session = create_async_session()
+
+
+def pool_statistics() -> dict[str, Any]:
+    """Collect the pool statistics of the global sessions.
+
+    The `sync` and `async` keys hold the pools of the primary database,
+    while `readers` holds the pools of each replica, keyed by host.
+    """
+    router = session.kw["router"]
+    async_router = async_session.kw["router"]
+    return {
+        "sync": get_pool_statistics(router.writer),
+        "async": get_pool_statistics(async_router.writer),
+        "readers": {
+            host: {
+                "sync": get_pool_statistics(reader),
+                "async": get_pool_statistics(async_reader),
+            }
+            for host, reader, async_reader in zip(
+                DATABASE_READER_HOSTS,
+                router.readers,
+                async_router.readers,
+            )
+        },
+    }
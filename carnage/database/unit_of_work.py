@@ -0,0 +1,195 @@
+# MIT License
+#
+# Copyright (c) 2022, Rodolfo Olivieri
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Module that shares a single session between the repositories.
+
+Outside of a unit of work, every asynchronous repository method opens its own
+session and commits its own writes. Inside one, they all borrow the session of
+the unit of work, so a request that touches several repositories checks out a
+single connection per engine and its writes are committed together, once,
+when the unit of work ends. The caches are only told about the writes after
+they are committed (or rolled back).
+
+Rolling back expires every entity of the session, so the cache entries filled
+during the transaction are dropped first and their entities detached, they
+keep the values read instead of failing the next time they are used.
+"""
+
+from collections.abc import AsyncIterator, Awaitable, Callable, Hashable
+from contextlib import AsyncExitStack, asynccontextmanager
+from contextvars import ContextVar, Token
+from types import TracebackType
+from typing import Any
+
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstanceState
+
+#: Unit of work of the current request, if any.
+_current: ContextVar["UnitOfWork | None"] = ContextVar(
+    "unit_of_work",
+    default=None,
+)
+
+
+def current_unit_of_work() -> "UnitOfWork | None":
+    """Return the unit of work the current request runs in, if any."""
+    return _current.get()
+
+
+def _instances(value: Any) -> list[Any]:
+    """Return the entities held by a cached value.
+
+    :param value: The value cached, an entity, a sequence of them or rows.
+    """
+    values = value if isinstance(value, (list, tuple)) else (value,)
+    return [
+        instance
+        for instance in values
+        if isinstance(inspect(instance, raiseerr=False), InstanceState)
+    ]
+
+
+class UnitOfWork:
+    """Class that holds the session shared during a unit of work.
+
+    The session is opened the first time a repository needs it. Leaving the
+    unit of work commits it, unless an exception was raised, in which case it
+    is rolled back. :meth:`commit` and :meth:`rollback` can also be called
+    explicitly to end a transaction earlier, the next statement starts a new
+    one in the same session.
+    """
+
+    def __init__(self) -> None:
+        """Default constructor for the unit of work."""
+        self.session: AsyncSession | None = None
+        self.commits = 0
+        self._callbacks: list[Callable[[], Awaitable[Any]]] = []
+        self._entries: list[tuple[Any, Hashable, Any]] = []
+        self._stack = AsyncExitStack()
+        self._token: Token | None = None
+
+    @asynccontextmanager
+    async def scope(
+        self,
+        factory: Callable[[], Any],
+    ) -> AsyncIterator[AsyncSession]:
+        """Lend the session of the unit of work, opening it if needed.
+
+        The session is neither committed nor closed when the block ends.
+
+        :param factory: The session maker used to open the session.
+        """
+        if self.session is None:
+            self.session = await self._stack.enter_async_context(factory())
+
+        yield self.session
+
+    def after_commit(self, callback: Callable[[], Awaitable[Any]]) -> None:
+        """Run a callback once the current transaction ends.
+
+        :param callback: The coroutine function to call.
+        """
+        self._callbacks.append(callback)
+
+    def cached(self, cache: Any, key: Hashable, value: Any) -> None:
+        """Remember a cache entry filled during the current transaction.
+
+        :param cache: The :class:`carnage.database.cache.EntityCache` filled.
+        :param key: The key of the entry.
+        :param value: The value stored.
+        """
+        self._entries.append((cache, key, value))
+
+    def _forget_entries(self) -> None:
+        """Drop the cache entries filled and detach their entities."""
+        entries, self._entries = self._entries, []
+        for cache, key, value in entries:
+            cache.discard(key)
+            if self.session is None:
+                continue
+
+            for instance in _instances(value):
+                if instance in self.session:
+                    self.session.expunge(instance)
+
+    async def _run_callbacks(self) -> None:
+        """Run the callbacks registered, outside of the unit of work."""
+        callbacks, self._callbacks = self._callbacks, []
+        token = _current.set(None)
+        try:
+            for callback in callbacks:
+                await callback()
+        finally:
+            _current.reset(token)
+
+    async def commit(self) -> None:
+        """Commit the current transaction."""
+        if self.session is not None:
+            await self.session.commit()
+            self.commits += 1
+
+        self._entries.clear()
+        await self._run_callbacks()
+
+    async def rollback(self) -> None:
+        """Roll back the current transaction.
+
+        The cache entries filled during the transaction are dropped first,
+        they may hold rows it wrote. The callbacks still run, the writes
+        may have reached the caches some other way.
+        """
+        self._forget_entries()
+        if self.session is not None:
+            await self.session.rollback()
+
+        await self._run_callbacks()
+
+    async def close(self) -> None:
+        """Close the session, giving its connections back to the pools."""
+        await self._stack.aclose()
+        self.session = None
+
+    async def __aenter__(self) -> "UnitOfWork":
+        """Make the unit of work the current one."""
+        self._token = _current.set(self)
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Commit or roll back the unit of work and close its session.
+
+        :param exc_type: The type of the exception raised, if any.
+        :param exc: The exception raised, if any.
+        :param traceback: The traceback of the exception raised, if any.
+        """
+        try:
+            if exc_type is None:
+                await self.commit()
+            else:
+                await self.rollback()
+        finally:
+            _current.reset(self._token)
+            await self.close()
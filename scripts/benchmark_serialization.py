@@ -0,0 +1,135 @@
+import argparse
+import asyncio
+import time
+from collections import namedtuple
+from collections.abc import Callable
+from datetime import datetime
+from uuid import uuid4
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from pydantic.fields import ModelField
+from rich.console import Console
+from rich.table import Table
+
+from carnage.api.schemas.dungeon.dungeon import ListDungeonSchema
+from carnage.api.serialization import RowEncoder
+
+console = Console()
+Row = namedtuple(
+    "Row",
+    ("id", "created_at", "updated_at", "deleted_at", "name", "plot"),
+)
+
+
+def make_rows(count: int) -> list[Row]:
+    """Build rows like the ones read by the dungeon listing.
+
+    :param count: Number of rows to build.
+    """
+    return [
+        Row(
+            id=uuid4(),
+            created_at=datetime.now(),
+            updated_at=datetime.now(),
+            deleted_at=None,
+            name=f"dungeon {index}",
+            plot={"chapters": list(range(5)), "title": f"plot {index}"},
+        )
+        for index in range(count)
+    ]
+
+
+def schema_path(
+    rows: list[Row],
+    field: ModelField,
+    loop: asyncio.AbstractEventLoop,
+) -> bytes:
+    """Encode rows like the list endpoints did, through the schemas.
+
+    Every row is validated into a schema, the list is validated again
+    against the response model and encoded by the JSON response.
+
+    :param rows: The rows to encode.
+    :param field: The response model of the listing.
+    :param loop: The event loop the response model is validated in.
+    """
+    items = [ListDungeonSchema.from_orm(row) for row in rows]
+    content = loop.run_until_complete(
+        serialize_response(
+            field=field,
+            response_content=items,
+            exclude_unset=True,
+            is_coroutine=True,
+        ),
+    )
+    return JSONResponse(content).body
+
+
+def measure(function: Callable[[], bytes], repeat: int) -> float:
+    """Return the best time taken by a function, in milliseconds.
+
+    :param function: The function to measure.
+    :param repeat: Number of times the function is run.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+
+    return min(timings) * 1000
+
+
+def main() -> int:
+    """Main entrypoint for the serialization benchmark script."""
+    parser = argparse.ArgumentParser(
+        description="Compare the encodings of the rows of a listing.",
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[100, 1000, 10000],
+        help="Number of rows of each listing encoded.",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=5,
+        help="Number of times each listing is encoded.",
+    )
+    arguments = parser.parse_args()
+
+    encoder = RowEncoder(ListDungeonSchema)
+    field = create_response_field(
+        name="response",
+        type_=list[ListDungeonSchema],
+    )
+    loop = asyncio.new_event_loop()
+    table = Table(title="Encoding of a dungeon listing")
+    for column in ("Rows", "Schemas (ms)", "Row encoder (ms)", "Speedup"):
+        table.add_column(column, justify="right")
+
+    for size in arguments.sizes:
+        rows = make_rows(size)
+        slow = measure(
+            lambda: schema_path(rows, field, loop),
+            arguments.repeat,
+        )
+        fast = measure(lambda: encoder.encode(rows), arguments.repeat)
+        table.add_row(
+            str(size),
+            f"{slow:.2f}",
+            f"{fast:.2f}",
+            f"{slow / fast:.1f}x",
+        )
+
+    loop.close()
+    console.print(table)
+    return 0
+
+
+if __name__ == "__main__":
+    main()
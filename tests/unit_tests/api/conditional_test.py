@@ -0,0 +1,39 @@
+from unittest import mock
+
+import pytest
+
+from carnage.api import conditional
+
+
+def test_make_etag():
+    etag = conditional.make_etag("player", 1, None)
+
+    assert etag.startswith('"') and etag.endswith('"')
+    assert etag == conditional.make_etag("player", 1, None)
+    assert etag != conditional.make_etag("player", 2, None)
+    assert conditional.make_etag(b"[]") == conditional.make_etag("[]")
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    (
+        (None, False),
+        ('"other"', False),
+        ('"test"', True),
+        ('"other", W/"test"', True),
+        ("*", True),
+    ),
+)
+def test_etag_matches(header, expected):
+    headers = {} if header is None else {"if-none-match": header}
+    request = mock.Mock(headers=headers)
+
+    assert conditional.etag_matches(request, '"test"') is expected
+
+
+def test_not_modified():
+    response = conditional.not_modified('"test"')
+
+    assert response.status_code == 304
+    assert response.headers["ETag"] == '"test"'
+    assert response.body == b""
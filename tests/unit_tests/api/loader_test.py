@@ -0,0 +1,82 @@
+import asyncio
+from collections import namedtuple
+from unittest import mock
+from uuid import uuid4
+
+import pytest
+
+from carnage.api import loader
+from carnage.database.repository.player import PlayerRepository
+
+Entity = namedtuple("Entity", ("id",))
+
+
+def _repository(entities):
+    repository = mock.MagicMock()
+    repository.async_select_by_ids = mock.AsyncMock(return_value=entities)
+    return repository
+
+
+@pytest.mark.anyio()
+async def test_load_batches_concurrent_lookups():
+    entities = [Entity(id=uuid4()), Entity(id=uuid4())]
+    repository = _repository(entities)
+    data_loader = loader.DataLoader(repository)
+
+    result = await asyncio.gather(
+        data_loader.load(entities[0].id),
+        data_loader.load(str(entities[1].id)),
+        data_loader.load(entities[0].id),
+    )
+
+    assert result == [entities[0], entities[1], entities[0]]
+    repository.async_select_by_ids.assert_awaited_once_with(
+        [str(entities[0].id), str(entities[1].id)],
+    )
+
+
+@pytest.mark.anyio()
+async def test_load_many_memoizes():
+    entities = [Entity(id=uuid4())]
+    missing = uuid4()
+    repository = _repository(entities)
+    data_loader = loader.DataLoader(repository)
+
+    result = await data_loader.load_many([entities[0].id, missing])
+    assert result == [entities[0], None]
+
+    assert await data_loader.load(entities[0].id) == entities[0]
+    repository.async_select_by_ids.assert_awaited_once()
+
+    data_loader.clear()
+    await data_loader.load(entities[0].id)
+    assert repository.async_select_by_ids.await_count == 2
+
+
+@pytest.mark.anyio()
+async def test_load_error_is_not_memoized():
+    repository = _repository([])
+    repository.async_select_by_ids.side_effect = [RuntimeError("boom"), []]
+    data_loader = loader.DataLoader(repository)
+    identifier = uuid4()
+
+    with pytest.raises(RuntimeError):
+        await data_loader.load(identifier)
+
+    assert await data_loader.load(identifier) is None
+
+
+def test_loaders():
+    loaders = loader.Loaders()
+    repository = PlayerRepository()
+
+    assert loaders[PlayerRepository] is loaders[repository]
+    assert loaders[repository].repository is not repository
+
+
+def test_get_loaders():
+    request = mock.MagicMock(state=mock.MagicMock(spec=[]))
+
+    loaders = loader.get_loaders(request)
+
+    assert loader.get_loaders(request) is loaders
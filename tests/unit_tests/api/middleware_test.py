@@ -0,0 +1,180 @@
+from unittest import mock
+
+import pytest
+from fastapi import FastAPI, HTTPException, Request, Response
+from httpx import AsyncClient
+
+from carnage.api import middleware
+from carnage.api.response_cache import SCOPE_KEY, ResponseCache, cache_response
+from carnage.database import unit_of_work
+from carnage.database.cache import EntityCache
+
+
+@pytest.fixture()
+def application():
+    app = FastAPI()
+    app.add_middleware(middleware.UnitOfWorkMiddleware)
+
+    @app.get("/ok")
+    async def ok():
+        return {"current": unit_of_work.current_unit_of_work() is not None}
+
+    @app.get("/missing")
+    async def missing():
+        raise HTTPException(status_code=404)
+
+    return app
+
+
+@pytest.mark.anyio()
+@pytest.mark.parametrize(
+    ("path", "status_code", "commits", "rollbacks"),
+    (("/ok", 200, 2, 0), ("/missing", 404, 1, 1)),
+)
+async def test_unit_of_work_middleware(
+    application, path, status_code, commits, rollbacks
+):
+    with mock.patch.object(
+        unit_of_work.UnitOfWork,
+        "commit",
+        autospec=True,
+    ) as commit, mock.patch.object(
+        unit_of_work.UnitOfWork,
+        "rollback",
+        autospec=True,
+    ) as rollback:
+        async with AsyncClient(app=application, base_url="http://test") as ac:
+            response = await ac.get(path)
+
+    assert response.status_code == status_code
+    assert commit.await_count == commits
+    assert rollback.await_count == rollbacks
+    if status_code == 200:
+        assert response.json() == {"current": True}
+
+
+@pytest.fixture()
+def cached_application():
+    app = FastAPI()
+    app.state.cache = ResponseCache(max_bytes=1024 * 1024)
+    app.state.source = EntityCache(name="test")
+    app.state.calls = 0
+    app.add_middleware(
+        middleware.ResponseCacheMiddleware,
+        cache=app.state.cache,
+    )
+
+    @app.get("/cached")
+    async def cached(request: Request, response: Response):
+        app.state.calls += 1
+        cache_response(request, app.state.source)
+        response.headers["ETag"] = '"test"'
+        return {"calls": app.state.calls}
+
+    @app.get("/cookie")
+    async def cookie(request: Request, response: Response):
+        app.state.calls += 1
+        cache_response(request, app.state.source)
+        response.set_cookie("test", "test")
+        return {"calls": app.state.calls}
+
+    @app.get("/plain")
+    async def plain():
+        app.state.calls += 1
+        return {"calls": app.state.calls}
+
+    return app
+
+
+@pytest.mark.anyio()
+async def test_response_cache_middleware(cached_application, get_fake_jwt):
+    headers = {"Authorization": f"Bearer {get_fake_jwt}"}
+    async with AsyncClient(
+        app=cached_application,
+        base_url="http://test",
+    ) as ac:
+        first = await ac.get("/cached", headers=headers)
+        second = await ac.get("/cached", headers=headers)
+        not_modified = await ac.get(
+            "/cached",
+            headers={**headers, "If-None-Match": '"test"'},
+        )
+        anonymous = await ac.get("/cached")
+        cached_application.state.source.invalidate()
+        invalidated = await ac.get("/cached", headers=headers)
+
+    assert first.json() == second.json() == {"calls": 1}
+    assert second.headers["ETag"] == '"test"'
+    assert not_modified.status_code == 304
+    assert anonymous.json() == {"calls": 2}
+    assert invalidated.json() == {"calls": 3}
+
+
+@pytest.mark.anyio()
+@pytest.mark.parametrize(("path"), ("/plain", "/cookie"))
+async def test_response_cache_middleware_skips(
+    cached_application,
+    get_fake_jwt,
+    path,
+):
+    headers = {"Authorization": f"Bearer {get_fake_jwt}"}
+    async with AsyncClient(
+        app=cached_application,
+        base_url="http://test",
+    ) as ac:
+        await ac.get(path, headers=headers)
+        response = await ac.get(path, headers=headers)
+
+    assert response.json() == {"calls": 2}
+    assert cached_application.state.cache.statistics()["entries"] == 0
+
+
+@pytest.mark.parametrize(
+    ("authorization", "expected"),
+    (
+        (None, False),
+        ("Basic test", False),
+        ("Bearer not-a-token", False),
+        ("Bearer {token}", True),
+    ),
+)
+def test_response_cache_middleware_authorized(
+    get_fake_jwt,
+    authorization,
+    expected,
+):
+    instance = middleware.ResponseCacheMiddleware(mock.Mock())
+    headers = (
+        {}
+        if authorization is None
+        else {"authorization": authorization.format(token=get_fake_jwt)}
+    )
+
+    assert instance.authorized(mock.Mock(headers=headers)) is expected
+
+
+@pytest.mark.anyio()
+async def test_response_cache_middleware_incomplete(get_fake_jwt):
+    cache = ResponseCache()
+    source = EntityCache(name="test")
+
+    async def application(scope, receive, send):
+        scope[SCOPE_KEY] = (source, 0)
+        await send(
+            {"type": "http.response.start", "status": 200, "headers": []},
+        )
+        await send(
+            {"type": "http.response.body", "body": b"[", "more_body": True},
+        )
+
+    instance = middleware.ResponseCacheMiddleware(application, cache=cache)
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/stream",
+        "query_string": b"",
+        "headers": [(b"authorization", f"Bearer {get_fake_jwt}".encode())],
+    }
+    await instance(scope, mock.AsyncMock(), mock.AsyncMock())
+
+    assert cache.statistics()["entries"] == 0
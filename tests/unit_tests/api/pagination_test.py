@@ -0,0 +1,72 @@
+import base64
+from collections import namedtuple
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+
+from carnage.api import pagination
+
+Row = namedtuple("Row", ("id", "created_at"))
+
+
+def test_cursor_round_trip():
+    row = Row(id=uuid4(), created_at=datetime.now())
+    cursor = pagination.encode_cursor(row)
+
+    assert pagination.decode_cursor(cursor) == (row.created_at, row.id)
+
+
+@pytest.mark.parametrize(
+    ("cursor"),
+    (
+        ("not-a-cursor"),
+        ("WzEsMl0="),
+        ("WyJ0ZXN0Il0="),
+    ),
+)
+def test_decode_invalid_cursor(cursor):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        pagination.decode_cursor(cursor)
+
+
+def test_page_parameters():
+    row = Row(id=uuid4(), created_at=datetime.now())
+    page = pagination.PageParameters(
+        limit=10,
+        after=pagination.encode_cursor(row),
+    )
+
+    assert page.limit == 10
+    assert page.after == (row.created_at, row.id)
+
+
+def test_page_parameters_invalid_cursor():
+    with pytest.raises(HTTPException) as e:
+        pagination.PageParameters(limit=10, after="not-a-cursor")
+
+    assert e.value.status_code == 400
+
+
+def test_sorted_cursor_round_trip():
+    SortedRow = namedtuple("SortedRow", ("name", "updated_at", "id"))
+    row = SortedRow(name="test", updated_at=datetime.now(), id=uuid4())
+    cursor = pagination.encode_cursor(row, SortedRow._fields)
+
+    assert pagination.decode_cursor(cursor) == tuple(row)
+
+
+@pytest.mark.parametrize(
+    ("values"),
+    (
+        ('[{"unknown": "test"}, {"uuid": "%s"}]' % uuid4()),
+        ('["test", "other"]'),
+        ("[]"),
+    ),
+)
+def test_decode_invalid_sorted_cursor(values):
+    cursor = base64.urlsafe_b64encode(values.encode("utf-8")).decode("ascii")
+
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        pagination.decode_cursor(cursor)
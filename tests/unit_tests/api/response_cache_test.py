@@ -0,0 +1,108 @@
+from unittest import mock
+
+import pytest
+
+from carnage.api import response_cache
+from carnage.database.cache import EntityCache
+
+HEADERS = [(b"etag", b'"test"')]
+
+
+def make_scope(path="/test", query=b"", encoding=b"gzip, br"):
+    return {
+        "type": "http",
+        "path": path,
+        "query_string": query,
+        "headers": [(b"accept-encoding", encoding)],
+    }
+
+
+def test_key():
+    key = response_cache.ResponseCache.key
+
+    assert key(make_scope()) == key(make_scope(encoding=b"GZIP"))
+    assert key(make_scope()) != key(make_scope(encoding=b"identity"))
+    assert key(make_scope()) != key(make_scope(query=b"limit=1"))
+
+
+@pytest.mark.parametrize("enabled", (True, False))
+def test_cache_response(enabled):
+    source = EntityCache(name="test")
+    source.invalidate()
+    request = mock.Mock(scope={})
+
+    with mock.patch.object(
+        response_cache.response_cache,
+        "enabled",
+        enabled,
+    ), mock.patch.object(response_cache, "bind_writer") as bind_writer:
+        response_cache.cache_response(request, source)
+
+    assert request.scope[response_cache.SCOPE_KEY] == (source, 1)
+    assert bind_writer.called is enabled
+
+
+def test_get_and_set():
+    cache = response_cache.ResponseCache(max_bytes=1024)
+    source = EntityCache(name="test")
+    cache.set("key", 200, HEADERS, b"body", (source, 0))
+
+    entry = cache.get("key")
+    assert entry.body == b"body"
+    assert entry.etag == '"test"'
+    assert cache.get("other") is None
+    assert cache.statistics() == {
+        "entries": 1,
+        "bytes": entry.size,
+        "hits": 1,
+        "misses": 1,
+        "evictions": 0,
+        "stale": 0,
+    }
+
+
+def test_invalidated_source_is_stale():
+    cache = response_cache.ResponseCache(max_bytes=1024)
+    source = EntityCache(name="test")
+    cache.set("key", 200, HEADERS, b"body", (source, 0))
+    source.evict(["26609c62-5270-11ed-8d79-641c67e34d72"])
+
+    assert cache.get("key") is None
+    assert cache.statistics()["stale"] == 1
+    assert cache.size == 0
+
+
+def test_expired_is_stale():
+    cache = response_cache.ResponseCache(max_bytes=1024, ttl=-1)
+    source = EntityCache(name="test")
+    cache.set("key", 200, HEADERS, b"body", (source, 0))
+
+    assert cache.get("key") is None
+
+
+def test_bounded_by_size():
+    cache = response_cache.ResponseCache(max_bytes=800)
+    source = EntityCache(name="test")
+    for key in range(10):
+        cache.set(key, 200, [], b"x" * 100, (source, 0))
+
+    assert cache.size <= 800
+    assert cache.get(0) is None
+    assert cache.get(9) is not None
+    assert cache.statistics()["evictions"] == 2
+
+    cache.set("large", 200, [], b"x" * 101, (source, 0))
+    assert cache.get("large") is None
+
+
+def test_disabled_and_clear():
+    source = EntityCache(name="test")
+    cache = response_cache.ResponseCache(enabled=False)
+    cache.set("key", 200, [], b"body", (source, 0))
+    assert cache.get("key") is None
+
+    cache = response_cache.ResponseCache()
+    cache.set("key", 200, [], b"body", (source, 0))
+    cache.clear()
+    assert cache.get("key") is None
+    assert cache.size == 0
@@ -36,8 +36,8 @@
 async def test_get(output, application_instance, get_fake_jwt):
     with mock.patch.object(
         route.repository,
-        "select",
-        lambda: output,
+        "async_select",
+        mock.AsyncMock(return_value=output),
     ):
         async with AsyncClient(
             app=application_instance,
@@ -71,8 +71,8 @@ async def test_get(output, application_instance, get_fake_jwt):
 async def test_get_by_id(output, application_instance, get_fake_jwt):
     with mock.patch.object(
         route.repository,
-        "select_by_id",
-        lambda identifier: output,
+        "async_select_by_id",
+        mock.AsyncMock(return_value=output),
     ):
         async with AsyncClient(
             app=application_instance,
@@ -111,8 +111,8 @@ async def test_post(application_instance, get_fake_jwt):
 async def test_put(data, application_instance, get_fake_jwt):
     with mock.patch.object(
         route.repository,
-        "update",
-        lambda values, identifier: None,
+        "async_update",
+        mock.AsyncMock(),
     ):
         async with AsyncClient(
             app=application_instance,
@@ -130,8 +130,8 @@ async def test_put(data, application_instance, get_fake_jwt):
 async def test_delete(application_instance, get_fake_jwt):
     with mock.patch.object(
         route.repository,
-        "delete",
-        lambda identifier: None,
+        "async_delete",
+        mock.AsyncMock(),
     ):
         async with AsyncClient(
             app=application_instance,
@@ -81,7 +81,8 @@ async def test_github_auth(application_instance):
         mock.AsyncMock(return_value={"access_token": "test"}),
     ), mock.patch.object(
         authentication.github.route.account_repository,
-        "select_by_username",
+        "async_upsert",
+        mock.AsyncMock(return_value=[]),
     ), mock.patch.object(
         authentication.github.httpx,
         "get",
@@ -104,12 +105,8 @@ async def test_github_auth_no_user_found(application_instance):
         mock.AsyncMock(return_value={"access_token": "test"}),
     ), mock.patch.object(
         authentication.github.route.account_repository,
-        "select_by_username",
-        lambda username: False,
-    ), mock.patch.object(
-        authentication.github.route.account_repository,
-        "insert",
-        lambda data: None,
+        "async_upsert",
+        mock.AsyncMock(return_value=[mock.Mock()]),
     ), mock.patch.object(
         authentication.github.httpx,
         "get",
@@ -132,7 +129,8 @@ async def test_github_auth_no_primary_email(application_instance):
         mock.AsyncMock(return_value={"access_token": "test"}),
     ), mock.patch.object(
         authentication.github.route.account_repository,
-        "select_by_username",
+        "async_upsert",
+        mock.AsyncMock(return_value=[]),
     ), mock.patch.object(
         authentication.github.httpx,
         "get",
@@ -155,7 +153,8 @@ async def test_github_auth_no_primary_email_at_all(application_instance):
         mock.AsyncMock(return_value={"access_token": "test"}),
     ), mock.patch.object(
         authentication.github.route.account_repository,
-        "select_by_username",
+        "async_upsert",
+        mock.AsyncMock(return_value=[]),
     ), mock.patch.object(
         authentication.github.httpx,
         "get",
@@ -52,7 +52,8 @@ async def test_gitlab_auth(application_instance):
         mock.AsyncMock(return_value={"access_token": "test"}),
     ), mock.patch.object(
         authentication.gitlab.route.account_repository,
-        "select_by_username",
+        "async_upsert",
+        mock.AsyncMock(return_value=[]),
     ), mock.patch.object(
         authentication.gitlab.httpx,
         "get",
@@ -75,12 +76,8 @@ async def test_gitlab_auth_no_user_found(application_instance):
         mock.AsyncMock(return_value={"access_token": "test"}),
     ), mock.patch.object(
         authentication.gitlab.route.account_repository,
-        "select_by_username",
-        lambda username: False,
-    ), mock.patch.object(
-        authentication.gitlab.route.account_repository,
-        "insert",
-        lambda data: None,
+        "async_upsert",
+        mock.AsyncMock(return_value=[mock.Mock()]),
     ), mock.patch.object(
         authentication.gitlab.httpx,
         "get",
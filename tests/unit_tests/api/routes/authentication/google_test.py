@@ -32,7 +32,8 @@ async def test_google_auth(application_instance):
         mock.AsyncMock(return_value={"userinfo": {"email": "test"}}),
     ), mock.patch.object(
         authentication.google.route.account_repository,
-        "select_by_username",
+        "async_upsert",
+        mock.AsyncMock(return_value=[]),
     ):
         async with AsyncClient(
             app=application_instance,
@@ -51,12 +52,8 @@ async def test_google_auth_no_user_found(application_instance):
         mock.AsyncMock(return_value={"userinfo": {"email": "test"}}),
     ), mock.patch.object(
         authentication.google.route.account_repository,
-        "select_by_username",
-        lambda username: False,
-    ), mock.patch.object(
-        authentication.google.route.account_repository,
-        "insert",
-        lambda data: None,
+        "async_upsert",
+        mock.AsyncMock(return_value=[mock.Mock()]),
     ):
         async with AsyncClient(
             app=application_instance,
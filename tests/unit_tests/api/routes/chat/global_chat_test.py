@@ -5,25 +5,38 @@
 
 from carnage.api.routes.chat import global_chat
 
-AccountModelOutput = namedtuple("AccountModelOutput", ("secret_key"))
+AccountModelOutput = namedtuple("AccountModelOutput", ("id", "secret_key"))
+ACCOUNT_ID = "9a22bdfa-6adb-11ed-9ae1-641c67e34d72"
 
 
 def test_websocket(database_session_mock, application_instance, get_fake_jwt):
     # Random fernet key generated for testing purposes.
-    output = AccountModelOutput("_UCCQZGUSHZMa5P5bmdYgo7T-k1p25o5Ejl_qMu1ONg=")
+    output = AccountModelOutput(
+        ACCOUNT_ID,
+        "_UCCQZGUSHZMa5P5bmdYgo7T-k1p25o5Ejl_qMu1ONg=",
+    )
     client = TestClient(application_instance)
     with mock.patch.object(
         global_chat.route.account_repository,
-        "select_by_id",
-        lambda identifier: [output],
-    ), mock.patch.object(global_chat.route, "repository"):
+        "async_select_by_ids",
+        mock.AsyncMock(return_value=[output]),
+    ) as select, mock.patch.object(
+        global_chat.route.repository,
+        "async_insert",
+    ) as insert:
         with client.websocket_connect(
-            f"/api/v1/chat/global/9a22bdfa-6adb-11ed?token={get_fake_jwt}",
+            f"/api/v1/chat/global/{ACCOUNT_ID}?token={get_fake_jwt}",
         ) as websocket:
-            websocket.send_json(
-                {
-                    "message": "test",
-                    "channel": "dd4dc11e-6adc-11ed-9ae1-641c67e34d72",
-                },
-                mode="text",
-            )
+            for message in ("first", "second"):
+                websocket.send_json(
+                    {
+                        "message": message,
+                        "channel": "dd4dc11e-6adc-11ed-9ae1-641c67e34d72",
+                    },
+                    mode="text",
+                )
+                websocket.receive_text()
+
+    # The account is loaded once for the whole connection.
+    select.assert_awaited_once_with([ACCOUNT_ID])
+    assert insert.await_count == 2
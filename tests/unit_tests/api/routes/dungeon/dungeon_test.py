@@ -38,8 +38,8 @@
 async def test_get(output, application_instance, get_fake_jwt):
     with mock.patch.object(
         route.repository,
-        "select",
-        lambda: output,
+        "async_select",
+        mock.AsyncMock(return_value=output),
     ):
         async with AsyncClient(
             app=application_instance,
@@ -74,8 +74,8 @@ async def test_get(output, application_instance, get_fake_jwt):
 async def test_get_by_id(output, application_instance, get_fake_jwt):
     with mock.patch.object(
         route.repository,
-        "select_by_id",
-        lambda identifier: output,
+        "async_select_by_id",
+        mock.AsyncMock(return_value=output),
     ):
         async with AsyncClient(
             app=application_instance,
@@ -103,8 +103,8 @@ async def test_get_by_id(output, application_instance, get_fake_jwt):
 async def test_post(data, application_instance, get_fake_jwt):
     with mock.patch.object(
         route.repository,
-        "insert",
-        lambda values: None,
+        "async_insert",
+        mock.AsyncMock(),
     ):
         async with AsyncClient(
             app=application_instance,
@@ -131,8 +131,8 @@ async def test_post(data, application_instance, get_fake_jwt):
 async def test_put(data, application_instance, get_fake_jwt):
     with mock.patch.object(
         route.repository,
-        "update",
-        lambda values, identifier: None,
+        "async_update",
+        mock.AsyncMock(),
     ):
         async with AsyncClient(
             app=application_instance,
@@ -150,8 +150,8 @@ async def test_put(data, application_instance, get_fake_jwt):
 async def test_delete(application_instance, get_fake_jwt):
     with mock.patch.object(
         route.repository,
-        "delete",
-        lambda identifier: None,
+        "async_delete",
+        mock.AsyncMock(),
     ):
         async with AsyncClient(
             app=application_instance,
@@ -160,3 +160,51 @@ async def test_delete(application_instance, get_fake_jwt):
         ) as ac:
             response = await ac.delete("/26609c62-5270-11ed-8d79-641c67e34d72")
         assert response.status_code == 204
+
+
+@pytest.mark.anyio()
+async def test_get_excludes_plot(application_instance, get_fake_jwt):
+    output = [
+        DungeonOutput(
+            id=uuid4(),
+            created_at=datetime.now(),
+            updated_at=datetime.now(),
+            deleted_at=None,
+            name="test_name",
+            description="test_description",
+            dungeon_schema_id=uuid4(),
+        ),
+    ]
+    with mock.patch.object(
+        route.repository,
+        "async_select",
+        mock.AsyncMock(return_value=output),
+    ) as select:
+        async with AsyncClient(
+            app=application_instance,
+            base_url=BASE_URL,
+            headers={"Authorization": f"Bearer {get_fake_jwt}"},
+        ) as ac:
+            response = await ac.get("/")
+        assert response.status_code == 200
+        assert "plot" not in response.json()[0]
+        assert "plot" not in select.await_args.kwargs["columns"]
+
+
+@pytest.mark.anyio()
+async def test_get_include_plot(application_instance, get_fake_jwt):
+    with mock.patch.object(
+        route.repository,
+        "async_select",
+        mock.AsyncMock(return_value=[]),
+    ) as select:
+        async with AsyncClient(
+            app=application_instance,
+            base_url=BASE_URL,
+            headers={"Authorization": f"Bearer {get_fake_jwt}"},
+        ) as ac:
+            response = await ac.get("/", params={"include": "plot"})
+            invalid = await ac.get("/", params={"include": "name"})
+        assert response.status_code == 200
+        assert "plot" in select.await_args.kwargs["columns"]
+        assert invalid.status_code == 400
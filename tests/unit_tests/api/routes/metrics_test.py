@@ -0,0 +1,82 @@
+import pytest
+from httpx import AsyncClient
+
+from tests.unit_tests.conftest import APPLICATION_PREFIX
+
+BASE_URL = f"http://test/{APPLICATION_PREFIX}/metrics"
+
+
+@pytest.mark.anyio()
+async def test_pool(application_instance, get_fake_jwt):
+    async with AsyncClient(
+        app=application_instance,
+        base_url=BASE_URL,
+        headers={"Authorization": f"Bearer {get_fake_jwt}"},
+    ) as ac:
+        response = await ac.get("/pool")
+
+    assert response.status_code == 200
+    assert set(response.json()) == {"sync", "async", "readers"}
+    assert "checked_out" in response.json()["sync"]
+    assert "max_wait_time" in response.json()["async"]
+
+
+@pytest.mark.anyio()
+async def test_pool_unauthorized(application_instance):
+    async with AsyncClient(app=application_instance, base_url=BASE_URL) as ac:
+        response = await ac.get("/pool")
+
+    assert response.status_code == 403
+
+
+@pytest.mark.anyio()
+async def test_cache(application_instance, get_fake_jwt):
+    async with AsyncClient(
+        app=application_instance,
+        base_url=BASE_URL,
+        headers={"Authorization": f"Bearer {get_fake_jwt}"},
+    ) as ac:
+        response = await ac.get("/cache")
+
+    assert response.status_code == 200
+    assert "hits" in response.json()["accounts"]
+
+
+@pytest.mark.anyio()
+async def test_responses(application_instance, get_fake_jwt):
+    async with AsyncClient(
+        app=application_instance,
+        base_url=BASE_URL,
+        headers={"Authorization": f"Bearer {get_fake_jwt}"},
+    ) as ac:
+        response = await ac.get("/responses")
+
+    assert response.status_code == 200
+    assert response.json()["entries"] == 0
+
+
+@pytest.mark.anyio()
+@pytest.mark.parametrize("path", ("/queries", "/slow-queries"))
+async def test_queries(application_instance, get_fake_jwt, path):
+    async with AsyncClient(
+        app=application_instance,
+        base_url=BASE_URL,
+        headers={"Authorization": f"Bearer {get_fake_jwt}"},
+    ) as ac:
+        response = await ac.get(path)
+
+    assert response.status_code == 200
+    assert isinstance(response.json(), list)
+
+
+@pytest.mark.anyio()
+async def test_catalog(application_instance, get_fake_jwt):
+    async with AsyncClient(
+        app=application_instance,
+        base_url=BASE_URL,
+        headers={"Authorization": f"Bearer {get_fake_jwt}"},
+    ) as ac:
+        response = await ac.get("/catalog")
+
+    assert response.status_code == 200
+    assert set(response.json()) == {"version", "tables"}
@@ -1,3 +1,4 @@
+import json
 from collections import namedtuple
 from datetime import datetime
 from unittest import mock
@@ -6,6 +7,8 @@
 import pytest
 from httpx import AsyncClient
 
+from carnage.api.pagination import encode_cursor
+from carnage.api.response_cache import response_cache
 from carnage.api.routes.player import route
 from tests.unit_tests.conftest import APPLICATION_PREFIX, DummySchemaFields
 
@@ -45,8 +48,8 @@
 async def test_get(output, application_instance, get_fake_jwt):
     with mock.patch.object(
         route.repository,
-        "select",
-        lambda: output,
+        "async_select",
+        mock.AsyncMock(return_value=output),
     ):
         async with AsyncClient(
             app=application_instance,
@@ -82,8 +85,8 @@ async def test_get(output, application_instance, get_fake_jwt):
 async def test_get_by_id(output, application_instance, get_fake_jwt):
     with mock.patch.object(
         route.repository,
-        "select_by_id",
-        lambda identifier: output,
+        "async_select_by_id",
+        mock.AsyncMock(return_value=output),
     ):
         async with AsyncClient(
             app=application_instance,
@@ -112,8 +115,8 @@ async def test_get_by_id(output, application_instance, get_fake_jwt):
 async def test_post(data, application_instance, get_fake_jwt):
     with mock.patch.object(
         route.repository,
-        "insert",
-        lambda values: None,
+        "async_insert",
+        mock.AsyncMock(),
     ):
         async with AsyncClient(
             app=application_instance,
@@ -141,8 +144,8 @@ async def test_post(data, application_instance, get_fake_jwt):
 async def test_put(data, application_instance, get_fake_jwt):
     with mock.patch.object(
         route.repository,
-        "update",
-        lambda values, identifier: None,
+        "async_update",
+        mock.AsyncMock(),
     ):
         async with AsyncClient(
             app=application_instance,
@@ -156,12 +159,97 @@ async def test_put(data, application_instance, get_fake_jwt):
     assert response.status_code == 204
 
 
+@pytest.mark.anyio()
+async def test_put_many(application_instance, get_fake_jwt):
+    identifier = uuid4()
+    data = {
+        "name": "test_name",
+        "description": "test_description",
+        "dungeon_id": str(uuid4()),
+        "vocation_type_id": str(uuid4()),
+    }
+    with mock.patch.object(
+        route.repository,
+        "async_update_many",
+        mock.AsyncMock(return_value=[identifier]),
+    ) as update_many:
+        async with AsyncClient(
+            app=application_instance,
+            base_url=BASE_URL,
+            headers={"Authorization": f"Bearer {get_fake_jwt}"},
+        ) as ac:
+            response = await ac.patch("/", json={str(identifier): data})
+
+    assert response.status_code == 200
+    assert response.json() == [str(identifier)]
+    (values,) = update_many.await_args.kwargs["values"].values()
+    assert values["name"] == "test_name"
+
+
+@pytest.mark.anyio()
+@pytest.mark.parametrize(
+    ("method", "path", "repository_method"),
+    (
+        ("DELETE", "/", "async_delete_many"),
+        ("POST", "/restore", "async_restore_many"),
+    ),
+)
+async def test_delete_and_restore_many(
+    method, path, repository_method, application_instance, get_fake_jwt
+):
+    identifiers = [uuid4(), uuid4()]
+    with mock.patch.object(
+        route.repository,
+        repository_method,
+        mock.AsyncMock(return_value=identifiers[:1]),
+    ) as repository_mock:
+        async with AsyncClient(
+            app=application_instance,
+            base_url=BASE_URL,
+            headers={"Authorization": f"Bearer {get_fake_jwt}"},
+        ) as ac:
+            response = await ac.request(
+                method,
+                path,
+                json=[str(identifier) for identifier in identifiers],
+            )
+
+    assert response.status_code == 200
+    assert response.json() == [str(identifiers[0])]
+    repository_mock.assert_awaited_once_with(identifiers=identifiers)
+
+
+@pytest.mark.anyio()
+async def test_delete_many_too_large(application_instance, get_fake_jwt):
+    with mock.patch(
+        "carnage.api.routes.base.CARNAGE_MAX_BULK_SIZE",
+        1,
+    ), mock.patch.object(
+        route.repository,
+        "async_delete_many",
+        mock.AsyncMock(),
+    ) as delete_many:
+        async with AsyncClient(
+            app=application_instance,
+            base_url=BASE_URL,
+            headers={"Authorization": f"Bearer {get_fake_jwt}"},
+        ) as ac:
+            response = await ac.request(
+                "DELETE",
+                "/",
+                json=[str(uuid4()), str(uuid4())],
+            )
+
+    assert response.status_code == 400
+    delete_many.assert_not_awaited()
+
+
 @pytest.mark.anyio()
 async def test_delete(application_instance, get_fake_jwt):
     with mock.patch.object(
         route.repository,
-        "delete",
-        lambda identifier: None,
+        "async_delete",
+        mock.AsyncMock(),
     ):
         async with AsyncClient(
             app=application_instance,
@@ -170,3 +258,388 @@ async def test_delete(application_instance, get_fake_jwt):
         ) as ac:
             response = await ac.delete("/26609c62-5270-11ed-8d79-641c67e34d72")
         assert response.status_code == 204
+
+
+@pytest.mark.anyio()
+async def test_get_next_cursor(application_instance, get_fake_jwt):
+    output = [
+        PlayerOutput(
+            id=uuid4(),
+            created_at=datetime.now(),
+            updated_at=datetime.now(),
+            deleted_at=None,
+            name="test_name",
+            description="test_description",
+            dungeon_id=uuid4(),
+            vocation_id=uuid4(),
+        ),
+    ]
+    with mock.patch.object(
+        route.repository,
+        "async_select",
+        mock.AsyncMock(return_value=output),
+    ) as select:
+        async with AsyncClient(
+            app=application_instance,
+            base_url=BASE_URL,
+            headers={"Authorization": f"Bearer {get_fake_jwt}"},
+        ) as ac:
+            response = await ac.get("/", params={"limit": 1})
+            cursor = response.headers["X-Next-Cursor"]
+            response = await ac.get("/", params={"limit": 2, "after": cursor})
+        assert response.status_code == 200
+        assert "X-Next-Cursor" not in response.headers
+        assert select.await_args.kwargs["limit"] == 2
+        assert select.await_args.kwargs["after"] == (
+            output[0].created_at,
+            output[0].id,
+        )
+
+
+@pytest.mark.anyio()
+@pytest.mark.parametrize(
+    ("params"),
+    (
+        ({"limit": 0}),
+        ({"after": "not-a-cursor"}),
+    ),
+)
+async def test_get_invalid_page(params, application_instance, get_fake_jwt):
+    async with AsyncClient(
+        app=application_instance,
+        base_url=BASE_URL,
+        headers={"Authorization": f"Bearer {get_fake_jwt}"},
+    ) as ac:
+        response = await ac.get("/", params=params)
+    assert response.status_code in (400, 422)
+
+
+@pytest.mark.anyio()
+async def test_get_updated_since(application_instance, get_fake_jwt):
+    select = mock.AsyncMock(return_value=[])
+    with mock.patch.object(route.repository, "async_select", select):
+        async with AsyncClient(
+            app=application_instance,
+            base_url=BASE_URL,
+            headers={"Authorization": f"Bearer {get_fake_jwt}"},
+        ) as ac:
+            response = await ac.get(
+                "/",
+                params={"updated_since": "2026-10-18T12:00:00"},
+            )
+
+    assert response.status_code == 200
+    assert select.await_args.kwargs["updated_since"] == datetime(
+        2026, 10, 18, 12
+    )
+
+
+@pytest.mark.anyio()
+async def test_get_stream_json(application_instance, get_fake_jwt):
+    output = [
+        PlayerOutput(
+            id=uuid4(),
+            created_at=datetime.now(),
+            updated_at=datetime.now(),
+            deleted_at=None,
+            name=f"test_name_{index}",
+            description="test_description",
+            dungeon_id=uuid4(),
+            vocation_id=uuid4(),
+        )
+        for index in range(3)
+    ]
+
+    async def stream(**query):
+        for item in output:
+            yield item
+
+    with mock.patch.object(route.repository, "async_stream", stream):
+        with mock.patch.object(route, "stream_chunk_size", 2):
+            async with AsyncClient(
+                app=application_instance,
+                base_url=BASE_URL,
+                headers={"Authorization": f"Bearer {get_fake_jwt}"},
+            ) as ac:
+                response = await ac.get("/", params={"stream": "json"})
+    assert response.status_code == 200
+    assert "ETag" not in response.headers
+    assert [item["name"] for item in response.json()] == [
+        "test_name_0",
+        "test_name_1",
+        "test_name_2",
+    ]
+
+
+@pytest.mark.anyio()
+async def test_get_stream_ndjson(application_instance, get_fake_jwt):
+    output = [
+        PlayerOutput(
+            id=uuid4(),
+            created_at=datetime.now(),
+            updated_at=datetime.now(),
+            deleted_at=None,
+            name=f"test_name_{index}",
+            description="test_description",
+            dungeon_id=uuid4(),
+            vocation_id=uuid4(),
+        )
+        for index in range(3)
+    ]
+
+    async def stream(**query):
+        for item in output:
+            yield item
+
+    with mock.patch.object(route.repository, "async_stream", stream):
+        with mock.patch.object(route, "stream_chunk_size", 2):
+            async with AsyncClient(
+                app=application_instance,
+                base_url=BASE_URL,
+                headers={"Authorization": f"Bearer {get_fake_jwt}"},
+            ) as ac:
+                response = await ac.get(
+                    "/",
+                    params={"stream": "ndjson", "fields": "name"},
+                )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert [json.loads(line) for line in response.text.splitlines()] == [
+        {"name": "test_name_0"},
+        {"name": "test_name_1"},
+        {"name": "test_name_2"},
+    ]
+
+
+@pytest.mark.anyio()
+async def test_stream_ndjson_closes_cursor():
+    closed = mock.Mock()
+
+    async def stream(**query):
+        try:
+            for index in range(10):
+                yield PlayerOutput(*([None] * 4), f"test_{index}", *[None] * 3)
+        finally:
+            closed()
+
+    with mock.patch.object(route.repository, "async_stream", stream):
+        with mock.patch.object(route, "stream_chunk_size", 2):
+            chunks = route.stream_ndjson({}, ("name",))
+            assert await chunks.__anext__() == b""
+            assert await chunks.__anext__() == (
+                b'{"name":"test_0"}\n{"name":"test_1"}\n'
+            )
+            await chunks.aclose()
+
+    closed.assert_called_once()
+
+
+@pytest.mark.anyio()
+async def test_get_filter_and_sort(application_instance, get_fake_jwt):
+    dungeon_id = uuid4()
+    output = [
+        PlayerOutput(
+            id=uuid4(),
+            created_at=datetime.now(),
+            updated_at=datetime.now(),
+            deleted_at=None,
+            name="test_name",
+            description="test_description",
+            dungeon_id=dungeon_id,
+            vocation_id=uuid4(),
+        ),
+    ]
+    select = mock.AsyncMock(return_value=output)
+    with mock.patch.object(route.repository, "async_select", select):
+        async with AsyncClient(
+            app=application_instance,
+            base_url=BASE_URL,
+            headers={"Authorization": f"Bearer {get_fake_jwt}"},
+        ) as ac:
+            response = await ac.get(
+                "/",
+                params={
+                    "filter[dungeon_id]": str(dungeon_id),
+                    "sort": "-name",
+                    "limit": 1,
+                },
+            )
+            cursor = response.headers["X-Next-Cursor"]
+            response = await ac.get(
+                "/",
+                params={"sort": "-name", "after": cursor},
+            )
+
+    assert response.status_code == 200
+    assert select.await_args_list[0].kwargs["filters"] == {
+        "dungeon_id": dungeon_id,
+    }
+    assert select.await_args.kwargs["filters"] is None
+    assert select.await_args.kwargs["sort"] == ("-name",)
+    assert select.await_args.kwargs["after"] == ("test_name", output[0].id)
+
+
+def test_list_filters_are_hashable():
+    identifiers = (uuid4(), uuid4())
+    filters = route.list_filters(
+        {"dungeon_id": [str(identifier) for identifier in identifiers]},
+    )
+
+    assert filters == {"dungeon_id": identifiers}
+    assert route.list_filters({}) is None
+
+
+@pytest.mark.anyio()
+async def test_get_fields(application_instance, get_fake_jwt):
+    Row = namedtuple("Row", ("id", "created_at", "name"))
+    output = [Row(id=uuid4(), created_at=datetime.now(), name="test_name")]
+    select = mock.AsyncMock(return_value=output)
+    with mock.patch.object(route.repository, "async_select", select):
+        async with AsyncClient(
+            app=application_instance,
+            base_url=BASE_URL,
+            headers={"Authorization": f"Bearer {get_fake_jwt}"},
+        ) as ac:
+            response = await ac.get(
+                "/",
+                params={"fields": "id,name", "limit": 1},
+            )
+
+    assert response.status_code == 200
+    assert response.json() == [{"id": str(output[0].id), "name": "test_name"}]
+    assert "X-Next-Cursor" in response.headers
+    assert set(select.await_args.kwargs["columns"]) == {
+        "id",
+        "created_at",
+        "name",
+    }
+
+
+@pytest.mark.anyio()
+@pytest.mark.parametrize(
+    ("params"),
+    (
+        ({"filter[description]": "test"}),
+        ({"filter[dungeon_id]": "not-an-uuid"}),
+        ({"sort": "description"}),
+        ({"sort": "name,-name"}),
+        ({"fields": "id,unknown"}),
+        (
+            {
+                "sort": "name",
+                "after": encode_cursor(
+                    DummySchemaFields(uuid4(), datetime.now(), None, None),
+                ),
+            }
+        ),
+    ),
+)
+async def test_get_invalid_listing(
+    params,
+    application_instance,
+    get_fake_jwt,
+):
+    select = mock.AsyncMock(return_value=[])
+    with mock.patch.object(route.repository, "async_select", select):
+        async with AsyncClient(
+            app=application_instance,
+            base_url=BASE_URL,
+            headers={"Authorization": f"Bearer {get_fake_jwt}"},
+        ) as ac:
+            response = await ac.get("/", params=params)
+
+    assert response.status_code == 400
+    select.assert_not_awaited()
+
+
+@pytest.mark.anyio()
+async def test_get_not_modified(application_instance, get_fake_jwt):
+    Row = namedtuple("Row", ("id", "created_at", "name"))
+    select = mock.AsyncMock(return_value=[])
+    with mock.patch.object(route.repository, "async_select", select):
+        async with AsyncClient(
+            app=application_instance,
+            base_url=BASE_URL,
+            headers={"Authorization": f"Bearer {get_fake_jwt}"},
+        ) as ac:
+            response = await ac.get("/", params={"limit": 5})
+            etag = response.headers["ETag"]
+            not_modified = await ac.get(
+                "/",
+                params={"limit": 5},
+                headers={"If-None-Match": etag},
+            )
+            # The rows changed behind the back of this process, once the
+            # cached response is gone the tag follows the content.
+            response_cache.clear()
+            select.return_value = [
+                Row(id=uuid4(), created_at=datetime.now(), name="test"),
+            ]
+            changed = await ac.get(
+                "/",
+                params={"limit": 5},
+                headers={"If-None-Match": etag},
+            )
+
+    assert response.status_code == 200
+    assert not_modified.status_code == 304
+    assert not_modified.headers["ETag"] == etag
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert select.await_count == 2
+
+
+@pytest.mark.anyio()
+async def test_get_by_id_not_modified(application_instance, get_fake_jwt):
+    output = (
+        PlayerOutput(
+            id=uuid4(),
+            created_at=datetime.now(),
+            updated_at=datetime.now(),
+            deleted_at=None,
+            name="test_name",
+            description="test_description",
+            dungeon_id=uuid4(),
+            vocation_id=uuid4(),
+        ),
+    )
+    with mock.patch.object(
+        route.repository,
+        "async_select_by_id",
+        mock.AsyncMock(return_value=output),
+    ):
+        async with AsyncClient(
+            app=application_instance,
+            base_url=BASE_URL,
+            headers={"Authorization": f"Bearer {get_fake_jwt}"},
+        ) as ac:
+            response = await ac.get(f"/{output[0].id}")
+            etag = response.headers["ETag"]
+            not_modified = await ac.get(
+                f"/{output[0].id}",
+                headers={"If-None-Match": etag},
+            )
+
+    assert response.status_code == 200
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+
+
+@pytest.mark.anyio()
+async def test_get_cached(application_instance, get_fake_jwt):
+    select = mock.AsyncMock(return_value=[])
+    with mock.patch.object(route.repository, "async_select", select):
+        async with AsyncClient(
+            app=application_instance,
+            base_url=BASE_URL,
+            headers={"Authorization": f"Bearer {get_fake_jwt}"},
+        ) as ac:
+            first = await ac.get("/", params={"limit": 5})
+            second = await ac.get("/", params={"limit": 5})
+            route.repository.cache.invalidate()
+            third = await ac.get("/", params={"limit": 5})
+
+    assert first.json() == second.json() == third.json() == []
+    assert second.headers["ETag"] == first.headers["ETag"]
+    assert select.await_count == 2
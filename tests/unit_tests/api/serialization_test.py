@@ -0,0 +1,90 @@
+import json
+from collections import namedtuple
+from datetime import datetime
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from carnage.api.schemas.account import ListAccountSchema
+from carnage.api.schemas.dungeon.dungeon import ListDungeonSchema
+from carnage.api.serialization import RowEncoder
+from carnage.database.models.account import ProviderEnum
+
+
+def pydantic_items(schema, rows):
+    return [
+        json.loads(schema.from_orm(row).json(exclude_unset=True))
+        for row in rows
+    ]
+
+
+@pytest.mark.parametrize(
+    ("schema", "values"),
+    (
+        (
+            ListAccountSchema,
+            {
+                "username": "test",
+                "nickname": None,
+                "provider": ProviderEnum.github,
+            },
+        ),
+        (
+            ListDungeonSchema,
+            {
+                "name": "test",
+                "plot": {"chapters": [1, 2], "title": "test"},
+            },
+        ),
+    ),
+)
+def test_encode_matches_schema(schema, values):
+    Row = namedtuple("Row", ("id", "created_at", "updated_at", *values))
+    rows = [
+        Row(id=uuid4(), created_at=datetime.now(), updated_at=None, **values)
+        for _ in range(3)
+    ]
+    encoder = RowEncoder(schema)
+
+    assert json.loads(encoder.encode(rows)) == pydantic_items(schema, rows)
+
+
+def test_encode_fields():
+    Row = namedtuple("Row", ("id", "created_at", "name"))
+    row = Row(id=uuid4(), created_at=datetime.now(), name="test")
+    encoder = RowEncoder(ListDungeonSchema)
+
+    assert json.loads(encoder.encode([row], ("name",))) == [{"name": "test"}]
+    assert json.loads(encoder.encode([row], ("id", "name"))) == [
+        {"id": str(row.id), "name": "test"},
+    ]
+
+
+def test_encode_entities():
+    entity = SimpleNamespace(id=uuid4(), name="test", unknown="unknown")
+    encoder = RowEncoder(ListDungeonSchema)
+
+    assert json.loads(encoder.encode([entity])) == [
+        {"id": str(entity.id), "name": "test"},
+    ]
+
+
+def test_encode_empty():
+    encoder = RowEncoder(ListDungeonSchema)
+
+    assert encoder.encode([]) == b"[]"
+    assert encoder.items([SimpleNamespace()]) == [{}]
+
+
+def test_encode_lines():
+    Row = namedtuple("Row", ("id", "name"))
+    rows = [Row(id=uuid4(), name=f"test_{index}") for index in range(2)]
+    encoder = RowEncoder(ListDungeonSchema)
+
+    lines = encoder.encode_lines(rows, ("name",)).splitlines()
+    assert [json.loads(line) for line in lines] == [
+        {"name": "test_0"},
+        {"name": "test_1"},
+    ]
+    assert encoder.encode_lines([]) == b""
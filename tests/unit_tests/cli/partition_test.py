@@ -0,0 +1,49 @@
+import argparse
+from collections import namedtuple
+from unittest import mock
+
+from carnage.cli import partition
+from carnage.database.partition import Partition
+
+
+def test_add_subparser():
+    subparsers = mock.Mock()
+    parents = mock.Mock()
+    partition.add_subparser(subparsers, parents)
+
+    subparsers.add_parser.assert_called_once_with(
+        name="partition",
+        parents=parents,
+        help=(
+            "Create the upcoming partitions and retire the expired ones. "
+            "Must be run regularly, like once a day from cron, otherwise new "
+            "rows pile up in the default partition."
+        ),
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+
+
+namespace = namedtuple("Namespace", ("list_partitions",))
+
+
+@mock.patch.object(partition, "maintain_partitions")
+def test_run(maintain_partitions_mock):
+    maintain_partitions_mock.return_value = {
+        "global_chats": {"created": ["global_chats_p20261101"], "retired": []},
+    }
+
+    partition.run(args=namespace(False))
+
+    maintain_partitions_mock.assert_called_once_with()
+
+
+@mock.patch.object(partition, "session")
+@mock.patch.object(partition, "PartitionManager")
+def test_run_list_partitions(manager_mock, session_mock, capsys):
+    manager_mock.return_value.partitions.return_value = [
+        Partition("global_chats_p20261001", "2026-10-01", "2026-11-01"),
+    ]
+
+    partition.run(args=namespace(True))
+
+    assert "global_chats_p20261001" in capsys.readouterr().out
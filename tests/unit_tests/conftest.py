@@ -3,13 +3,15 @@
 from unittest import mock
 
 import pytest
-from sqlalchemy import Column, DateTime, String
+from sqlalchemy import Column, DateTime, String, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.ext.declarative import declarative_base
 
 from carnage.api.auth.authentication import generate_jwt
+from carnage.api.response_cache import response_cache
 from carnage.application import create_app
-from carnage.database.repository import base
+from carnage.database import cache, catalog
+from carnage.database.repository import base, reference
 
 APPLICATION_PREFIX: str = "api/v1"
 
@@ -20,6 +22,8 @@ class DummySqlModel(BaseModel):
     __tablename__ = "DummySqlModel"
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(String())
+    created_at = Column(DateTime())
+    updated_at = Column(DateTime(), onupdate=func.now())
     deleted_at = Column(DateTime())
 
 
@@ -33,9 +37,29 @@ class DummySqlModel(BaseModel):
 def database_session_mock(monkeypatch):
     monkeypatch.setattr(base, "session", mock.MagicMock())
 
+    async_session = mock.MagicMock()
+    async_session.return_value.__aenter__.return_value = mock.MagicMock(
+        execute=mock.AsyncMock(return_value=mock.MagicMock()),
+        commit=mock.AsyncMock(),
+        rollback=mock.AsyncMock(),
+    )
+    monkeypatch.setattr(base, "async_session", async_session)
+    cache.clear_caches()
+    catalog.catalog.clear()
+
+
+@pytest.fixture()
+def reference_catalog_mock(monkeypatch):
+    monkeypatch.setattr(
+        reference.ReferenceRepository,
+        "table",
+        mock.Mock(return_value=mock.MagicMock()),
+    )
+
 
 @pytest.fixture()
 def application_instance(database_session_mock):
+    response_cache.clear()
     return create_app()
 
 
@@ -0,0 +1,116 @@
+import uuid
+from unittest import mock
+
+import pytest
+from psycopg.types.json import Jsonb
+from sqlalchemy.dialects import postgresql
+
+from carnage.database import bulk
+from carnage.database.models.account import AccountModel, ProviderEnum
+from carnage.database.models.dungeon.dungeon import DungeonModel
+
+
+def test_batches():
+    rows = ({"index": index} for index in range(5))
+    assert [len(batch) for batch in bulk.batches(rows, 2)] == [2, 2, 1]
+
+
+def test_key_groups():
+    rows = [{"a": 1}, {"a": 2, "b": 2}, {"a": 3}]
+
+    assert bulk.key_groups(rows) == [[rows[0], rows[2]], [rows[1]]]
+
+
+def test_copy_columns_skip_missing_without_default():
+    columns = bulk.copy_columns(AccountModel.__table__, [{"username": "a"}])
+    names = [column.name for column in columns]
+
+    assert "username" in names
+    assert "id" in names
+    assert "created_at" not in names
+    assert "nickname" not in names
+
+
+def test_copy_statement():
+    table = AccountModel.__table__
+    columns = [table.c.id, table.c.username]
+    statement = bulk.copy_statement(table, columns, postgresql.dialect())
+
+    assert statement == "COPY accounts (id, username) FROM STDIN"
+
+
+def test_adapt_row():
+    table = AccountModel.__table__
+    columns = [table.c.id, table.c.username, table.c.provider]
+    row = bulk.adapt_row(
+        columns,
+        {"username": "test", "provider": ProviderEnum.github},
+    )
+
+    assert isinstance(row[0], uuid.UUID)
+    assert row[1:] == ("test", "github")
+
+
+@pytest.mark.parametrize(
+    ("value"),
+    (
+        ({"plot": "test"}),
+        (None),
+    ),
+)
+def test_adapt_jsonb(value):
+    adapted = bulk.adapt_value(DungeonModel.__table__.c.plot, value)
+
+    assert isinstance(adapted, Jsonb)
+    assert adapted.obj == value
+
+
+def test_copy_rows():
+    connection = mock.MagicMock()
+    copy = connection.cursor.return_value.__enter__.return_value.copy
+    writer = copy.return_value.__enter__.return_value
+
+    bulk.copy_rows(
+        connection,
+        AccountModel.__table__,
+        [{"username": "a"}, {"username": "b"}],
+        postgresql.dialect(),
+    )
+
+    assert copy.call_args.args[0].startswith("COPY accounts (")
+    assert writer.write_row.call_count == 2
+
+
+def test_copy_rows_split_by_columns():
+    connection = mock.MagicMock()
+    copy = connection.cursor.return_value.__enter__.return_value.copy
+
+    bulk.copy_rows(
+        connection,
+        AccountModel.__table__,
+        [{"username": "a"}, {"username": "b", "nickname": "b"}],
+        postgresql.dialect(),
+    )
+
+    statements = [call.args[0] for call in copy.call_args_list]
+    assert len(statements) == 2
+    assert "nickname" not in statements[0]
+    assert "nickname" in statements[1]
+
+
+@pytest.mark.anyio()
+async def test_async_copy_rows():
+    writer = mock.MagicMock(write_row=mock.AsyncMock())
+    cursor = mock.MagicMock()
+    cursor.copy.return_value.__aenter__.return_value = writer
+    connection = mock.MagicMock()
+    connection.cursor.return_value.__aenter__.return_value = cursor
+
+    await bulk.async_copy_rows(
+        connection,
+        AccountModel.__table__,
+        [{"username": "a"}],
+        postgresql.dialect(),
+    )
+
+    writer.write_row.assert_awaited_once()
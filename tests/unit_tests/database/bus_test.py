@@ -0,0 +1,190 @@
+import asyncio
+import json
+from unittest import mock
+from uuid import uuid4
+
+import psycopg
+import pytest
+
+from carnage.database import bus, cache, catalog
+
+
+def postgresql_bind():
+    bind = mock.Mock()
+    bind.dialect.name = "postgresql"
+    return bind
+
+
+def table_cache(name):
+    return cache.get_cache(type(name, (), {"__tablename__": name}))
+
+
+def notification(table, identifiers, origin="other"):
+    return json.dumps({"origin": origin, "table": table, "ids": identifiers})
+
+
+def test_payload():
+    identifier = uuid4()
+    data = json.loads(bus.payload("dummy", [identifier, str(identifier)]))
+
+    assert data == {
+        "origin": bus.ORIGIN,
+        "table": "dummy",
+        "ids": [str(identifier)],
+    }
+    assert json.loads(bus.payload("dummy", None))["ids"] is None
+
+
+def test_payload_too_large():
+    data = json.loads(bus.payload("dummy", [uuid4() for _ in range(500)]))
+    assert data["ids"] is None
+
+
+def test_notify_statement():
+    statement = bus.notify_statement(postgresql_bind(), "dummy", ["a"])
+    params = statement.compile().params
+
+    assert "pg_notify" in str(statement)
+    assert params["channel"] == bus.DATABASE_INVALIDATION_CHANNEL
+    assert json.loads(params["payload"])["ids"] == ["a"]
+
+
+@pytest.mark.parametrize(
+    ("dialect", "channel"),
+    (("sqlite", "carnage_invalidation"), ("postgresql", "")),
+)
+def test_notify_statement_disabled(dialect, channel):
+    bind = mock.Mock()
+    bind.dialect.name = dialect
+    assert bus.notify_statement(bind, "dummy", ["a"], channel) is None
+
+
+def test_invalidations_coalesce():
+    invalidations = bus.Invalidations()
+    invalidations.add("first", ["a"])
+    invalidations.add("first", ["b"])
+    invalidations.add("second", None)
+    invalidations.add("second", ["c"])
+    invalidations.add("third", ["d"])
+    invalidations.add("third", None)
+
+    assert invalidations.tables == {
+        "first": {"a", "b"},
+        "second": None,
+        "third": None,
+    }
+
+
+def test_invalidations_parse():
+    invalidations = bus.Invalidations()
+
+    assert invalidations.parse(notification("first", ["a"]))
+    assert not invalidations.parse(notification("first", ["b"], bus.ORIGIN))
+    assert not invalidations.parse("not json")
+    assert not invalidations.parse(json.dumps({"table": "first"}))
+    assert invalidations.tables == {"first": {"a"}}
+
+
+def test_invalidations_apply():
+    first = table_cache("first")
+    first.set(("select_by_id", ("identifier", "a")), 1)
+    first.set(("select_by_id", ("identifier", "b")), 2)
+    second = table_cache("second")
+    second.set(("select_by_id", ("identifier", "c")), 3)
+    catalog.catalog.store("second", [])
+    catalog.catalog.store("third", [])
+
+    invalidations = bus.Invalidations()
+    invalidations.add("first", ["a"])
+    invalidations.add("second", None)
+    invalidations.apply()
+
+    assert first.statistics()["entries"] == 1
+    assert second.statistics()["entries"] == 0
+    assert catalog.catalog.get("second") is None
+    assert catalog.catalog.get("third") is not None
+    assert invalidations.tables == {}
+    catalog.catalog.clear()
+
+
+def test_flush():
+    entity_cache = table_cache("first")
+    entity_cache.set("key", 1)
+    catalog.catalog.store("first", [])
+
+    bus.flush()
+
+    assert entity_cache.statistics()["entries"] == 0
+    assert catalog.catalog.get("first") is None
+
+
+def test_listener_conninfo():
+    listener = bus.InvalidationListener()
+    assert listener._conninfo().startswith("postgresql://")
+
+
+class FakeConnection:
+    def __init__(self, *payloads):
+        self.payloads = list(payloads)
+
+    async def notifies(self, timeout=None, stop_after=None):
+        while self.payloads:
+            yield mock.Mock(payload=self.payloads.pop(0))
+            if stop_after == 1:
+                return
+
+
+@pytest.mark.anyio()
+async def test_listener_receive():
+    listener = bus.InvalidationListener()
+    connection = FakeConnection(
+        notification("first", ["a"]),
+        notification("first", ["b"]),
+        notification("first", ["c"], bus.ORIGIN),
+    )
+
+    with mock.patch.object(bus.Invalidations, "apply") as apply:
+        await listener.receive(connection)
+
+    assert listener.received == 3
+    apply.assert_called_once()
+
+
+@pytest.mark.anyio()
+async def test_listener_listen_reconnects():
+    listener = bus.InvalidationListener(reconnect=0)
+    connection = mock.AsyncMock()
+    connect = mock.AsyncMock(
+        side_effect=[psycopg.OperationalError("down"), connection],
+    )
+    receive = mock.AsyncMock(side_effect=asyncio.CancelledError)
+
+    with mock.patch.object(listener, "_connect", connect), mock.patch.object(
+        listener, "receive", receive
+    ), mock.patch.object(bus, "flush") as flush:
+        with pytest.raises(asyncio.CancelledError):
+            await listener.listen()
+
+    assert connect.await_count == 2
+    flush.assert_called_once()
+    assert listener.flushes == 1
+    receive.assert_awaited_once_with(connection.__aenter__.return_value)
+
+
+@pytest.mark.anyio()
+async def test_listener_start_and_stop():
+    listener = bus.InvalidationListener()
+    with mock.patch.object(listener, "listen", mock.AsyncMock()):
+        await listener.start()
+        assert listener._task is not None
+        await listener.stop()
+
+    assert listener._task is None
+    await listener.stop()
+
+
+@pytest.mark.anyio()
+async def test_listener_disabled():
+    listener = bus.InvalidationListener(channel="")
+    await listener.start()
+    assert listener._task is None
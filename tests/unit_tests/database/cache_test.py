@@ -0,0 +1,208 @@
+from unittest import mock
+from uuid import uuid4
+
+import pytest
+
+from carnage.database import cache, unit_of_work
+from tests.unit_tests.conftest import DummySqlModel
+
+
+class DummyRepository:
+    def __init__(self, enabled=True):
+        self.cache = cache.EntityCache(name="dummy", enabled=enabled)
+        self.calls = 0
+
+    @cache.cached
+    def select_by_id(self, identifier):
+        self.calls += 1
+        return identifier
+
+    @cache.cached
+    async def async_select_by_id(self, identifier):
+        self.calls += 1
+        return identifier
+
+
+def test_entity_cache_get_set():
+    entity_cache = cache.EntityCache(name="test")
+    assert entity_cache.get("key") is cache.MISSING
+
+    entity_cache.set("key", "value")
+    assert entity_cache.get("key") == "value"
+    assert entity_cache.statistics()["hits"] == 1
+    assert entity_cache.statistics()["misses"] == 1
+
+
+def test_entity_cache_eviction():
+    entity_cache = cache.EntityCache(name="test", max_entries=2)
+    entity_cache.set("first", 1)
+    entity_cache.set("second", 2)
+    entity_cache.get("first")
+    entity_cache.set("third", 3)
+
+    assert entity_cache.get("second") is cache.MISSING
+    assert entity_cache.get("first") == 1
+    assert entity_cache.statistics()["evictions"] == 1
+
+
+def test_entity_cache_expiration():
+    entity_cache = cache.EntityCache(name="test", ttl=10)
+    with mock.patch.object(cache.time, "monotonic", return_value=0):
+        entity_cache.set("key", "value")
+
+    with mock.patch.object(cache.time, "monotonic", return_value=11):
+        assert entity_cache.get("key") is cache.MISSING
+
+    assert entity_cache.statistics()["expirations"] == 1
+
+
+@pytest.mark.parametrize(
+    ("enabled", "max_entries"),
+    (
+        (False, 10),
+        (True, 0),
+    ),
+)
+def test_entity_cache_set_disabled(enabled, max_entries):
+    entity_cache = cache.EntityCache(
+        name="test",
+        enabled=enabled,
+        max_entries=max_entries,
+    )
+    entity_cache.set("key", "value")
+    assert entity_cache.statistics()["entries"] == 0
+
+
+def test_entity_cache_invalidate():
+    entity_cache = cache.EntityCache(name="test")
+    entity_cache.set("key", "value")
+    entity_cache.invalidate()
+
+    assert entity_cache.get("key") is cache.MISSING
+    assert entity_cache.statistics()["invalidations"] == 1
+
+
+def test_entity_cache_discard():
+    entity_cache = cache.EntityCache(name="test")
+    entity_cache.set("key", "value")
+    entity_cache.discard("key")
+    entity_cache.discard("unknown")
+
+    assert entity_cache.get("key") is cache.MISSING
+    assert entity_cache.statistics()["invalidations"] == 0
+
+
+def test_get_cache():
+    assert cache.get_cache(DummySqlModel) is cache.get_cache(DummySqlModel)
+    assert cache.get_cache(DummySqlModel).name == "DummySqlModel"
+    assert "DummySqlModel" in cache.cache_statistics()
+
+
+def test_clear_caches():
+    cache.get_cache(DummySqlModel).set("key", "value")
+    cache.clear_caches()
+    assert cache.get_cache(DummySqlModel).get("key") is cache.MISSING
+
+
+def test_cached():
+    repository = DummyRepository()
+    assert repository.select_by_id("test") == "test"
+    assert repository.select_by_id(identifier="test") == "test"
+    assert repository.calls == 1
+
+
+def test_cached_reads_from_writer():
+    repository = DummyRepository()
+    with mock.patch.object(cache, "read_from_writer") as read_from_writer:
+        repository.select_by_id("test")
+        repository.select_by_id("test")
+
+    read_from_writer.assert_called_once()
+
+
+def test_cached_disabled():
+    repository = DummyRepository(enabled=False)
+    repository.select_by_id("test")
+    repository.select_by_id("test")
+    assert repository.calls == 2
+
+
+def test_cached_mapping_arguments():
+    repository = DummyRepository()
+    repository.select_by_id({"name": ("a", "b"), "id": "test"})
+    repository.select_by_id({"id": "test", "name": ("a", "b")})
+    assert repository.calls == 1
+
+
+def test_cached_unhashable_arguments():
+    repository = DummyRepository()
+    repository.select_by_id(["test"])
+    repository.select_by_id(["test"])
+    assert repository.calls == 2
+
+
+@pytest.mark.anyio()
+async def test_cached_async():
+    repository = DummyRepository()
+    repository.select_by_id("test")
+    assert await repository.async_select_by_id("test") == "test"
+    assert repository.calls == 1
+
+
+@pytest.mark.anyio()
+async def test_cached_async_unit_of_work():
+    repository = DummyRepository()
+    async with unit_of_work.UnitOfWork() as work:
+        await repository.async_select_by_id("test")
+        await repository.async_select_by_id("test")
+        await work.rollback()
+
+    assert repository.cache.statistics()["entries"] == 0
+    assert await repository.async_select_by_id("test") == "test"
+    assert repository.calls == 2
+
+
+@pytest.mark.anyio()
+@pytest.mark.parametrize(
+    ("enabled", "identifier"),
+    (
+        (False, "test"),
+        (True, ["test"]),
+    ),
+)
+async def test_cached_async_not_stored(enabled, identifier):
+    repository = DummyRepository(enabled=enabled)
+    await repository.async_select_by_id(identifier)
+    await repository.async_select_by_id(identifier)
+    assert repository.calls == 2
+
+
+def test_entity_cache_evict():
+    entity_cache = cache.EntityCache(name="dummy")
+    first, second = uuid4(), uuid4()
+    entity_cache.set(("select_by_id", ("identifier", first)), 1)
+    entity_cache.set(("select_by_id", ("identifier", str(second))), 2)
+    entity_cache.set(("select", ("limit", 10)), [1, 2])
+
+    entity_cache.evict([str(first)])
+
+    assert entity_cache.get(("select_by_id", ("identifier", first))) is (
+        cache.MISSING
+    )
+    assert entity_cache.get(("select", ("limit", 10))) is cache.MISSING
+    assert entity_cache.get(("select_by_id", ("identifier", str(second)))) == 2
+    assert entity_cache.statistics()["invalidations"] == 1
+
+
+def test_evict():
+    entity_cache = cache.get_cache(DummySqlModel)
+    entity_cache.set(("select_by_id", ("identifier", "a")), 1)
+    entity_cache.set(("select_by_id", ("identifier", "b")), 2)
+
+    cache.evict("DummySqlModel", ["a"])
+    assert entity_cache.statistics()["entries"] == 1
+
+    cache.evict("DummySqlModel")
+    assert entity_cache.statistics()["entries"] == 0
+
+    cache.evict("unknown", ["a"])
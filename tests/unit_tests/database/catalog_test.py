@@ -0,0 +1,126 @@
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import create_engine, insert, select
+
+from carnage.database import catalog
+from tests.unit_tests.conftest import DummySqlModel
+
+
+@pytest.fixture()
+def rows():
+    engine = create_engine("sqlite://")
+    DummySqlModel.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(
+            insert(DummySqlModel),
+            [
+                {
+                    "id": uuid4(),
+                    "name": name,
+                    "created_at": datetime(2026, 1, day),
+                }
+                for day, name in ((3, "third"), (1, "first"), (2, "second"))
+            ],
+        )
+        return connection.execute(
+            select(*DummySqlModel.__table__.columns),
+        ).all()
+
+
+def test_catalog_table(rows):
+    table = catalog.CatalogTable("DummySqlModel", rows, version=1)
+
+    assert len(table) == 3
+    assert [row.name for row in table.rows] == ["first", "second", "third"]
+    assert table.by_name["second"].name == "second"
+    with pytest.raises(TypeError):
+        table.by_id[uuid4()] = rows[0]
+
+
+def test_catalog_table_page(rows):
+    table = catalog.CatalogTable("DummySqlModel", rows, version=1)
+    first = table.rows[0]
+
+    assert [row.name for row in table.page(limit=2)] == ["first", "second"]
+    assert [
+        row.name for row in table.page(after=(first.created_at, first.id))
+    ] == ["second", "third"]
+    assert table.page(limit=1, after=(datetime(2027, 1, 1), uuid4())) == []
+
+
+def test_catalog_table_get_and_find(rows):
+    table = catalog.CatalogTable("DummySqlModel", rows, version=1)
+    row = table.rows[1]
+
+    assert table.get(row.id) is row
+    assert table.get(str(row.id)) is row
+    assert table.get("not an uuid") is None
+    assert table.find(id=row.id) is row
+    assert table.find(name="second") is row
+    assert table.find(name="second", created_at=row.created_at) is row
+    assert table.find(name="second", created_at=datetime.now()) is None
+    with pytest.raises(KeyError):
+        table.find(name="second", unknown=1)
+
+
+def test_catalog_store(rows):
+    instance = catalog.Catalog()
+    assert instance.get("DummySqlModel") is None
+
+    first = instance.store("DummySqlModel", rows)
+    second = instance.store("DummySqlModel", rows[:1])
+
+    assert instance.get("DummySqlModel") is second
+    assert (first.version, second.version) == (1, 2)
+    assert len(first) == 3
+    assert instance.statistics() == {
+        "version": 2,
+        "tables": {"DummySqlModel": {"rows": 1, "version": 2}},
+    }
+
+    instance.clear()
+    assert instance.get("DummySqlModel") is None
+
+
+def test_catalog_discard(rows):
+    instance = catalog.Catalog()
+    instance.store("DummySqlModel", rows)
+    instance.store("other", rows)
+
+    instance.discard("DummySqlModel")
+    instance.discard("unknown")
+
+    assert instance.get("DummySqlModel") is None
+    assert instance.get("other") is not None
+
+
+def test_catalog_store_keeps_newer_snapshot(rows):
+    instance = catalog.Catalog()
+    older, newer = instance.next_version(), instance.next_version()
+
+    stored = instance.store("DummySqlModel", rows[:1], newer)
+    assert instance.store("DummySqlModel", rows, older) is stored
+    assert instance.get("DummySqlModel") is stored
+    assert len(stored) == 1
+
+
+@pytest.mark.parametrize(
+    "forget",
+    (
+        lambda instance: instance.discard("DummySqlModel"),
+        lambda instance: instance.clear(),
+    ),
+)
+def test_catalog_store_after_discard(rows, forget):
+    instance = catalog.Catalog()
+    version = instance.next_version()
+    forget(instance)
+
+    table = instance.store("DummySqlModel", rows, version)
+    assert len(table) == 3
+    assert instance.get("DummySqlModel") is None
+
+    instance.store("DummySqlModel", rows, instance.next_version())
+    assert instance.get("DummySqlModel") is not None
@@ -0,0 +1,170 @@
+from unittest import mock
+
+import pytest
+from sqlalchemy import create_engine, event, text
+
+from carnage.database import instrumentation
+
+
+@pytest.fixture()
+def engine():
+    engine = create_engine("sqlite://")
+    instrumentation.instrument(engine)
+    instrumentation.reset()
+    yield engine
+    instrumentation.reset()
+
+
+class Owner:
+    def run(self, engine, statement):
+        with engine.connect() as connection:
+            return connection.execute(
+                statement,
+                execution_options=instrumentation.caller_options(self, 0),
+            ).all()
+
+
+@pytest.mark.parametrize(
+    ("statement", "expected"),
+    (
+        ("SELECT  1\n  FROM t", "SELECT 1 FROM t"),
+        (
+            "INSERT INTO t (a) VALUES (%(a_m0)s), (%(a_m1)s), (%(a_m2)s)",
+            "INSERT INTO t (a) VALUES (%(a)s), ...",
+        ),
+        (
+            "INSERT INTO t (a, b) VALUES (%(a__0)s, %(b__0)s), "
+            "(%(a__1)s, %(b__1)s)",
+            "INSERT INTO t (a, b) VALUES (%(a)s, %(b)s), ...",
+        ),
+        ("SELECT * FROM t WHERE id = %(id_1)s", None),
+    ),
+)
+def test_normalize(statement, expected):
+    assert instrumentation.normalize(statement) == (expected or statement)
+
+
+def test_instrument_is_idempotent(engine):
+    instrumentation.instrument(engine)
+
+    assert event.contains(
+        engine,
+        "before_cursor_execute",
+        instrumentation._before_cursor_execute,
+    )
+    Owner().run(engine, text("SELECT 1"))
+
+    (statistic,) = instrumentation.query_statistics()
+    assert statistic["count"] == 1
+
+
+def test_query_statistics(engine):
+    owner = Owner()
+    owner.run(engine, text("SELECT 1"))
+    owner.run(engine, text("SELECT   1"))
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 2"))
+
+    statistics = instrumentation.query_statistics()
+
+    assert len(statistics) == 2
+    by_caller = {statistic["caller"]: statistic for statistic in statistics}
+    assert by_caller["Owner.run"]["statement"] == "SELECT 1"
+    assert by_caller["Owner.run"]["count"] == 2
+    assert sum(by_caller["Owner.run"]["histogram"].values()) == 2
+    assert by_caller["unknown"]["statement"] == "SELECT 2"
+    assert statistics[0]["total_time"] >= statistics[1]["total_time"]
+
+
+def test_query_statistics_limit(engine):
+    with mock.patch.object(instrumentation, "MAX_STATEMENTS", 1):
+        Owner().run(engine, text("SELECT 1"))
+        Owner().run(engine, text("SELECT 2"))
+
+    statements = {
+        statistic["statement"]
+        for statistic in instrumentation.query_statistics()
+    }
+    assert statements == {"SELECT 1", instrumentation.OTHER}
+
+
+def test_query_statistics_record():
+    statistics = instrumentation.QueryStatistics()
+    statistics.record(0.002, 3)
+    statistics.record(10.0, 1)
+
+    result = statistics.as_dict()
+
+    assert result["count"] == 2
+    assert result["rows"] == 4
+    assert result["max_time"] == 10.0
+    assert result["average_time"] == pytest.approx(5.001)
+    assert result["histogram"]["0.005"] == 1
+    assert result["histogram"]["+Inf"] == 1
+
+
+def test_slow_queries(engine, caplog):
+    with mock.patch.object(
+        instrumentation,
+        "DATABASE_SLOW_QUERY_THRESHOLD",
+        1e-9,
+    ):
+        Owner().run(engine, text("SELECT 1"))
+
+    (slow_query,) = instrumentation.slow_queries()
+    assert slow_query["caller"] == "Owner.run"
+    assert slow_query["statement"] == "SELECT 1"
+    assert slow_query["plan"] is None
+    assert "Slow query from Owner.run" in caplog.text
+
+
+def test_slow_queries_disabled(engine):
+    with mock.patch.object(
+        instrumentation,
+        "DATABASE_SLOW_QUERY_THRESHOLD",
+        0,
+    ):
+        Owner().run(engine, text("SELECT 1"))
+
+    assert instrumentation.slow_queries() == []
+
+
+def test_slow_queries_explain(engine):
+    with mock.patch.multiple(
+        instrumentation,
+        DATABASE_SLOW_QUERY_THRESHOLD=1e-9,
+        DATABASE_SLOW_QUERY_EXPLAIN=True,
+    ), mock.patch.object(
+        instrumentation,
+        "_explain",
+        return_value=["Result  (actual time=0.001..0.001 rows=1 loops=1)"],
+    ) as explain:
+        Owner().run(engine, text("SELECT 1"))
+        Owner().run(engine, text("SELECT 1"))
+
+    explain.assert_called_once()
+    second, first = instrumentation.slow_queries()
+    assert first["plan"] == explain.return_value
+    assert second["plan"] is None
+
+
+def test_explain():
+    connection = mock.MagicMock()
+    cursor = connection.connection.cursor.return_value
+    cursor.fetchall.return_value = [("Seq Scan on t",), ("Buffers: hit=1",)]
+
+    plan = instrumentation._explain(connection, "SELECT 1", {})
+
+    assert plan == ["Seq Scan on t", "Buffers: hit=1"]
+    cursor.execute.assert_called_once_with(
+        "EXPLAIN (ANALYZE, BUFFERS) SELECT 1",
+        {},
+    )
+    cursor.close.assert_called_once()
+
+
+def test_explain_failure():
+    connection = mock.MagicMock()
+    connection.connection.cursor.return_value.execute.side_effect = Exception
+
+    assert instrumentation._explain(connection, "SELECT 1", {}) is None
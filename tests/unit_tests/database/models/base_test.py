@@ -0,0 +1,43 @@
+import uuid
+from unittest import mock
+
+import pytest
+
+from carnage.database.models import base
+from carnage.database.models.chat.global_chat import GlobalChatModel
+from carnage.database.models.dungeon.dungeon_history import DungeonHistoryModel
+from carnage.database.models.player import PlayerModel
+from carnage.database.models.race import RaceModel
+
+
+def test_uuid7():
+    identifiers = [base.uuid7() for _ in range(1000)]
+
+    assert identifiers == sorted(identifiers)
+    assert len(set(identifiers)) == 1000
+    assert all(identifier.version == 7 for identifier in identifiers)
+    assert all(
+        identifier.variant == uuid.RFC_4122 for identifier in identifiers
+    )
+
+
+def test_uuid7_is_monotonic_when_the_clock_goes_back():
+    with mock.patch.object(base.time, "time_ns", return_value=0):
+        first, second = base.uuid7(), base.uuid7()
+
+    assert first < second
+
+
+@pytest.mark.parametrize(
+    ("model", "generator"),
+    (
+        (GlobalChatModel, base.uuid7),
+        (DungeonHistoryModel, base.uuid7),
+        (PlayerModel, base.uuid7),
+        (RaceModel, uuid.uuid4),
+    ),
+)
+def test_id_generator(model, generator):
+    column = model.__table__.columns["id"]
+    assert column.primary_key
+    assert column.default.arg.__wrapped__ is generator
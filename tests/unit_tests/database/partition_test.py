@@ -0,0 +1,250 @@
+from datetime import datetime
+from unittest import mock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from carnage.database import partition
+
+
+def connection_mock(bounds):
+    connection = mock.Mock()
+    connection.dialect = postgresql.dialect()
+    connection.execute.return_value = [
+        (
+            f"global_chats_p{start:%Y%m%d}",
+            f"FOR VALUES FROM ('{start}') TO ('{end}')",
+        )
+        for start, end in bounds
+    ]
+    return connection
+
+
+def executed(connection):
+    return [
+        str(call.args[0])
+        for call in connection.execute.call_args_list
+        if not call.args[0].text.startswith("SELECT")
+    ]
+
+
+@pytest.mark.parametrize(
+    ("moment", "interval", "expected"),
+    (
+        (datetime(2026, 10, 18, 14, 2), "month", datetime(2026, 10, 1)),
+        (datetime(2026, 10, 18, 14, 2), "week", datetime(2026, 10, 12)),
+        (datetime(2026, 10, 12), "week", datetime(2026, 10, 12)),
+    ),
+)
+def test_period_start(moment, interval, expected):
+    assert partition.period_start(moment, interval) == expected
+
+
+@pytest.mark.parametrize(
+    ("start", "interval", "periods", "expected"),
+    (
+        (datetime(2026, 11, 1), "month", 2, datetime(2027, 1, 1)),
+        (datetime(2026, 1, 1), "month", -1, datetime(2025, 12, 1)),
+        (datetime(2026, 10, 12), "week", 3, datetime(2026, 11, 2)),
+    ),
+)
+def test_shift(start, interval, periods, expected):
+    assert partition.shift(start, interval, periods) == expected
+
+
+def test_unknown_interval():
+    with pytest.raises(ValueError, match="Unknown partition interval"):
+        partition.PartitionManager("global_chats", interval="year")
+
+
+def test_partitions():
+    connection = connection_mock(
+        [
+            (datetime(2026, 11, 1), datetime(2026, 12, 1)),
+            (datetime(2026, 10, 1), datetime(2026, 11, 1)),
+        ],
+    )
+    connection.execute.return_value.append(("global_chats_default", "DEFAULT"))
+
+    partitions = partition.PartitionManager("global_chats").partitions(
+        connection,
+    )
+
+    assert partitions == [
+        partition.Partition(
+            "global_chats_p20261001",
+            datetime(2026, 10, 1),
+            datetime(2026, 11, 1),
+        ),
+        partition.Partition(
+            "global_chats_p20261101",
+            datetime(2026, 11, 1),
+            datetime(2026, 12, 1),
+        ),
+    ]
+
+
+def test_create_partitions():
+    connection = connection_mock(
+        [(datetime(2026, 10, 1), datetime(2026, 11, 1))],
+    )
+    manager = partition.PartitionManager("global_chats", premake=2)
+
+    created = manager.create_partitions(connection, datetime(2026, 10, 18))
+
+    assert created == ["global_chats_p20261101", "global_chats_p20261201"]
+    assert executed(connection)[-1] == (
+        "CREATE TABLE global_chats_p20261201 PARTITION OF global_chats "
+        "FOR VALUES FROM ('2026-12-01 00:00:00') TO ('2027-01-01 00:00:00')"
+    )
+
+
+def test_create_partitions_after_interval_change():
+    connection = connection_mock(
+        [(datetime(2026, 10, 1), datetime(2026, 11, 1))],
+    )
+    manager = partition.PartitionManager(
+        "global_chats",
+        interval="week",
+        premake=0,
+    )
+
+    created = manager.create_partitions(connection, datetime(2026, 10, 30))
+
+    assert created == ["global_chats_p20261101"]
+    assert executed(connection) == [
+        "CREATE TABLE global_chats_p20261101 PARTITION OF global_chats "
+        "FOR VALUES FROM ('2026-11-01 00:00:00') TO ('2026-11-02 00:00:00')",
+    ]
+
+
+def test_create_partitions_with_default_partition():
+    connection = connection_mock(
+        [(datetime(2026, 10, 1), datetime(2026, 11, 1))],
+    )
+    connection.execute.return_value.append(("global_chats_default", "DEFAULT"))
+    manager = partition.PartitionManager("global_chats", premake=1)
+
+    created = manager.create_partitions(connection, datetime(2026, 10, 18))
+
+    assert created == ["global_chats_p20261101"]
+    assert executed(connection) == [
+        "CREATE TABLE global_chats_p20261101 "
+        "(LIKE global_chats INCLUDING DEFAULTS INCLUDING CONSTRAINTS)",
+        "WITH moved AS (DELETE FROM global_chats_default "
+        "WHERE created_at >= '2026-11-01 00:00:00' "
+        "AND created_at < '2026-12-01 00:00:00' RETURNING *) "
+        "INSERT INTO global_chats_p20261101 SELECT * FROM moved",
+        "ALTER TABLE global_chats ATTACH PARTITION global_chats_p20261101 "
+        "FOR VALUES FROM ('2026-11-01 00:00:00') TO ('2026-12-01 00:00:00')",
+    ]
+
+
+def test_default_partition():
+    connection = connection_mock([])
+    manager = partition.PartitionManager("global_chats")
+
+    assert manager.default_partition(connection) is None
+    connection.execute.return_value.append(("global_chats_default", "DEFAULT"))
+    assert manager.default_partition(connection) == "global_chats_default"
+
+
+def test_create_partitions_without_partitions():
+    connection = connection_mock([])
+    manager = partition.PartitionManager("global_chats", premake=0)
+
+    assert manager.create_partitions(connection, datetime(2026, 10, 18)) == [
+        "global_chats_p20261001",
+    ]
+
+
+@pytest.mark.parametrize(
+    ("drop", "statements"),
+    (
+        (
+            True,
+            [
+                "ALTER TABLE global_chats "
+                "DETACH PARTITION global_chats_p20260801",
+                "DROP TABLE global_chats_p20260801",
+            ],
+        ),
+        (
+            False,
+            [
+                "ALTER TABLE global_chats "
+                "DETACH PARTITION global_chats_p20260801",
+            ],
+        ),
+    ),
+)
+def test_retire_partitions(drop, statements):
+    connection = connection_mock(
+        [
+            (datetime(2026, 8, 1), datetime(2026, 9, 1)),
+            (datetime(2026, 9, 1), datetime(2026, 10, 1)),
+            (datetime(2026, 10, 1), datetime(2026, 11, 1)),
+        ],
+    )
+    manager = partition.PartitionManager(
+        "global_chats",
+        retention=1,
+        drop=drop,
+    )
+
+    retired = manager.retire_partitions(connection, datetime(2026, 10, 18))
+
+    assert retired == ["global_chats_p20260801"]
+    assert executed(connection) == statements
+
+
+def test_retire_partitions_notifies():
+    connection = connection_mock(
+        [(datetime(2026, 8, 1), datetime(2026, 9, 1))],
+    )
+    connection.engine.dialect = postgresql.dialect()
+    manager = partition.PartitionManager("global_chats", retention=1)
+
+    manager.retire_partitions(connection, datetime(2026, 10, 18))
+
+    statement = connection.execute.call_args.args[0]
+    assert statement.text.startswith("SELECT pg_notify")
+    assert '"ids": null' in statement.compile().params["payload"]
+
+
+def test_retire_partitions_without_retention():
+    connection = connection_mock(
+        [(datetime(2020, 1, 1), datetime(2020, 2, 1))],
+    )
+    manager = partition.PartitionManager("global_chats", retention=0)
+
+    assert manager.retire_partitions(connection, datetime(2026, 10, 18)) == []
+    connection.execute.assert_not_called()
+
+
+def test_maintain_partitions():
+    engine = mock.MagicMock()
+    connection = engine.begin.return_value.__enter__.return_value
+    with mock.patch.object(
+        partition.PartitionManager,
+        "maintain",
+        return_value={"created": [], "retired": []},
+    ) as maintain:
+        result = partition.maintain_partitions(engine, datetime(2026, 10, 18))
+
+    assert set(result) == set(partition.PARTITIONED_TABLES)
+    maintain.assert_called_with(connection, datetime(2026, 10, 18))
+
+
+def test_maintain_partitions_evicts_retired():
+    engine = mock.MagicMock()
+    with mock.patch.object(
+        partition.PartitionManager,
+        "maintain",
+        return_value={"created": [], "retired": ["global_chats_p20260801"]},
+    ), mock.patch.object(partition, "evict") as evict:
+        partition.maintain_partitions(engine, datetime(2026, 10, 18))
+
+    evict.assert_has_calls(
+        [mock.call(table) for table in partition.PARTITIONED_TABLES],
+    )
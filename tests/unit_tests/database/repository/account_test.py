@@ -1,3 +1,5 @@
+import pytest
+
 from carnage.database.repository import account
 
 
@@ -16,3 +18,19 @@ def test_select_by_nickname(database_session_mock):
     repository = account.AccountRepository()
     repository.select_by_nickname(nickname="test")
     assert repository.session is not None
+
+
+@pytest.mark.anyio()
+async def test_async_select_by_username(database_session_mock):
+    repository = account.AccountRepository()
+    await repository.async_select_by_username(username="test")
+    session = repository.async_session.return_value.__aenter__.return_value
+    session.execute.assert_awaited_once()
+
+
+@pytest.mark.anyio()
+async def test_async_select_by_nickname(database_session_mock):
+    repository = account.AccountRepository()
+    await repository.async_select_by_nickname(nickname="test")
+    session = repository.async_session.return_value.__aenter__.return_value
+    session.execute.assert_awaited_once()
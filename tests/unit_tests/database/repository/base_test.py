@@ -1,3 +1,11 @@
+from datetime import datetime
+from unittest import mock
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from carnage.database import cache
 from carnage.database.repository import base
 from tests.unit_tests.conftest import DummySqlModel
 
@@ -21,6 +29,36 @@ def test_select(database_session_mock):
     assert repository.session.execute.called_once()
 
 
+@pytest.mark.parametrize(
+    ("method", "caller"),
+    (("select", "BaseRepository.select"), ("stream", "BaseRepository.stream")),
+)
+def test_statements_are_tagged_with_caller(
+    database_session_mock, method, caller
+):
+    repository = base.BaseRepository(model=DummySqlModel)
+    list(getattr(repository, method)() or [])
+
+    session = repository.session.return_value.__enter__.return_value
+    options = session.execute.call_args.kwargs["execution_options"]
+    assert options == {"carnage_caller": caller}
+
+
+def test_select_statement_keyset():
+    repository = base.BaseRepository(model=DummySqlModel)
+    statement = str(
+        repository._select_statement(
+            limit=10,
+            after=(datetime.now(), uuid4()),
+        ),
+    )
+
+    assert "ORDER BY" in statement
+    assert '("DummySqlModel".created_at, "DummySqlModel".id) >' in statement
+    assert '"DummySqlModel".created_at >= :created_at_1' in statement
+    assert "LIMIT" in statement
+
+
 def test_select_first(database_session_mock):
     repository = base.BaseRepository(model=DummySqlModel)
     repository.select_first()
@@ -54,3 +92,563 @@ def test_delete(database_session_mock):
     repository.delete(identifier="c32c033a-4d00-11ed-979e-641c67e34d72")
     assert repository.session.execute.called_once()
     assert repository.session.commit.called_once()
+
+
+def test_select_statement_updated_since():
+    repository = base.BaseRepository(model=DummySqlModel)
+    statement = str(
+        repository._select_statement(updated_since=datetime.now()),
+    )
+
+    assert '"DummySqlModel".updated_at > :updated_at_1' in statement
+    assert "deleted_at IS NULL" not in statement
+
+
+def test_select_statement_filters():
+    repository = base.BaseRepository(model=DummySqlModel)
+    statement = str(
+        repository._select_statement(
+            filters={"name": ["a", "b"], "updated_at": None, "id": uuid4()},
+        ),
+    )
+
+    assert '"DummySqlModel".name IN (__[POSTCOMPILE_name_1])' in statement
+    assert '"DummySqlModel".updated_at IS NULL' in statement
+    assert '"DummySqlModel".id = :id_1' in statement
+
+
+def test_select_statement_sort():
+    repository = base.BaseRepository(model=DummySqlModel)
+    statement = str(
+        repository._select_statement(
+            after=("test", uuid4()),
+            sort=("-name",),
+        ),
+    )
+
+    assert (
+        'ORDER BY "DummySqlModel".name DESC, "DummySqlModel".id ASC'
+        in statement
+    )
+    assert '"DummySqlModel".name < :name_1' in statement
+    assert '"DummySqlModel".name = :name_2' in statement
+    assert '"DummySqlModel".id > :id_1' in statement
+    assert "created_at" not in statement.split("FROM")[1]
+
+
+@pytest.mark.parametrize(
+    ("sort", "expected"),
+    (
+        (("created_at",), '"DummySqlModel".created_at >= :created_at_'),
+        (("-created_at",), '"DummySqlModel".created_at <= :created_at_'),
+    ),
+)
+def test_select_statement_sort_created_at(sort, expected):
+    repository = base.BaseRepository(model=DummySqlModel)
+    statement = str(
+        repository._select_statement(
+            after=(datetime.now(), uuid4()),
+            sort=sort,
+        ),
+    )
+
+    assert expected in statement
+
+
+def test_keyset_predicate_nulls():
+    repository = base.BaseRepository(model=DummySqlModel)
+    ascending = str(
+        repository._keyset_predicate(
+            repository._sort_keys(("name",)),
+            ("test", uuid4()),
+        ),
+    )
+    descending = str(
+        repository._keyset_predicate(
+            repository._sort_keys(("-name",)),
+            (None, uuid4()),
+        ),
+    )
+
+    assert '"DummySqlModel".name IS NULL' in ascending
+    assert '"DummySqlModel".name IS NOT NULL' in descending
+
+
+def test_keyset_predicate_mismatch():
+    repository = base.BaseRepository(model=DummySqlModel)
+
+    with pytest.raises(ValueError, match="does not match"):
+        repository._keyset_predicate(
+            repository._sort_keys(("name",)),
+            (uuid4(),),
+        )
+
+
+def test_update_statement_bumps_updated_at():
+    repository = base.BaseRepository(model=DummySqlModel)
+    statement = str(
+        repository._update_statement({"name": "test"}, str(uuid4())).compile(
+            dialect=postgresql.dialect(),
+        ),
+    )
+
+    assert "updated_at=now()" in statement
+
+
+def test_update_many_statements():
+    repository = base.BaseRepository(model=DummySqlModel)
+    statements = repository._update_many_statements(
+        {
+            uuid4(): {"name": "first"},
+            str(uuid4()): {"name": "second"},
+            uuid4(): {"name": "third", "deleted_at": None},
+            uuid4(): {},
+        },
+    )
+
+    assert len(statements) == 2
+    statement = str(statements[0].compile(dialect=postgresql.dialect()))
+    assert "SET name=data.name, updated_at=now() FROM (VALUES" in statement
+    assert 'WHERE "DummySqlModel".id = data.id' in statement
+    assert 'RETURNING "DummySqlModel".id' in statement
+    with pytest.raises(KeyError):
+        repository._update_many_statements({uuid4(): {"unknown": 1}})
+
+
+def test_update_many(database_session_mock):
+    identifiers = [uuid4(), uuid4()]
+    repository = base.BaseRepository(model=DummySqlModel)
+    session = repository.session.return_value.__enter__.return_value
+    session.execute.return_value.all.return_value = [
+        mock.Mock(id=identifier) for identifier in identifiers
+    ]
+
+    result = repository.update_many(
+        {
+            identifiers[0]: {"name": "first"},
+            identifiers[1]: {"name": "second", "deleted_at": None},
+        },
+    )
+
+    assert result == identifiers * 2
+    assert session.execute.call_count == 2
+    session.commit.assert_called_once()
+
+
+def test_write_notifies_and_evicts(database_session_mock):
+    identifier = uuid4()
+    repository = base.BaseRepository(model=DummySqlModel)
+    repository.cache.set(("select_by_id", ("identifier", identifier)), 1)
+    repository.cache.set(("select_by_id", ("identifier", uuid4())), 2)
+    session = repository.session.return_value.__enter__.return_value
+    session.get_bind.return_value.dialect.name = "postgresql"
+    session.execute.return_value.all.return_value = [
+        mock.Mock(id=identifier),
+    ]
+
+    repository.update({"name": "first"}, identifier)
+
+    notify = session.execute.call_args_list[-1].args[0]
+    assert "pg_notify" in str(notify)
+    assert str(identifier) in notify.compile().params["payload"]
+    assert repository.cache.statistics()["entries"] == 1
+
+
+def test_write_without_identifiers_invalidates(database_session_mock):
+    repository = base.BaseRepository(model=DummySqlModel)
+    repository.cache.set(("select_by_id", ("identifier", uuid4())), 1)
+    session = repository.session.return_value.__enter__.return_value
+    session.execute.return_value.all.return_value = []
+
+    repository.delete(str(uuid4()))
+
+    session.execute.assert_called_once()
+    assert repository.cache.statistics()["entries"] == 0
+
+
+def test_update_many_without_values(database_session_mock):
+    repository = base.BaseRepository(model=DummySqlModel)
+
+    assert repository.update_many({}) == []
+    repository.session.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    ("method", "predicate"),
+    (
+        ("_delete_many_statement", '"DummySqlModel".deleted_at IS NULL'),
+        ("_restore_many_statement", '"DummySqlModel".deleted_at IS NOT NULL'),
+    ),
+)
+def test_delete_and_restore_many_statements(method, predicate):
+    repository = base.BaseRepository(model=DummySqlModel)
+    statement = str(
+        getattr(repository, method)([uuid4(), uuid4()]).compile(
+            dialect=postgresql.dialect(),
+        ),
+    )
+
+    assert '"DummySqlModel".id = ANY (%(identifiers)s::UUID[])' in statement
+    assert predicate in statement
+    assert 'RETURNING "DummySqlModel".id' in statement
+
+
+@pytest.mark.parametrize(
+    ("method", "identifiers"),
+    (
+        ("_delete_statement", "c32c033a-4d00-11ed-979e-641c67e34d72"),
+        ("_delete_many_statement", [uuid4()]),
+    ),
+)
+def test_delete_statements_use_database_clock(method, identifiers):
+    repository = base.BaseRepository(model=DummySqlModel)
+    statement = str(getattr(repository, method)(identifiers))
+
+    assert "deleted_at=now()" in statement
+
+
+@pytest.mark.parametrize("method", ("delete_many", "restore_many"))
+def test_delete_and_restore_many(database_session_mock, method):
+    identifier = uuid4()
+    repository = base.BaseRepository(model=DummySqlModel)
+    session = repository.session.return_value.__enter__.return_value
+    session.execute.return_value.all.return_value = [mock.Mock(id=identifier)]
+
+    assert getattr(repository, method)([str(identifier)]) == [identifier]
+    session.execute.assert_called_once()
+    session.commit.assert_called_once()
+    assert getattr(repository, method)([]) == []
+    session.execute.assert_called_once()
+
+
+@pytest.mark.anyio()
+@pytest.mark.parametrize(
+    ("method", "argument"),
+    (
+        ("async_update_many", {uuid4(): {"name": "test"}}),
+        ("async_delete_many", [uuid4()]),
+        ("async_restore_many", [uuid4()]),
+    ),
+)
+async def test_async_many(database_session_mock, method, argument):
+    identifier = uuid4()
+    repository = base.BaseRepository(model=DummySqlModel)
+    session = repository.async_session.return_value.__aenter__.return_value
+    session.execute.return_value = mock.Mock()
+    session.execute.return_value.all.return_value = [mock.Mock(id=identifier)]
+
+    assert await getattr(repository, method)(argument) == [identifier]
+    session.execute.assert_awaited_once()
+    session.commit.assert_awaited_once()
+    assert await getattr(repository, method)(type(argument)()) == []
+
+
+@pytest.mark.anyio()
+async def test_async_insert(database_session_mock):
+    repository = base.BaseRepository(model=DummySqlModel)
+    await repository.async_insert(values={"name": "test"})
+    session = repository.async_session.return_value.__aenter__.return_value
+    session.execute.assert_awaited_once()
+    session.commit.assert_awaited_once()
+
+
+@pytest.mark.anyio()
+async def test_async_select(database_session_mock):
+    repository = base.BaseRepository(model=DummySqlModel)
+    await repository.async_select()
+    session = repository.async_session.return_value.__aenter__.return_value
+    session.execute.assert_awaited_once()
+
+
+@pytest.mark.anyio()
+async def test_async_select_first(database_session_mock):
+    repository = base.BaseRepository(model=DummySqlModel)
+    await repository.async_select_first()
+    session = repository.async_session.return_value.__aenter__.return_value
+    session.execute.assert_awaited_once()
+
+
+@pytest.mark.anyio()
+async def test_async_select_by_id(database_session_mock):
+    repository = base.BaseRepository(model=DummySqlModel)
+    await repository.async_select_by_id(
+        identifier="c32c033a-4d00-11ed-979e-641c67e34d72",
+    )
+    session = repository.async_session.return_value.__aenter__.return_value
+    session.execute.assert_awaited_once()
+
+
+@pytest.mark.anyio()
+async def test_async_select_by_name(database_session_mock):
+    repository = base.BaseRepository(model=DummySqlModel)
+    await repository.async_select_by_name(name="test")
+    session = repository.async_session.return_value.__aenter__.return_value
+    session.execute.assert_awaited_once()
+
+
+@pytest.mark.anyio()
+async def test_async_update(database_session_mock):
+    repository = base.BaseRepository(model=DummySqlModel)
+    await repository.async_update(
+        values={"name": "test"},
+        identifier="c32c033a-4d00-11ed-979e-641c67e34d72",
+    )
+    session = repository.async_session.return_value.__aenter__.return_value
+    session.execute.assert_awaited_once()
+    session.commit.assert_awaited_once()
+
+
+@pytest.mark.anyio()
+async def test_async_delete(database_session_mock):
+    repository = base.BaseRepository(model=DummySqlModel)
+    await repository.async_delete(
+        identifier="c32c033a-4d00-11ed-979e-641c67e34d72",
+    )
+    session = repository.async_session.return_value.__aenter__.return_value
+    session.execute.assert_awaited_once()
+    session.commit.assert_awaited_once()
+
+
+def test_write_invalidates_cache(database_session_mock):
+    repository = base.BaseRepository(model=DummySqlModel)
+    repository.cache.set("key", "value")
+    repository.delete(identifier="c32c033a-4d00-11ed-979e-641c67e34d72")
+    assert repository.cache.get("key") is cache.MISSING
+
+
+@pytest.mark.anyio()
+async def test_async_select_by_id_cached(database_session_mock):
+    repository = base.BaseRepository(model=DummySqlModel)
+    await repository.async_select_by_id(identifier="cached")
+    await repository.async_select_by_id(identifier="cached")
+    session = repository.async_session.return_value.__aenter__.return_value
+    session.execute.assert_awaited_once()
+
+
+@pytest.mark.anyio()
+async def test_async_select_filters_cached(database_session_mock):
+    repository = base.BaseRepository(model=DummySqlModel)
+    await repository.async_select(filters={"name": ("a", "b"), "id": "id"})
+    await repository.async_select(filters={"id": "id", "name": ("a", "b")})
+
+    session = repository.async_session.return_value.__aenter__.return_value
+    session.execute.assert_awaited_once()
+
+
+def test_bulk_insert(database_session_mock):
+    progress = mock.Mock()
+    repository = base.BaseRepository(model=DummySqlModel)
+    total = repository.bulk_insert(
+        ({"name": str(index)} for index in range(5)),
+        batch_size=2,
+        progress=progress,
+    )
+
+    session = repository.session.return_value.__enter__.return_value
+    assert total == 5
+    assert progress.call_args_list == [
+        mock.call(2),
+        mock.call(4),
+        mock.call(5),
+    ]
+    assert session.execute.call_count == 3
+
+
+def test_bulk_insert_copy(database_session_mock):
+    repository = base.BaseRepository(model=DummySqlModel)
+    session = repository.session.return_value.__enter__.return_value
+    session.connection.return_value.dialect.driver = "psycopg"
+
+    with mock.patch.object(base, "copy_rows") as copy_rows:
+        total = repository.bulk_insert([{"name": "test"}])
+
+    assert total == 1
+    copy_rows.assert_called_once()
+    session.commit.assert_called_once()
+
+
+@pytest.mark.anyio()
+async def test_async_bulk_insert(database_session_mock):
+    repository = base.BaseRepository(model=DummySqlModel)
+    session = repository.async_session.return_value.__aenter__.return_value
+    session.connection = mock.AsyncMock(
+        return_value=mock.MagicMock(get_raw_connection=mock.AsyncMock()),
+    )
+
+    with mock.patch.object(
+        base,
+        "async_copy_rows",
+        mock.AsyncMock(),
+    ) as copy_rows:
+        total = await repository.async_bulk_insert(
+            [{"name": "test"}, {"name": "other"}],
+        )
+
+    assert total == 2
+    copy_rows.assert_awaited_once()
+    session.commit.assert_awaited_once()
+
+
+def test_select_by_ids(database_session_mock):
+    repository = base.BaseRepository(model=DummySqlModel)
+    repository.select_by_ids(identifiers=[uuid4(), str(uuid4())])
+
+    session = repository.session.return_value.__enter__.return_value
+    statement = session.execute.call_args.kwargs["statement"]
+    assert '"DummySqlModel".id = ANY' in str(statement)
+
+
+@pytest.mark.anyio()
+async def test_async_select_by_ids(database_session_mock):
+    repository = base.BaseRepository(model=DummySqlModel)
+    await repository.async_select_by_ids(identifiers=[uuid4()])
+
+    session = repository.async_session.return_value.__aenter__.return_value
+    session.execute.assert_awaited_once()
+
+
+def test_select_columns(database_session_mock):
+    repository = base.BaseRepository(model=DummySqlModel)
+    repository.select(columns=("id", "name"))
+
+    session = repository.session.return_value.__enter__.return_value
+    statement = session.execute.call_args.kwargs["statement"]
+    assert str(statement).startswith(
+        'SELECT "DummySqlModel".id, "DummySqlModel".name \n',
+    )
+    session.execute.return_value.all.assert_called_once()
+
+
+@pytest.mark.anyio()
+async def test_async_select_columns(database_session_mock):
+    repository = base.BaseRepository(model=DummySqlModel)
+    await repository.async_select(columns=("id",))
+
+    session = repository.async_session.return_value.__aenter__.return_value
+    session.execute.return_value.all.assert_called_once()
+
+
+def test_stream(database_session_mock):
+    repository = base.BaseRepository(model=DummySqlModel)
+    session = repository.session.return_value.__enter__.return_value
+    session.execute.return_value.scalars.return_value = iter([1, 2])
+
+    assert list(repository.stream(batch_size=10)) == [1, 2]
+    statement = session.execute.call_args.kwargs["statement"]
+    assert statement.get_execution_options()["yield_per"] == 10
+
+
+@pytest.mark.anyio()
+async def test_async_stream(database_session_mock):
+    repository = base.BaseRepository(model=DummySqlModel)
+    session = repository.async_session.return_value.__aenter__.return_value
+    result = mock.MagicMock()
+    result.__aiter__.return_value = [("row",)]
+    session.stream = mock.AsyncMock(return_value=result)
+
+    rows = [row async for row in repository.async_stream(columns=("id",))]
+
+    assert rows == [("row",)]
+    statement = session.stream.await_args.args[0]
+    assert statement.get_execution_options()["yield_per"] == 1000
+
+
+@pytest.mark.parametrize(
+    ("update_columns", "expected"),
+    (
+        ((), "ON CONFLICT (name) WHERE deleted_at IS NULL DO NOTHING"),
+        (
+            ("name",),
+            "ON CONFLICT (name) WHERE deleted_at IS NULL DO UPDATE SET "
+            "name = excluded.name",
+        ),
+    ),
+)
+def test_upsert(update_columns, expected, database_session_mock):
+    repository = base.BaseRepository(model=DummySqlModel)
+    repository.conflict_target = ("name",)
+    repository.upsert(values={"name": "test"}, update_columns=update_columns)
+
+    session = repository.session.return_value.__enter__.return_value
+    statement = session.execute.call_args.kwargs["statement"]
+    compiled = str(statement.compile(dialect=postgresql.dialect()))
+    assert expected in compiled
+    assert "RETURNING" in compiled
+    session.commit.assert_called_once()
+
+
+@pytest.mark.anyio()
+async def test_async_upsert(database_session_mock):
+    repository = base.BaseRepository(model=DummySqlModel)
+    await repository.async_upsert(
+        values=[{"name": "test"}],
+        conflict_target=("id",),
+    )
+
+    session = repository.async_session.return_value.__aenter__.return_value
+    statement = session.execute.await_args.kwargs["statement"]
+    assert "ON CONFLICT (id)" in str(
+        statement.compile(dialect=postgresql.dialect()),
+    )
+
+
+def test_upsert_without_conflict_target(database_session_mock):
+    repository = base.BaseRepository(model=DummySqlModel)
+
+    with pytest.raises(ValueError, match="No conflict target"):
+        repository.upsert(values={"name": "test"})
+
+    repository.session.assert_not_called()
+
+
+def test_where():
+    repository = base.BaseRepository(model=DummySqlModel)
+
+    assert str(repository.where(name="test", id="id")) == (
+        '"DummySqlModel".name = :name_1 AND "DummySqlModel".id = :id_1 '
+        'AND "DummySqlModel".deleted_at IS NULL'
+    )
+    with pytest.raises(KeyError):
+        repository.where(unknown="test")
+
+
+def test_select_by_id_predicates(database_session_mock):
+    repository = base.BaseRepository(model=DummySqlModel)
+    repository.select_by_id(identifier="c32c033a-4d00-11ed-979e-641c67e34d72")
+
+    session = repository.session.return_value.__enter__.return_value
+    statement = session.execute.call_args.kwargs["statement"]
+    assert "deleted_at IS NULL" in str(statement.whereclause)
+
+
+def test_select_by_statement_is_reused():
+    repository = base.BaseRepository(model=DummySqlModel)
+    first = repository._select_by_statement(name="first")._generate_cache_key()
+    second = repository._select_by_statement(
+        name="second"
+    )._generate_cache_key()
+    other = repository._select_by_statement(id="first")._generate_cache_key()
+
+    assert first == second
+    assert first != other
+    assert {parameter.value for parameter in second.bindparams} == {"second"}
+    with pytest.raises(KeyError):
+        repository._select_by_statement(unknown="test")
+
+
+def test_select_by_cached(database_session_mock):
+    repository = base.BaseRepository(model=DummySqlModel)
+    repository.select_by(name="test", id="id")
+    repository.select_by(id="id", name="test")
+
+    session = repository.session.return_value.__enter__.return_value
+    session.execute.assert_called_once()
+
+
+@pytest.mark.anyio()
+async def test_async_select_by(database_session_mock):
+    repository = base.BaseRepository(model=DummySqlModel)
+    await repository.async_select_by(name="test")
+
+    session = repository.async_session.return_value.__aenter__.return_value
+    session.execute.assert_awaited_once()
@@ -25,3 +25,23 @@ def test_select_by_player_and_dungeon_id(database_session_mock):
         dungeon_id="test",
     )
     assert repository.session is not None
+
+
+def test_select_by_player_and_dungeon_id_predicates(database_session_mock):
+    repository = dungeon_history.DungeonHistoryRepository()
+    repository.select_by_player_and_dungeon_id(
+        player_id="player",
+        dungeon_id="dungeon",
+    )
+
+    session = repository.session.return_value.__enter__.return_value
+    statement = session.execute.call_args.kwargs["statement"]
+    assert str(statement.whereclause) == (
+        "dungeon_histories.player_id = :value_1 "
+        "AND dungeon_histories.dungeon_id = :value_2 "
+        "AND dungeon_histories.deleted_at IS NULL"
+    )
+    assert statement.compile().params == {
+        "value_1": "player",
+        "value_2": "dungeon",
+    }
@@ -0,0 +1,181 @@
+from datetime import datetime
+from unittest import mock
+from uuid import uuid4
+
+import pytest
+
+from carnage.database.catalog import catalog
+from carnage.database.repository import reference
+from carnage.database.session import WRITER_OPTION
+from tests.unit_tests.conftest import DummySqlModel
+
+
+class DummyReferenceRepository(reference.ReferenceRepository):
+    def __init__(self, model=DummySqlModel):
+        super().__init__(model)
+
+
+@pytest.fixture()
+def rows():
+    return [
+        mock.Mock(
+            id=uuid4(),
+            created_at=index,
+            _fields=("id", "name", "created_at"),
+            _mapping={"name": name},
+        )
+        for index, name in enumerate(("first", "second"))
+    ]
+
+
+@pytest.fixture()
+def repository(database_session_mock, rows):
+    for row, name in zip(rows, ("first", "second")):
+        row.name = name
+
+    repository = DummyReferenceRepository()
+    repository._rows = mock.Mock(return_value=rows)
+    repository._async_rows = mock.AsyncMock(return_value=rows)
+    return repository
+
+
+def test_select_loads_table_once(repository, rows):
+    assert repository.select() == rows
+    assert repository.select(limit=1) == rows[:1]
+    assert list(repository.stream()) == rows
+
+    repository._rows.assert_called_once()
+    assert catalog.get("DummySqlModel").rows == tuple(rows)
+
+
+@pytest.mark.anyio()
+async def test_updated_since_reads_database(repository, rows):
+    since = datetime.now()
+    repository._rows.return_value = rows[1:]
+    repository._async_rows.return_value = rows[1:]
+
+    assert repository.select(columns=("id",), updated_since=since) == rows[1:]
+    assert (
+        await repository.async_select(
+            columns=("id",),
+            updated_since=since,
+        )
+        == rows[1:]
+    )
+
+    statement = repository._rows.call_args.args[0]
+    assert "updated_at >" in str(statement)
+    assert catalog.get("DummySqlModel") is None
+
+
+def test_lookups(repository, rows):
+    assert repository.select_first() == (rows[0],)
+    assert repository.select_by_id(str(rows[1].id)) == (rows[1],)
+    assert repository.select_by_ids([rows[1].id, uuid4()]) == [rows[1]]
+    assert repository.select_by_name("second") == (rows[1],)
+    assert repository.select_by(name="unknown") is None
+    repository._rows.assert_called_once()
+
+
+@pytest.mark.anyio()
+async def test_async_lookups(repository, rows):
+    assert await repository.async_select(limit=1) == rows[:1]
+    assert [row async for row in repository.async_stream()] == rows
+    assert await repository.async_select_first() == (rows[0],)
+    assert await repository.async_select_by_id(rows[0].id) == (rows[0],)
+    assert await repository.async_select_by_ids([rows[0].id]) == [rows[0]]
+    assert await repository.async_select_by_name("first") == (rows[0],)
+    assert await repository.async_select_by(name="unknown") is None
+    repository._async_rows.assert_awaited_once()
+
+
+def test_write_reloads_table(repository, rows):
+    repository.select()
+    repository._rows.return_value = rows[:1]
+
+    repository.delete(identifier=str(rows[1].id))
+
+    assert repository.select() == rows[:1]
+    assert repository._rows.call_count == 2
+
+
+@pytest.mark.anyio()
+async def test_async_write_reloads_table(repository, rows):
+    await repository.async_select()
+    repository._async_rows.return_value = rows[:1]
+
+    await repository.async_delete(identifier=str(rows[1].id))
+
+    assert await repository.async_select() == rows[:1]
+    assert repository._async_rows.await_count == 2
+
+
+def test_racing_load_keeps_newer_snapshot(repository, rows):
+    def read(statement):
+        repository._rows.side_effect = None
+        repository._rows.return_value = rows[:1]
+        repository.load()
+        return rows
+
+    repository._rows.side_effect = read
+
+    assert len(repository.load()) == 1
+    assert catalog.get("DummySqlModel").rows == tuple(rows[:1])
+
+
+def test_catalog_statement_reads_writer(repository):
+    options = repository._catalog_statement().get_execution_options()
+
+    assert options[WRITER_OPTION] is True
+
+
+def test_conflict_target(repository):
+    assert repository.conflict_target == ("name",)
+
+
+def test_reference_repositories():
+    repositories = reference.reference_repositories()
+
+    assert DummyReferenceRepository in repositories
+    assert all(
+        issubclass(repository, reference.ReferenceRepository)
+        for repository in repositories
+    )
+
+
+@pytest.mark.anyio()
+async def test_load_catalog(caplog):
+    working, failing = mock.Mock(), mock.Mock()
+    working.return_value.async_load = mock.AsyncMock()
+    failing.return_value.async_load = mock.AsyncMock(side_effect=Exception)
+
+    with mock.patch.object(
+        reference,
+        "reference_repositories",
+        return_value=[failing, working],
+    ):
+        await reference.load_catalog()
+
+    working.return_value.async_load.assert_awaited_once()
+    assert "Could not load" in caplog.text
+
+
+@pytest.mark.anyio()
+async def test_filters_and_sort_read_database(repository, rows):
+    repository._rows.return_value = rows[1:]
+    repository._async_rows.return_value = rows[1:]
+
+    assert (
+        repository.select(columns=("id",), filters={"name": "second"})
+        == rows[1:]
+    )
+    assert (
+        await repository.async_select(columns=("id",), sort=("-name",))
+        == rows[1:]
+    )
+
+    statement = repository._rows.call_args.args[0]
+    assert '"DummySqlModel".name = :name_1' in str(statement)
+    statement = repository._async_rows.call_args.args[0]
+    assert '"DummySqlModel".name DESC' in str(statement)
+    assert catalog.get("DummySqlModel") is None
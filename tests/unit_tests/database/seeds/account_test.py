@@ -1,7 +1,3 @@
-from unittest import mock
-
-import pytest
-
 from carnage.database.seeds import account
 
 
@@ -12,19 +8,7 @@ def test_account_seed_init(database_session_mock):
     assert seed.data is not None
 
 
-@pytest.mark.parametrize(
-    ("seed_exist"),
-    (
-        (True),
-        (False),
-    ),
-)
-def test_validate_seed(seed_exist, database_session_mock):
+def test_account_seed_conflict_target(database_session_mock):
     seed = account.AccountSeed()
-    with mock.patch.object(
-        seed.repository,
-        "select_by_username",
-        lambda username: seed_exist,
-    ):
-        # We don't care too much about the rest
-        assert seed.validate_seed(seed={"username": "test"}) == seed_exist
+
+    assert seed.repository.conflict_target == ("username",)
@@ -14,21 +14,39 @@ def test_monster_seed_init(database_session_mock):
 
 
 @pytest.mark.parametrize(
-    ("seed_exist"),
+    ("new_rows"),
     (
-        (True),
-        (False),
+        (0),
+        (1),
     ),
 )
-def test_seed(seed_exist, database_session_mock, caplog):
+def test_seed(new_rows, database_session_mock, caplog):
     caplog.set_level(logging.INFO)
     seed = base.BaseSeed(mock.Mock())
-    with mock.patch.object(seed, "validate_seed", lambda seed: seed_exist):
-        seed.data = [{"name": "test"}]
-        seed.seed()
+    seed.repository.upsert.return_value = [mock.Mock()] * new_rows
+    seed.data = [{"name": "test"}]
+    seed.seed()
+
+    seed.repository.upsert.assert_called_once_with([{"name": "test"}])
+    assert (
+        f"Seeded 'base' successfully, {new_rows} new rows"
+        in caplog.records[-1].message
+    )
 
-        if not seed_exist:
-            assert "Seeded 'base' successfully" in caplog.records[-1].message
+
+def test_seed_without_conflict_target(database_session_mock, caplog):
+    caplog.set_level(logging.INFO)
+    seed = base.BaseSeed(mock.Mock())
+    seed.repository.conflict_target = ()
+    seed.repository.select_by_name.side_effect = [mock.Mock(), None]
+    seed.data = [{"name": "existing"}, {"name": "missing"}]
+    seed.seed()
+
+    seed.repository.upsert.assert_not_called()
+    seed.repository.insert.assert_called_once_with([{"name": "missing"}])
+    assert (
+        "Seeded 'base' successfully, 1 new rows" in caplog.records[-1].message
+    )
 
 
 def test_seed_value_error():
@@ -36,21 +54,3 @@ def test_seed_value_error():
     seed.data = None
     with pytest.raises(ValueError, match="No seed data found for base"):
         seed.seed()
-
-
-@pytest.mark.parametrize(
-    ("seed_exist"),
-    (
-        (True),
-        (False),
-    ),
-)
-def test_validate_seed(seed_exist, database_session_mock):
-    seed = base.BaseSeed()
-    with mock.patch.object(
-        seed.repository,
-        "select_by_name",
-        lambda name: seed_exist,
-    ):
-        # We don't care too much about the rest
-        assert seed.validate_seed(seed={"name": "test"}) == seed_exist
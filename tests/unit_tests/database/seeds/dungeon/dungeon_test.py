@@ -11,7 +11,9 @@ def test_dungeon_seed_init(database_session_mock):
 
 
 @mock.patch.object(dungeon, "generate_dungeon")
-def test_seed(generate_dungeon_mock, database_session_mock):
+def test_seed(
+    generate_dungeon_mock, database_session_mock, reference_catalog_mock
+):
     seed = dungeon.DungeonSeed()
     seed.seed()
 
@@ -8,7 +8,7 @@ def test_race_seed_init(database_session_mock):
     assert seed.data is not None
 
 
-def test_seed(database_session_mock):
+def test_seed(database_session_mock, reference_catalog_mock):
     seed = race.RaceSeed()
     seed.seed()
 
@@ -1,7 +1,3 @@
-from unittest import mock
-
-import pytest
-
 from carnage.database.seeds.vocation import vocation_spell
 
 
@@ -19,26 +15,3 @@ def test_seed(database_session_mock):
     for data in seed.data:
         assert "vocation_id" in data
         assert "spell_id" in data
-
-
-@pytest.mark.parametrize(
-    ("seed_exist"),
-    (
-        (True),
-        (False),
-    ),
-)
-def test_validate_seed(seed_exist, database_session_mock):
-    seed = vocation_spell.VocationSpellSeed()
-    with mock.patch.object(
-        seed.repository,
-        "select_by_spell_id",
-        lambda spell_id: seed_exist,
-    ):
-        # We don't care too much about the rest
-        assert (
-            seed.validate_seed(
-                seed={"spell_id": "791cf7d2-5664-11ed-b136-641c67e34d72"},
-            )
-            == seed_exist
-        )
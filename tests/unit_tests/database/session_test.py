@@ -1,9 +1,274 @@
+import contextvars
 from unittest import mock
 
+import pytest
+from sqlalchemy import create_engine, exc, insert, lambda_stmt, select
+
 from carnage.database import session
+from tests.unit_tests.conftest import DummySqlModel
+
+
+@mock.patch.object(session, "instrument")
+@mock.patch.object(session, "create_engine")
+@mock.patch.object(session, "sessionmaker")
+def test_create_session(sessionmaker_mock, create_engine_mock, instrument):
+    session.create_session()
+
+    instrument.assert_called_once_with(create_engine_mock.return_value)
+
+
+@mock.patch.object(session, "instrument")
+@mock.patch.object(session, "create_async_engine")
+@mock.patch.object(session, "async_sessionmaker")
+def test_create_async_session(
+    sessionmaker_mock, create_async_engine_mock, instrument
+):
+    session.create_async_session()
+
+    instrument.assert_called_once_with(
+        create_async_engine_mock.return_value.sync_engine,
+    )
 
 
+@mock.patch.object(session, "DATABASE_INSTRUMENTATION", False)
+@mock.patch.object(session, "instrument")
 @mock.patch.object(session, "create_engine")
 @mock.patch.object(session, "sessionmaker")
-def test_create_session(create_engine_mock, sessionmaker_mock):
+def test_create_session_without_instrumentation(
+    sessionmaker_mock, create_engine_mock, instrument
+):
     session.create_session()
+
+    instrument.assert_not_called()
+
+
+def test_engine_options():
+    with mock.patch.object(session, "DATABASE_STATEMENT_TIMEOUT", 100):
+        options = session._engine_options()
+
+    assert options["connect_args"]["options"] == "-c statement_timeout=100"
+
+
+def test_engine_options_without_statement_timeout():
+    with mock.patch.object(session, "DATABASE_STATEMENT_TIMEOUT", 0):
+        options = session._engine_options()
+
+    assert "options" not in options["connect_args"]
+
+
+@pytest.mark.parametrize(
+    ("threshold", "expected"), ((0, 0), (5, 5), (-1, None))
+)
+def test_engine_options_prepare_threshold(threshold, expected):
+    with mock.patch.object(session, "DATABASE_PREPARE_THRESHOLD", threshold):
+        options = session._engine_options()
+
+    assert options["connect_args"]["prepare_threshold"] == expected
+
+
+def test_timed_pool_connect():
+    pool = session.TimedQueuePool(mock.MagicMock(), pool_size=1)
+    connection = pool.connect()
+
+    assert pool.checkouts == 1
+    assert pool.timeouts == 0
+    assert (
+        session.get_pool_statistics(mock.Mock(pool=pool))["checked_out"] == 1
+    )
+    connection.close()
+
+
+def test_timed_pool_connect_timeout():
+    pool = session.TimedQueuePool(
+        mock.MagicMock(),
+        pool_size=1,
+        max_overflow=0,
+        timeout=0,
+    )
+    connection = pool.connect()
+    with pytest.raises(exc.TimeoutError):
+        pool.connect()
+    connection.close()
+
+    assert pool.checkouts == 1
+    assert pool.timeouts == 1
+    assert pool.timeout_wait_time >= 0.0
+
+
+def test_pool_statistics():
+    statistics = session.pool_statistics()
+
+    assert statistics["sync"]["checked_out"] == 0
+    assert statistics["async"]["average_wait_time"] == 0.0
+
+
+def _engines(count):
+    return [mock.MagicMock(name=f"engine_{index}") for index in range(count)]
+
+
+def test_replica_router_round_robin():
+    writer, *readers = _engines(3)
+    router = session.ReplicaRouter(writer, readers, strategy="round_robin")
+
+    picked = [router.get_reader() for _ in range(4)]
+
+    assert picked == [readers[0], readers[1], readers[0], readers[1]]
+
+
+def test_replica_router_least_connections():
+    writer, *readers = _engines(3)
+    readers[0].pool.checkedout.return_value = 3
+    readers[1].pool.checkedout.return_value = 1
+    router = session.ReplicaRouter(
+        writer,
+        readers,
+        strategy="least_connections",
+    )
+
+    assert router.get_reader() is readers[1]
+
+
+def test_replica_router_without_readers():
+    writer = mock.MagicMock()
+    router = session.ReplicaRouter(writer, [])
+
+    assert router.get_reader() is writer
+
+
+def test_replica_router_unknown_strategy():
+    with pytest.raises(ValueError, match="Unknown reader strategy"):
+        session.ReplicaRouter(mock.MagicMock(), [], strategy="random")
+
+
+def test_replica_router_sticky_after_write():
+    writer, reader = _engines(2)
+    router = session.ReplicaRouter(writer, [reader])
+
+    def request():
+        assert router.get_reader() is reader
+        session.mark_write()
+        assert router.get_reader() is writer
+
+    contextvars.Context().run(request)
+    assert router.get_reader() is reader
+
+
+def test_replica_router_sticky_per_account():
+    writer, reader = _engines(2)
+    router = session.ReplicaRouter(writer, [reader])
+
+    def request(account, write=False):
+        session.bind_account(account)
+        if write:
+            session.mark_write()
+        return router.get_reader()
+
+    contextvars.Context().run(request, "player@carnage.world", True)
+
+    assert contextvars.Context().run(request, "player@carnage.world") is writer
+    assert contextvars.Context().run(request, "other@carnage.world") is reader
+
+    with mock.patch.object(session, "DATABASE_STICKINESS_WINDOW", 0):
+        assert (
+            contextvars.Context().run(request, "player@carnage.world")
+            is reader
+        )
+
+
+def test_routing_session_get_bind():
+    writer, reader = (
+        create_engine(f"postgresql+psycopg://carnage:carnage@{host}/carnage")
+        for host in ("primary", "replica")
+    )
+    routing_session = session.RoutingSession(
+        router=session.ReplicaRouter(writer, [reader]),
+    )
+    statement = select(DummySqlModel)
+
+    def request():
+        assert routing_session.get_bind(clause=statement) is reader
+        assert routing_session.get_bind(clause=insert(DummySqlModel)) is writer
+        assert routing_session.get_bind(clause=statement) is writer
+
+    contextvars.Context().run(request)
+
+
+def test_routing_session_get_bind_lambda_statement():
+    writer, reader = (
+        create_engine(f"postgresql+psycopg://carnage:carnage@{host}/carnage")
+        for host in ("primary", "replica")
+    )
+    routing_session = session.RoutingSession(
+        router=session.ReplicaRouter(writer, [reader]),
+    )
+
+    def request():
+        assert (
+            routing_session.get_bind(
+                clause=lambda_stmt(lambda: select(DummySqlModel)),
+            )
+            is reader
+        )
+        assert (
+            routing_session.get_bind(
+                clause=lambda_stmt(lambda: insert(DummySqlModel)),
+            )
+            is writer
+        )
+
+    contextvars.Context().run(request)
+
+
+def test_routing_session_get_bind_writer_option():
+    writer, reader = (
+        create_engine(f"postgresql+psycopg://carnage:carnage@{host}/carnage")
+        for host in ("primary", "replica")
+    )
+    routing_session = session.RoutingSession(
+        router=session.ReplicaRouter(writer, [reader]),
+    )
+    statement = select(DummySqlModel)
+
+    def request():
+        assert (
+            routing_session.get_bind(
+                clause=statement.execution_options(
+                    **{session.WRITER_OPTION: True},
+                ),
+            )
+            is writer
+        )
+        assert routing_session.get_bind(clause=statement) is reader
+
+    contextvars.Context().run(request)
+
+
+def test_routing_session_get_bind_writer_reads():
+    writer, reader = (
+        create_engine(f"postgresql+psycopg://carnage:carnage@{host}/carnage")
+        for host in ("primary", "replica")
+    )
+    routing_session = session.RoutingSession(
+        router=session.ReplicaRouter(writer, [reader]),
+    )
+    statement = select(DummySqlModel)
+
+    def fill():
+        with session.read_from_writer():
+            assert routing_session.get_bind(clause=statement) is writer
+
+        assert routing_session.get_bind(clause=statement) is reader
+
+    def request():
+        session.bind_writer()
+        assert routing_session.get_bind(clause=statement) is writer
+
+    contextvars.Context().run(fill)
+    contextvars.Context().run(request)
+
+
+def test_routing_session_without_router():
+    engine = mock.MagicMock()
+    routing_session = session.RoutingSession(bind=engine)
+
+    assert routing_session.get_bind() is engine
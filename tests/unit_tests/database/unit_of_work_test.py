@@ -0,0 +1,131 @@
+from unittest import mock
+from uuid import uuid4
+
+import pytest
+
+from carnage.database import cache, unit_of_work
+from carnage.database.repository import base
+from tests.unit_tests.conftest import DummySqlModel
+
+
+def session_factory():
+    factory = mock.MagicMock()
+    factory.return_value.__aenter__.return_value = mock.MagicMock(
+        execute=mock.AsyncMock(return_value=mock.MagicMock()),
+        commit=mock.AsyncMock(),
+        rollback=mock.AsyncMock(),
+    )
+    return factory
+
+
+@pytest.mark.anyio()
+async def test_unit_of_work_shares_session():
+    factory = session_factory()
+    async with unit_of_work.UnitOfWork() as work:
+        assert unit_of_work.current_unit_of_work() is work
+        async with work.scope(factory) as first:
+            pass
+        async with work.scope(factory) as second:
+            pass
+
+        assert first is second
+        factory.assert_called_once()
+
+    assert unit_of_work.current_unit_of_work() is None
+    assert work.session is None
+    assert work.commits == 1
+    first.commit.assert_awaited_once()
+    factory.return_value.__aexit__.assert_awaited_once()
+
+
+@pytest.mark.anyio()
+async def test_unit_of_work_rolls_back_on_error():
+    factory = session_factory()
+    callback = mock.AsyncMock()
+    with pytest.raises(ValueError):
+        async with unit_of_work.UnitOfWork() as work:
+            async with work.scope(factory) as session:
+                work.after_commit(callback)
+                raise ValueError()
+
+    session.rollback.assert_awaited_once()
+    session.commit.assert_not_awaited()
+    callback.assert_awaited_once()
+
+
+@pytest.mark.anyio()
+async def test_unit_of_work_rollback_drops_cache_entries():
+    factory = session_factory()
+    entity_cache = cache.EntityCache(name="dummy")
+    entity = DummySqlModel(id=uuid4(), name="dummy")
+    entity_cache.set("entity", entity)
+    entity_cache.set("other", "value")
+
+    async with unit_of_work.UnitOfWork() as work:
+        async with work.scope(factory) as session:
+            session.__contains__.return_value = True
+            work.cached(entity_cache, "entity", [entity, "row"])
+            await work.rollback()
+
+    session.expunge.assert_called_once_with(entity)
+    assert entity_cache.get("entity") is cache.MISSING
+    assert entity_cache.get("other") == "value"
+
+
+@pytest.mark.anyio()
+async def test_unit_of_work_commit_keeps_cache_entries():
+    entity_cache = cache.EntityCache(name="dummy")
+    entity_cache.set("entity", "value")
+
+    async with unit_of_work.UnitOfWork() as work:
+        work.cached(entity_cache, "entity", "value")
+        await work.commit()
+        await work.rollback()
+
+    assert entity_cache.get("entity") == "value"
+
+
+@pytest.mark.anyio()
+async def test_unit_of_work_without_session():
+    async with unit_of_work.UnitOfWork() as work:
+        pass
+
+    assert work.commits == 0
+
+
+@pytest.mark.anyio()
+async def test_unit_of_work_callbacks_run_outside():
+    current = []
+
+    async def callback():
+        current.append(unit_of_work.current_unit_of_work())
+
+    async with unit_of_work.UnitOfWork() as work:
+        work.after_commit(callback)
+        await work.commit()
+        await work.commit()
+
+    assert current == [None]
+
+
+@pytest.mark.anyio()
+async def test_repositories_share_unit_of_work(database_session_mock):
+    identifier = uuid4()
+    first = base.BaseRepository(model=DummySqlModel)
+    second = base.BaseRepository(model=DummySqlModel)
+    first.cache.set(("select_by_id", ("identifier", identifier)), 1)
+    session = first.async_session.return_value.__aenter__.return_value
+    session.execute.return_value.all.return_value = [
+        mock.Mock(id=identifier),
+    ]
+
+    async with unit_of_work.UnitOfWork():
+        await first.async_update({"name": "first"}, identifier)
+        await second.async_delete(identifier)
+
+        session.commit.assert_not_awaited()
+        assert first.cache.statistics()["entries"] == 1
+
+    first.async_session.assert_called_once()
+    session.commit.assert_awaited_once()
+    assert first.cache.statistics()["entries"] == 0